@@ -1,31 +1,41 @@
-import pandas as pd
+import os
+import sys
+
 import plotly.express as px
 import streamlit as st
 
-# Load dataset (assume CSV in working directory)
+# Shared data helpers (tile pyramid, top-k counts) live with the milestone 4 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "milestone_4", "week_7", "Day_30"))
+from heavy_hitters import load_top_values, top_k
+from tile_pyramid import raw_pyramid
+
+# Dataset location (assume CSV in working directory); it is only read to build the tile pyramid
 dataset_path = "C:/Users/win10/Desktop/US_Accidents_March23.csv"
-df = pd.read_csv(dataset_path)
 
-def plot_accidents_sampled(df, location_col='State', sample_size=50000):
-    counts = df[location_col].value_counts().head(5)
-    top5_locations = counts.index.tolist()
-    df['is_top5'] = df[location_col].isin(top5_locations)
 
-    # Sample data to reduce size
-    if len(df) > sample_size:
-        df_sample = df.sample(sample_size, random_state=42)
-    else:
-        df_sample = df
+def top_locations(location_col, n=5):
+    """Most frequent locations of the whole file, counted in one pass and saved next to it"""
+    return top_k(load_top_values(dataset_path, columns=('State', 'City')), location_col, n).index.tolist()
+
+
+def plot_accidents_aggregated(location_col='State'):
+    # One point per grid cell and location (finest level within the marker budget), sized by its
+    # accident count: sparse areas stay visible and dense cities no longer over-plot
+    tiles = raw_pyramid(dataset_path).tiles(by=(location_col,))
+    top5_locations = top_locations(location_col)
+    tiles['is_top5'] = tiles[location_col].isin(top5_locations)
 
     fig = px.scatter(
-        df_sample,
-        x='Start_Lng',
-        y='Start_Lat',
+        tiles,
+        x='longitude',
+        y='latitude',
         color='is_top5',
-        labels={'Start_Lng': 'Longitude', 'Start_Lat': 'Latitude', 'is_top5': 'Top 5 Accident-Prone'},
+        size='accidents',
+        labels={'longitude': 'Longitude', 'latitude': 'Latitude', 'is_top5': 'Top 5 Accident-Prone'},
         title=f'Accident Scatter Plot Highlighting Top 5 {location_col}s',
         opacity=0.6,
-        hover_data=[location_col]
+        hover_data=[location_col, 'accidents'] + [col for col in tiles.columns if col.startswith('Severity ')]
     )
     st.plotly_chart(fig)
 
@@ -33,4 +43,4 @@ st.title('Accident Data Visualization')
 
 location_option = st.selectbox('Select Location Type', ['State', 'City'])
 
-plot_accidents_sampled(df, location_col=location_option)
+plot_accidents_aggregated(location_col=location_option)
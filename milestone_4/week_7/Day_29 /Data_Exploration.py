@@ -1,25 +1,79 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared data helpers (dataset profile, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from dataset_io import RAW_DATA_PATH
+from dataset_profile import TRACKED_VALUES, describe_frame, head_frame, load_profile, missing_blocks_frame, summary_frame
+from sampling import load_sample
+
+SAMPLE_STRATA = ["Severity", "State", "Year"]
+
+
 def run():
     st.header("Dataset Exploration")
-    df = pd.read_csv("data/US_Accidents_March23.csv")
-    
+
+    # Everything below is drawn from the saved dataset profile, not from the raw file
+    profile = load_profile(RAW_DATA_PATH)
+    if profile is None:
+        st.warning("No up-to-date profile of the raw dataset. Building it reads the whole file once.")
+        if not st.button("📊 Build dataset profile"):
+            return
+        from preprocessing_pipeline import profile_raw_data
+        with st.spinner("Profiling the raw dataset..."):
+            profile = profile_raw_data(RAW_DATA_PATH)
+
     st.write("Preview of dataset")
-    st.dataframe(df.head())
+    st.dataframe(head_frame(profile))
+    st.caption(f"{profile['rows']:,} rows × {len(profile['columns'])} columns")
 
     st.write("Missing Values Heatmap")
+    blocks = missing_blocks_frame(profile)
     plt.figure(figsize=(14, 8))  # Larger figure size for better visibility
-    sns.heatmap(df.isnull(),
-                cbar=False,
+    sns.heatmap(blocks,
+                cbar=True,
+                cbar_kws={"label": "Fraction missing"},
+                vmin=0,
+                vmax=1,
                 cmap="viridis",  # Better contrast colormap
                 yticklabels=False,
                 xticklabels=True,
                 linewidths=0.5,  # Adds grid lines for clarity
                 linecolor='gray')
     plt.xticks(rotation=45, ha='right')  # Rotate x labels for readability
+    plt.ylabel(f"Row blocks (~{profile['rows'] // max(len(blocks), 1):,} rows each)")
     plt.title("Missing Values Heatmap")
     st.pyplot(plt.gcf())
-    
+
+    st.write("Column Summary")
+    st.dataframe(summary_frame(profile))
+
+    st.write("Numerical Statistics")
+    st.dataframe(describe_frame(profile))
+    st.caption("Quartiles are estimated from a uniform sample of rows; the other statistics are exact.")
+
+    with st.expander("🔝 Most Frequent Values"):
+        column = st.selectbox("Column", options=list(profile["columns"]))
+        info = profile["columns"][column]
+        if info["top"] is None:
+            st.caption(f"High-cardinality column (more than {TRACKED_VALUES:,} distinct values): "
+                       "its values are not counted.")
+        else:
+            st.dataframe(pd.DataFrame(info["top"], columns=[column, "Count"]))
+
+    with st.expander("🎲 Random Sample of Rows"):
+        # Opt-in: the first request reads the raw file once, later ones load the saved sample
+        if st.checkbox("Draw a reproducible sample"):
+            strata = st.selectbox("Stratify by", options=["None"] + SAMPLE_STRATA)
+            per_stratum = st.slider("Rows per stratum" if strata != "None" else "Rows",
+                                    min_value=10, max_value=1_000, value=100, step=10)
+            with st.spinner("Sampling the raw dataset..."):
+                sample = load_sample(RAW_DATA_PATH, size=per_stratum,
+                                     strata=None if strata == "None" else strata)
+            st.dataframe(sample)
+            st.caption(f"{len(sample):,} rows, seeded so every session sees the same sample.")
@@ -1,8 +1,14 @@
+import os
 import pandas as pd
 import streamlit as st
-from sklearn.linear_model import LinearRegression
 import time
 
+from checkpoint_cache import CheckpointCache
+from dataset_io import COMPRESSION_CODECS, PREPROCESSED_PATH, compressed_copy, csv_export_path
+from preprocessing_pipeline import (DEFAULT_CHUNKSIZE, RAW_DATA_PATH, STEPS, PipelineObserver,
+                                    run_chunked_pipeline, run_pipeline)
+
+
 def run():
     """Preprocessing page - main entry point"""
     
@@ -18,266 +24,178 @@ def run():
     with col1:
         DATA_PATH = st.text_input(
             "📁 Input Data Path",
-            value="data/US_Accidents_March23.csv",
+            value=RAW_DATA_PATH,
             help="Path to your raw accident dataset CSV file"
         )
     with col2:
         OUTPUT_PATH = st.text_input(
             "💾 Output Data Path",
-            value="data/US_Accidents_preprocessed.csv",
-            help="Where to save the cleaned dataset"
+            value=PREPROCESSED_PATH,
+            help="Where to save the cleaned dataset (typed Parquet file)"
+        )
+    col1, col2 = st.columns(2)
+    with col1:
+        export_csv = st.checkbox(
+            "📄 Also export CSV",
+            value=False,
+            help="Write a CSV copy next to the Parquet file"
+        )
+    with col2:
+        compression = st.selectbox(
+            "🗜️ Download compression",
+            ["none"] + COMPRESSION_CODECS,
+            help="Compress the saved files for download (streamed from disk)"
+        )
+    codec = None if compression == "none" else compression
+
+    # Chunked mode streams the CSV so memory is bounded by the chunk size
+    col1, col2 = st.columns(2)
+    with col1:
+        chunked_mode = st.checkbox(
+            "🧩 Chunked (out-of-core) mode",
+            value=False,
+            help="Stream the CSV in fixed-size batches instead of loading it all into memory"
+        )
+    with col2:
+        chunksize = st.number_input(
+            "Rows per chunk",
+            min_value=10_000,
+            value=DEFAULT_CHUNKSIZE,
+            step=50_000,
+            disabled=not chunked_mode
         )
+    use_cache = st.checkbox(
+        "💾 Resume from step checkpoints",
+        value=False,
+        disabled=chunked_mode,
+        help="Checkpoint each in-memory step so reruns skip the steps whose input, code and settings are unchanged"
+    )
 
     st.markdown("---")
 
     # Start button
     if st.button("🚀 Start Preprocessing", type="primary", use_container_width=True):
-        run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH)
+        if chunked_mode:
+            run_chunked_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH, int(chunksize), export_csv, codec)
+        else:
+            run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH, export_csv, use_cache, codec)
     else:
         # Show pipeline overview
-        st.markdown("### 📝 Pipeline Overview (15 Steps)")
+        st.markdown(f"### 📝 Pipeline Overview ({len(STEPS)} Steps)")
         
-        overview_text = """
-        | Step | Operation | Purpose |
-        |------|-----------|---------|
-        | 1 | Load Data | Import the raw accident dataset |
-        | 2 | Remove Duplicates | Eliminate duplicate records by ID |
-        | 3 | Drop High Missingness | Remove columns with >30% missing values |
-        | 4 | Drop Non-Analytical | Remove IDs and text fields |
-        | 5 | Parse Temporal Data | Validate and convert timestamps |
-        | 6 | Validate Geographic | Clean and validate coordinates |
-        | 7 | Filter Severity | Keep only severity levels 1-4 |
-        | 8 | Drop Low-Missing Rows | Remove rows with <3% missing |
-        | 9 | Weather Imputation | Domain-specific imputation strategies |
-        | 10 | Numeric Imputation | Fill remaining missing values |
-        | 11 | Temporal Features | Create time-based features |
-        | 12 | Categorical Encoding | Convert boolean features to integers |
-        | 13 | Drop Redundant | Remove columns no longer needed |
-        | 14 | Final Cleanup | Remove any remaining NaN values |
-        | 15 | Save Data | Export preprocessed dataset |
-        """
+        overview_text = "| Step | Operation | Purpose |\n|------|-----------|---------|\n"
+        overview_text += "\n".join(f"| {step.number} | {step.operation} | {step.purpose} |" for step in STEPS)
         st.markdown(overview_text)
         
         st.info("👆 Click the **Start Preprocessing** button above to begin the pipeline")
 
 
-def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
-    """Main preprocessing pipeline function with animated step-by-step tracking"""
-    
-    # Create placeholders for dynamic updates
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    metrics_container = st.container()
-    
-    # Metrics placeholders
-    with metrics_container:
-        col1, col2, col3, col4 = st.columns(4)
-        metric1 = col1.empty()
-        metric2 = col2.empty()
-        metric3 = col3.empty()
-        metric4 = col4.empty()
-    
-    log_lines = []  # Accumulate log entries
-    log_placeholder = st.empty()  # Placeholder for scrollable log display
-
-    def log_step(step, message, current_shape=None):
-        entry = f"✓ Step {step}: {message}"
-        if current_shape:
-            entry += f" → Shape: {current_shape}"
-        log_lines.append(entry)
+class StreamlitObserver(PipelineObserver):
+    """Renders pipeline events as a progress bar, metrics and a scrollable log.
+
+    Full-frame metrics such as the missing-value count and the deep memory
+    usage per column are computed here, so headless runs never pay for them.
+    """
+
+    def __init__(self):
+        self.progress_bar = st.progress(0)
+        self.status_text = st.empty()
+        with st.container():
+            self.metrics = [col.empty() for col in st.columns(5)]
+        self.log_lines = []  # Accumulate log entries
+        self.log_placeholder = st.empty()  # Placeholder for scrollable log display
+        self.total_rows = None
+        self.sample = None  # First rows written by the chunked mode
+        self.memory_rows = []  # Total memory after each step
+        self.column_bytes = {}  # Bytes per column after the first and the latest step
+
+    def log(self, entry):
+        self.log_lines.append(f"✓ {entry}")
         # Render accumulated logs inside scrollable container
-        log_placeholder.markdown(
+        self.log_placeholder.markdown(
             "<div style='max-height:300px; overflow-y:auto; border:1px solid #ccc; padding:10px; font-family: monospace;'>"
-            + "<br>".join(log_lines) +
+            + "<br>".join(self.log_lines) +
             "</div>",
             unsafe_allow_html=True
         )
 
-    def update_progress(step, total_steps, message, current_shape=None):
-        """Update progress bar, status, and log"""
-        progress = step / total_steps
-        progress_bar.progress(progress)
-        status_text.markdown(f"**Step {step}/{total_steps}:** {message}")
-        log_step(step, message, current_shape)
+    def step_started(self, step):
+        self.status_text.markdown(f"**Step {step.number}/{len(STEPS)}:** {step.operation}...")
+
+    def step_finished(self, step, message, df):
+        self.progress_bar.progress(step.number / len(STEPS))
+        self.status_text.markdown(f"**Step {step.number}/{len(STEPS)}:** {message}")
+        self.metrics[0].metric("Rows", f"{df.shape[0]:,}", delta=None)
+        self.metrics[1].metric("Columns", f"{df.shape[1]}", delta=None)
+        self.metrics[2].metric("Missing Values", f"{df.isnull().sum().sum():,}", delta=None)
+        self.metrics[3].metric("Progress", f"{step.number}/{len(STEPS)} steps", delta=None)
+
+        column_bytes = df.memory_usage(deep=True, index=False)
+        total_mb = column_bytes.sum() / 1024 ** 2
+        change_mb = total_mb - self.memory_rows[-1]["Memory (MB)"] if self.memory_rows else 0.0
+        self.memory_rows.append({"Step": step.number, "Operation": step.operation,
+                                 "Memory (MB)": round(total_mb, 1), "Change (MB)": round(change_mb, 1)})
+        self.column_bytes.setdefault("After first step", column_bytes)
+        self.column_bytes["Final"] = column_bytes
+        self.metrics[4].metric("Memory", f"{total_mb:,.1f} MB", delta=f"{change_mb:+,.1f} MB",
+                               delta_color="inverse")
+        self.log(f"Step {step.number}: {message} → Shape: {df.shape}, {total_mb:,.1f} MB")
         time.sleep(0.3)  # Animation delay
 
-    def update_metrics(rows, cols, missing, step_num):
-        """Update displayed metrics"""
-        metric1.metric("Rows", f"{rows:,}", delta=None)
-        metric2.metric("Columns", f"{cols}", delta=None)
-        metric3.metric("Missing Values", f"{missing:,}", delta=None)
-        metric4.metric("Progress", f"{step_num}/15 steps", delta=None)
+    def pass_finished(self, pass_num, message, stats):
+        self.total_rows = stats["raw_rows"]
+        self.progress_bar.progress({1: 0.1, 2: 0.2}.get(pass_num, 1.0))
+        self.status_text.markdown(f"**Pass {pass_num}/3:** {message}")
+        self.log(f"Pass {pass_num}: {message}")
+
+    def chunk_finished(self, chunk_num, rows_read, rows_written, df):
+        self.progress_bar.progress(min(0.2 + 0.8 * rows_read / max(self.total_rows, 1), 1.0))
+        self.status_text.markdown(f"**Pass 3/3:** Transformed chunk {chunk_num}")
+        self.metrics[0].metric("Rows Read", f"{rows_read:,}", delta=None)
+        self.metrics[1].metric("Rows Written", f"{rows_written:,}", delta=None)
+        self.metrics[2].metric("Columns", f"{df.shape[1]}", delta=None)
+        self.metrics[3].metric("Chunks", f"{chunk_num}", delta=None)
+        self.log(f"Chunk {chunk_num}: {len(df):,} rows written")
+        if self.sample is None and not df.empty:
+            self.sample = df.head(10)
+
+
+def render_downloads(OUTPUT_PATH, export_csv=False, codec=None):
+    """Download buttons for the files already written to disk.
+
+    Streamlit receives an open file handle, optionally of a compressed copy
+    streamed from disk, so the frame is never serialized again.
+    """
+    outputs = [("Parquet", OUTPUT_PATH, 'application/octet-stream')]
+    if export_csv:
+        outputs.append(("CSV", csv_export_path(OUTPUT_PATH), 'text/csv'))
+    for label, path, mime in outputs:
+        path = compressed_copy(path, codec)
+        if codec is not None:
+            mime = {"gzip": 'application/gzip', "zstd": 'application/zstd'}[codec]
+        with open(path, "rb") as output_file:
+            st.download_button(
+                label=f"📥 Download Preprocessed Data ({label}, {os.path.getsize(path) / 1024 ** 2:,.1f} MB)",
+                data=output_file,
+                file_name=os.path.basename(path),
+                mime=mime,
+                type="primary",
+                use_container_width=True
+            )
+
+
+def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH, export_csv=False, use_cache=False, codec=None):
+    """Run the in-memory pipeline with animated step-by-step tracking"""
+    observer = StreamlitObserver()
 
     try:
-        # STEP 1: LOAD DATA
-        update_progress(1, 15, "Loading data...", None)
-        df = pd.read_csv(DATA_PATH)
-        initial_shape = df.shape
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 1)
-        update_progress(1, 15, "Data loaded successfully", df.shape)
-
-        # STEP 2: REMOVE DUPLICATES
-        update_progress(2, 15, "Removing duplicates...", None)
-        df = df.drop_duplicates(subset="ID")
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 2)
-        update_progress(2, 15, "Duplicates removed", df.shape)
-
-        # STEP 3: DROP HIGH MISSINGNESS COLUMNS (>30%)
-        update_progress(3, 15, "Analyzing missing values...", None)
-        missing_percent = round((df.isnull().sum() / df.shape[0]) * 100, 2)
-        remove_cols = missing_percent[missing_percent > 30].index.tolist()
-        df.drop(columns=remove_cols, inplace=True)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 3)
-        update_progress(3, 15, f"Dropped {len(remove_cols)} high-missingness columns", df.shape)
-
-        # STEP 4: DROP NON-ANALYTICAL COLUMNS
-        update_progress(4, 15, "Removing non-analytical columns...", None)
-        drop_cols = ["ID", "Source", "Description", "Street", "Country", 
-                     "Zipcode", "Timezone", "Airport_Code", "Amenity"]
-        drop_cols_existing = [col for col in drop_cols if col in df.columns]
-        df = df.drop(columns=drop_cols_existing)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 4)
-        update_progress(4, 15, f"Dropped {len(drop_cols_existing)} non-analytical columns", df.shape)
-
-        # STEP 5: PARSE AND VALIDATE TEMPORAL DATA
-        update_progress(5, 15, "Parsing temporal data...", None)
-        df["Start_Time"] = pd.to_datetime(df["Start_Time"], errors="coerce")
-        df["End_Time"] = pd.to_datetime(df["End_Time"], errors="coerce")
-        rows_before = len(df)
-        df = df.dropna(subset=["Start_Time", "End_Time"])
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 5)
-        update_progress(5, 15, f"Temporal data validated ({rows_dropped} invalid rows removed)", df.shape)
-
-        # STEP 6: VALIDATE GEOGRAPHIC DATA
-        update_progress(6, 15, "Validating geographic coordinates...", None)
-        df['Start_Lat'] = pd.to_numeric(df['Start_Lat'], errors='coerce')
-        df['Start_Lng'] = pd.to_numeric(df['Start_Lng'], errors='coerce')
-        rows_before = len(df)
-        df = df.dropna(subset=["Start_Lat", "Start_Lng"])
-        rows_dropped = rows_before - len(df)
-        df.rename(columns={'Start_Lat': 'Latitude', 'Start_Lng': 'Longitude'}, inplace=True)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 6)
-        update_progress(6, 15, f"Geographic data validated ({rows_dropped} invalid rows removed)", df.shape)
-
-        # STEP 7: FILTER SEVERITY CLASSES
-        update_progress(7, 15, "Filtering severity classes...", None)
-        rows_before = len(df)
-        df = df[df["Severity"].isin([1, 2, 3, 4])]
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 7)
-        update_progress(7, 15, f"Severity classes filtered ({rows_dropped} outliers removed)", df.shape)
-
-        # STEP 8: DROP ROWS WITH LOW MISSINGNESS (<3%)
-        update_progress(8, 15, "Handling low-missingness rows...", None)
-        missing_percent = (df.isnull().sum() / df.shape[0]) * 100
-        low_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= 3)].index.tolist()
-        rows_before = len(df)
-        if low_missing_cols:
-            df.dropna(subset=low_missing_cols, inplace=True)
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 8)
-        update_progress(8, 15, f"Low-missingness rows dropped ({rows_dropped} rows removed)", df.shape)
-
-        # STEP 9: TARGETED WEATHER IMPUTATION
-        update_progress(9, 15, "Performing targeted weather imputation...", None)
-        imputation_count = 0
-        
-        if 'Wind_Speed(mph)' in df.columns and df['Wind_Speed(mph)'].isnull().any():
-            wind_median = df['Wind_Speed(mph)'].median()
-            count = df['Wind_Speed(mph)'].isnull().sum()
-            df['Wind_Speed(mph)'] = df['Wind_Speed(mph)'].fillna(wind_median)
-            imputation_count += count
-        
-        if 'Precipitation(in)' in df.columns and df['Precipitation(in)'].isnull().any():
-            count = df['Precipitation(in)'].isnull().sum()
-            df['Precipitation(in)'] = df['Precipitation(in)'].fillna(0.0)
-            imputation_count += count
-        
-        if 'Wind_Chill(F)' in df.columns and df['Wind_Chill(F)'].isnull().any():
-            reg_features = ['Wind_Speed(mph)', 'Temperature(F)', 'Humidity(%)']
-            if all(col in df.columns for col in reg_features):
-                known_wc = df[df['Wind_Chill(F)'].notna()]
-                unknown_wc = df[df['Wind_Chill(F)'].isna()]
-                if len(unknown_wc) > 0:
-                    X_train = known_wc[reg_features]
-                    y_train = known_wc['Wind_Chill(F)']
-                    reg = LinearRegression()
-                    reg.fit(X_train, y_train)
-                    X_pred = unknown_wc[reg_features]
-                    predicted_wc = reg.predict(X_pred)
-                    df.loc[df['Wind_Chill(F)'].isna(), 'Wind_Chill(F)'] = predicted_wc
-                    imputation_count += len(unknown_wc)
-        
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 9)
-        update_progress(9, 15, f"Weather imputation complete ({imputation_count:,} values imputed)", df.shape)
-
-        # STEP 10: GENERAL NUMERIC IMPUTATION
-        update_progress(10, 15, "General numeric imputation...", None)
-        num_cols = df.select_dtypes(include="number").columns.tolist()
-        imputed_cols = []
-        for col in num_cols:
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(df[col].median())
-                imputed_cols.append(col)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 10)
-        update_progress(10, 15, f"General imputation complete ({len(imputed_cols)} columns)", df.shape)
-
-        # STEP 11: FEATURE ENGINEERING - TEMPORAL
-        update_progress(11, 15, "Creating temporal features...", None)
-        df["Duration_Minutes"] = (df["End_Time"] - df["Start_Time"]).dt.total_seconds() / 60
-        df['Year'] = df["Start_Time"].dt.year
-        df["Hour"] = df["Start_Time"].dt.hour
-        df["DayOfWeek"] = df["Start_Time"].dt.weekday
-        df["Month"] = df["Start_Time"].dt.month
-        df["IsWeekend"] = df["DayOfWeek"].isin([5, 6]).astype(int)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 11)
-        update_progress(11, 15, "Temporal features created (6 new features)", df.shape)
-
-        # STEP 12: FEATURE ENCODING - CATEGORICAL
-        update_progress(12, 15, "Encoding categorical features...", None)
-        bool_cols = ["Roundabout", "Station", "Stop", "Traffic_Calming", 
-                     "Traffic_Signal", "Turning_Loop"]
-        encoded_count = 0
-        for col in bool_cols:
-            if col in df.columns:
-                df[col] = df[col].astype(int)
-                encoded_count += 1
-        
-        if "Sunrise_Sunset" in df.columns:
-            df["IsDay"] = (df["Sunrise_Sunset"] == "Day").astype(int)
-            encoded_count += 1
-        
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 12)
-        update_progress(12, 15, f"Categorical encoding complete ({encoded_count} features)", df.shape)
-
-        # STEP 13: DROP REDUNDANT FEATURES
-        update_progress(13, 15, "Removing redundant features...", None)
-        redundant_cols = ["Start_Time", "End_Time", "Weather_Timestamp", 
-                          "Civil_Twilight", "Nautical_Twilight", 
-                          "Astronomical_Twilight", "Sunrise_Sunset"]
-        redundant_cols_existing = [col for col in redundant_cols if col in df.columns]
-        df = df.drop(columns=redundant_cols_existing)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 13)
-        update_progress(13, 15, f"Redundant features removed ({len(redundant_cols_existing)} columns)", df.shape)
-
-        # STEP 14: FINAL CLEANUP
-        update_progress(14, 15, "Final cleanup...", None)
-        rows_before = len(df)
-        df = df.dropna()
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 14)
-        update_progress(14, 15, f"Final cleanup complete ({rows_dropped} rows removed)", df.shape)
-
-        # STEP 15: SAVE PREPROCESSED DATA
-        update_progress(15, 15, "Saving preprocessed data...", None)
-        df.to_csv(OUTPUT_PATH, index=False)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 15)
-        update_progress(15, 15, f"Data saved to {OUTPUT_PATH}", df.shape)
+        cache = CheckpointCache() if use_cache else None
+        df, ctx = run_pipeline(DATA_PATH, OUTPUT_PATH, export_csv, observer, cache)
+        initial_shape = ctx["initial_shape"]
 
         # FINAL SUMMARY
-        progress_bar.progress(1.0)
-        status_text.markdown("### ✅ Preprocessing Complete!")
+        observer.progress_bar.progress(1.0)
+        observer.status_text.markdown("### ✅ Preprocessing Complete!")
         
         st.markdown("---")
         st.success("🎉 Preprocessing pipeline completed successfully!")
@@ -303,6 +221,12 @@ def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
             st.metric("Data Quality", "✓ Validated")
             st.metric("File Saved", "✓ Success")
         
+        # Memory accounting
+        st.markdown("### 🧠 Memory by Step")
+        st.dataframe(pd.DataFrame(observer.memory_rows), use_container_width=True, hide_index=True)
+        with st.expander("📦 Bytes per Column (first vs final step)"):
+            st.dataframe(pd.DataFrame(observer.column_bytes).astype("Int64"), use_container_width=True)
+
         # Display sample data
         st.markdown("### 📋 Sample of Preprocessed Data")
         st.dataframe(df.head(10), use_container_width=True)
@@ -313,16 +237,8 @@ def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
             cols_str = ", ".join(df.columns)
             st.code(cols_str, language="text")
         
-        # Download button
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download Preprocessed Data (CSV)",
-            data=csv,
-            file_name=OUTPUT_PATH.split("/")[-1],
-            mime='text/csv',
-            type="primary",
-            use_container_width=True
-        )
+        # Download buttons
+        render_downloads(OUTPUT_PATH, export_csv, codec)
         
     except FileNotFoundError:
         st.error(f"❌ File not found: {DATA_PATH}")
@@ -332,3 +248,52 @@ def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
         st.error(f"❌ An error occurred: {str(e)}")
         with st.expander("📋 Error Details"):
             st.exception(e)
+
+
+def run_chunked_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH, chunksize=DEFAULT_CHUNKSIZE,
+                                       export_csv=False, codec=None):
+    """Run the chunked pipeline: two statistics passes, then a streaming transform pass"""
+    observer = StreamlitObserver()
+
+    try:
+        ctx = run_chunked_pipeline(DATA_PATH, OUTPUT_PATH, chunksize, export_csv, observer)
+        stats = ctx["stats"]
+        columns = ctx["columns"]
+
+        # FINAL SUMMARY
+        observer.progress_bar.progress(1.0)
+        observer.status_text.markdown("### ✅ Preprocessing Complete!")
+
+        st.markdown("---")
+        st.success(f"🎉 Chunked preprocessing completed successfully! Data saved to {OUTPUT_PATH}")
+
+        st.markdown("### 📊 Final Summary")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Initial Rows", f"{stats['raw_rows']:,}")
+            st.metric("Final Rows", f"{ctx['rows_written']:,}")
+        with col2:
+            st.metric("Initial Columns", f"{stats['raw_cols']}")
+            st.metric("Final Columns", f"{len(columns)}")
+        with col3:
+            st.metric("Chunk Size", f"{chunksize:,}")
+            st.metric("File Saved", "✓ Success")
+
+        if observer.sample is not None:
+            st.markdown("### 📋 Sample of Preprocessed Data")
+            st.dataframe(observer.sample, use_container_width=True)
+
+        with st.expander("📑 Final Column List"):
+            st.write(f"**Total Columns:** {len(columns)}")
+            st.code(", ".join(columns), language="text")
+
+        render_downloads(OUTPUT_PATH, export_csv, codec)
+
+    except FileNotFoundError:
+        st.error(f"❌ File not found: {DATA_PATH}")
+        st.info("Please check the file path and make sure the file exists.")
+
+    except Exception as e:
+        st.error(f"❌ An error occurred: {str(e)}")
+        with st.expander("📋 Error Details"):
+            st.exception(e)
@@ -0,0 +1,99 @@
+"""Bias-corrected Cramér's V matrix for many categorical columns.
+
+Each column is integer-encoded once. The contingency table of a pair is a
+single ``np.bincount`` over the combined codes, and only the upper triangle
+is computed, since the matrix is symmetric. Pairs can be spread across a
+process pool; the workers receive the encoded columns once, when they start.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+
+DENSE_MAX_CELLS = 1_000_000      # Larger tables are reduced to their observed cells
+PARALLEL_MIN_ROWS = 1_000_000    # Below this, a process pool costs more than it saves
+
+_worker_codes = None
+
+
+def encode(series):
+    """(codes, levels) with -1 for missing values"""
+    codes, levels = pd.factorize(series, sort=False)
+    return codes.astype(np.int64), len(levels)
+
+
+def cramers_v_from_table(table):
+    """Bias-corrected Cramér's V of a dense contingency table without empty rows or columns"""
+    return _bias_corrected(chi2_contingency(table)[0], table.sum(), *table.shape)
+
+
+def _bias_corrected(chi2, n, r, k):
+    phi2 = chi2 / n
+    phi2corr = max(0, phi2 - ((k - 1) * (r - 1)) / (n - 1))
+    rcorr = r - ((r - 1) ** 2) / (n - 1)
+    kcorr = k - ((k - 1) ** 2) / (n - 1)
+    if rcorr == 0 or kcorr == 0 or min(kcorr - 1, rcorr - 1) == 0:
+        return np.nan
+    return np.sqrt(phi2corr / min((kcorr - 1), (rcorr - 1)))
+
+
+def pair_cramers_v(a, b):
+    """Cramér's V of two encoded columns, using rows where both are present (as ``pd.crosstab``)"""
+    (codes_a, levels_a), (codes_b, levels_b) = a, b
+    present = (codes_a >= 0) & (codes_b >= 0)
+    cells = np.bincount(codes_a[present] * levels_b + codes_b[present], minlength=levels_a * levels_b) \
+        if levels_a * levels_b <= DENSE_MAX_CELLS else None
+
+    if cells is not None:
+        table = cells.reshape(levels_a, levels_b)
+        table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+        if table.size == 0:
+            return np.nan
+        return cramers_v_from_table(table)
+
+    # Sparse path: chi2 = n * (sum of O^2 / (row total * column total) over observed cells - 1).
+    # Only 2x2 tables get a continuity correction in chi2_contingency, and those stay dense.
+    cell_ids, counts = np.unique(codes_a[present] * levels_b + codes_b[present], return_counts=True)
+    rows, cols = np.divmod(cell_ids, levels_b)
+    row_totals = np.bincount(rows, weights=counts, minlength=levels_a)
+    col_totals = np.bincount(cols, weights=counts, minlength=levels_b)
+    n = counts.sum()
+    chi2 = n * ((counts ** 2 / (row_totals[rows] * col_totals[cols])).sum() - 1)
+    return _bias_corrected(chi2, n, np.count_nonzero(row_totals), np.count_nonzero(col_totals))
+
+
+def _init_worker(codes):
+    global _worker_codes
+    _worker_codes = codes
+
+
+def _worker_pair(pair):
+    i, j = pair
+    return pair_cramers_v(_worker_codes[i], _worker_codes[j])
+
+
+def cramers_v_matrix(df, features, workers=None):
+    """Symmetric Cramér's V matrix of ``features``; undefined pairs are 0.
+
+    ``workers`` defaults to one process per CPU for frames of at least
+    ``PARALLEL_MIN_ROWS`` rows and to a single process otherwise.
+    """
+    codes = [encode(df[col]) for col in features]
+    pairs = list(combinations(range(len(features)), 2))
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(df) >= PARALLEL_MIN_ROWS else 1
+
+    if workers > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(min(workers, len(pairs)), initializer=_init_worker,
+                                 initargs=(codes,)) as pool:
+            values = list(pool.map(_worker_pair, pairs))
+    else:
+        values = [pair_cramers_v(codes[i], codes[j]) for i, j in pairs]
+
+    matrix = np.eye(len(features))
+    for (i, j), value in zip(pairs, values):
+        matrix[i, j] = matrix[j, i] = 0 if np.isnan(value) else value
+    return matrix
@@ -0,0 +1,65 @@
+"""Histogram and kernel density summaries computed server-side.
+
+Pages send the browser bin counts and a few hundred KDE points instead of
+every value. The KDE linearly bins the data onto a fine grid and convolves
+it with a Gaussian kernel by FFT. That is O(n + g log g) instead of the
+O(n × points) direct sum of ``scipy.stats.gaussian_kde``, and it uses the
+same Scott's-rule bandwidth.
+"""
+import numpy as np
+from scipy.signal import fftconvolve
+
+DEFAULT_BINS = 30
+DISPLAY_POINTS = 200          # Points the KDE curve is drawn with
+MIN_GRID_SIZE = 512
+MAX_GRID_SIZE = 2 ** 16
+GRID_POINTS_PER_BANDWIDTH = 4  # Grid spacing of at most a quarter bandwidth keeps binning error negligible
+
+
+def finite_values(series):
+    """Non-missing values of a numeric (or boolean) column as a float array"""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def histogram(values, bins=DEFAULT_BINS):
+    """(counts, edges) of ``bins`` equal-width bins between the min and max"""
+    return np.histogram(values, bins=bins)
+
+
+def scott_bandwidth(values):
+    """Scott's rule, as used by ``scipy.stats.gaussian_kde``"""
+    return values.std(ddof=1) * len(values) ** (-1 / 5)
+
+
+def binned_kde(values, bandwidth_factor=1.0, points=DISPLAY_POINTS):
+    """Gaussian KDE at ``points`` evenly spaced x values between the min and max.
+
+    ``bandwidth_factor`` scales Scott's-rule bandwidth. Returns (x, density),
+    or None when the column is constant or too short to estimate.
+    """
+    if len(values) < 2:
+        return None
+    low, high = values.min(), values.max()
+    bandwidth = scott_bandwidth(values) * bandwidth_factor
+    if high == low or not bandwidth > 0:
+        return None
+
+    grid_size = int(np.clip(np.ceil((high - low) / bandwidth * GRID_POINTS_PER_BANDWIDTH) + 1,
+                            MIN_GRID_SIZE, MAX_GRID_SIZE))
+    delta = (high - low) / (grid_size - 1)
+
+    # Linear binning: each value splits its weight between the two nearest grid points
+    position = (values - low) / delta
+    index = np.minimum(position.astype(np.int64), grid_size - 2)
+    fraction = position - index
+    weights = (np.bincount(index, 1 - fraction, minlength=grid_size)
+               + np.bincount(index + 1, fraction, minlength=grid_size))
+
+    reach = min(grid_size - 1, int(np.ceil(4 * bandwidth / delta)))
+    offsets = np.arange(-reach, reach + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.clip(fftconvolve(weights, kernel, mode="same"), 0, None) / len(values)
+
+    x = np.linspace(low, high, points)
+    return x, np.interp(x, np.linspace(low, high, grid_size), density)
@@ -0,0 +1,81 @@
+"""Size-bounded, on-disk checkpoint cache for the preprocessing pipeline.
+
+Each checkpoint is one pickle holding a step's output frame plus the run
+state needed to resume after it. Keys are built by the pipeline from the
+input file's content hash and each step's fingerprint, so stale checkpoints
+are never hit; they simply age out. Once the total size exceeds
+``max_bytes``, the least recently used checkpoints are evicted.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = "data/.pipeline_cache"
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+
+
+class CheckpointCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._hash_index_path = os.path.join(cache_dir, "input_hashes.json")
+
+    def file_hash(self, path):
+        """SHA-256 of a file's content, memoised by (path, size, mtime) to skip rehashing"""
+        stat = os.stat(path)
+        memo_key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        index = {}
+        if os.path.exists(self._hash_index_path):
+            with open(self._hash_index_path) as f:
+                index = json.load(f)
+        if memo_key not in index:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+                    digest.update(block)
+            index[memo_key] = digest.hexdigest()
+            with open(self._hash_index_path, "w") as f:
+                json.dump(index, f, indent=2)
+        return index[memo_key]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key):
+        """Return the checkpoint payload for ``key``, or None on a miss"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            payload = pd.read_pickle(path)
+        except Exception:
+            # Truncated or unreadable checkpoint: drop it and treat as a miss
+            os.remove(path)
+            return None
+        os.utime(path)  # Mark as recently used for LRU eviction
+        return payload
+
+    def save(self, key, payload):
+        path = self._path(key)
+        pd.to_pickle(payload, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Delete least recently used checkpoints until the cache fits in ``max_bytes``"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, path, stat.st_size))
+        total = sum(size for _, _, size in entries)
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                os.remove(path)
+                total -= size
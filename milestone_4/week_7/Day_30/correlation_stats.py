@@ -0,0 +1,156 @@
+"""Streaming, mergeable Pearson correlation accumulators.
+
+For every pair of numeric columns (i, j), the accumulator keeps these
+sums over the rows where both values are present:
+- the row count
+- the sums of x_i and of x_j
+- the sums of squares
+- the cross-product
+
+So NaNs are handled pairwise, exactly like ``DataFrame.corr()``. Values are
+shifted by a per-column constant, so the sums stay small and the variance
+formula does not cancel catastrophically.
+
+Accumulators are updated chunk by chunk and merged across extracts. They
+are saved next to the preprocessed dataset (``*.corr.npz``), so the
+correlation of any subset of columns is a lookup, not a rescan.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy.stats import beta
+
+from dataset_io import PREPROCESSED_PATH
+
+BLOCK_ROWS = 1_000_000
+
+
+def correlation_path(dataset_path):
+    return os.path.splitext(dataset_path)[0] + ".corr.npz"
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+class CorrelationAccumulator:
+    def __init__(self, columns=None):
+        self.columns = None if columns is None else list(columns)
+        self.shift = None
+        self.n = self.s = self.q = self.p = None
+
+    @property
+    def empty(self):
+        return self.shift is None
+
+    def update(self, df):
+        """Add the rows of ``df``; the columns default to the numeric columns of the first frame"""
+        if self.columns is None:
+            self.columns = df.select_dtypes(include="number").columns.tolist()
+        for start in range(0, len(df), BLOCK_ROWS):
+            values = df[self.columns].iloc[start:start + BLOCK_ROWS].to_numpy(dtype=float, na_value=np.nan)
+            present = ~np.isnan(values)
+            if self.shift is None:
+                self.shift = np.nan_to_num(np.nanmean(np.where(present, values, np.nan), axis=0))
+                k = len(self.columns)
+                self.n, self.s, self.q, self.p = (np.zeros((k, k)) for _ in range(4))
+            x = np.where(present, values - self.shift, 0.0)
+            mask = present.astype(float)
+            self.n += mask.T @ mask
+            self.s += x.T @ mask          # s[i, j]: sum of x_i where x_j is present
+            self.q += (x * x).T @ mask
+            self.p += x.T @ x
+        return self
+
+    def merge(self, other):
+        """Fold in an accumulator of the same columns (fitted on other rows)"""
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.columns, self.shift = other.columns, other.shift
+            self.n, self.s, self.q, self.p = (a.copy() for a in (other.n, other.s, other.q, other.p))
+            return self
+        if other.columns != self.columns:
+            raise ValueError("Correlation accumulators cover different columns")
+        # Re-express the other sums around this accumulator's shift
+        d = (other.shift - self.shift)[:, None]
+        self.n += other.n
+        self.s += other.s + d * other.n
+        self.q += other.q + 2 * d * other.s + d ** 2 * other.n
+        self.p += other.p + d * other.s.T + other.s * d.T + d * d.T * other.n
+        return self
+
+    def corr(self, columns=None):
+        """Pearson correlation matrix of ``columns`` (all when None) as a DataFrame"""
+        columns = self.columns if columns is None else list(columns)
+        idx = [self.columns.index(col) for col in columns]
+        n, s, q, p = (a[np.ix_(idx, idx)] for a in (self.n, self.s, self.q, self.p))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * p - s * s.T
+            var = (n * q - s * s) * (n * q - s * s).T
+            r = np.clip(cov / np.sqrt(var), -1, 1)
+        return pd.DataFrame(r, index=columns, columns=columns)
+
+    def pearson(self, x, y):
+        """(r, p, n) of the Pearson test between two columns, as ``scipy.stats.pearsonr`` on their paired rows"""
+        r = self.corr([x, y]).iloc[0, 1]
+        n = self.n[self.columns.index(x), self.columns.index(y)]
+        # Under independence, (r + 1) / 2 follows Beta(n/2 - 1, n/2 - 1)
+        half_dof = n / 2 - 1
+        p = 2 * beta(half_dof, half_dof, loc=-1, scale=2).sf(abs(r))
+        return r, p, int(n)
+
+    def save(self, path, source=None):
+        """Write the sums to ``path``; ``source`` is the dataset they describe"""
+        arrays = dict(columns=np.array(self.columns), shift=self.shift, n=self.n, s=self.s, q=self.q, p=self.p)
+        if source is not None:
+            arrays["source"] = _signature(source)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            acc = cls(data["columns"].tolist())
+            acc.shift, acc.n, acc.s, acc.q, acc.p = (data[name] for name in ("shift", "n", "s", "q", "p"))
+            source = data["source"] if "source" in data else None
+        return acc, source
+
+
+def accumulate_file(path, columns=None):
+    """One streaming pass over a preprocessed Parquet (or CSV) file"""
+    acc = CorrelationAccumulator(columns)
+    if path.endswith(".csv"):
+        for chunk in pd.read_csv(path, chunksize=BLOCK_ROWS):
+            acc.update(chunk)
+        return acc
+    if columns is None:
+        schema = pq.read_schema(path).empty_table().to_pandas()
+        acc.columns = schema.select_dtypes(include="number").columns.tolist()
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=BLOCK_ROWS, columns=acc.columns):
+        acc.update(batch.to_pandas())
+    return acc
+
+
+def saved_correlations(path=PREPROCESSED_PATH):
+    """The saved accumulator of the dataset at ``path``, or None when missing or out of date"""
+    sidecar = correlation_path(path)
+    if not os.path.exists(sidecar) or not os.path.exists(path):
+        return None
+    acc, source = CorrelationAccumulator.load(sidecar)
+    if source is None or not np.array_equal(source, _signature(path)):
+        return None
+    return acc
+
+
+def load_correlations(path=PREPROCESSED_PATH):
+    """Accumulator of the dataset at ``path``: the saved one while it is current, else rebuilt and saved"""
+    acc = saved_correlations(path)
+    if acc is None:
+        acc = accumulate_file(path)
+        acc.save(correlation_path(path), source=path)
+    return acc
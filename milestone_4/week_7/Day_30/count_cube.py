@@ -0,0 +1,210 @@
+"""Dense count cubes over the dataset's low-cardinality columns.
+
+A cube counts the rows of every combination of its axes in one NumPy
+array. Counts, distributions and crosstabs of those columns then come from
+summing the array, without touching the rows:
+- time: Year x Month x DayOfWeek x Hour x State x Severity
+- weather: Weather_Condition x Month x Hour x Severity
+- weather_group: the same by Weather_Group (see ``weather_taxonomy``)
+- road: each road feature flag (0/1) x Severity
+
+Hour, DayOfWeek and Month (step 11) have fixed domains. The labels of the
+other axes grow as new values arrive, so cubes can be updated chunk by chunk
+and by appended extracts. Rows missing an axis value are left out of that
+cube, like ``groupby``. The pipeline saves the cubes next to its output
+(``*.cube.npz``)::
+
+    cubes = load_cubes()
+    cubes["time"].counts("Hour")                                  # hourly counts
+    cubes["time"].counts(["Month", "Severity"], where={"State": "CA"})
+    cubes["time"].total(where={"Severity": [3, 4]})
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dataset_io import PREPROCESSED_PATH
+
+ROAD_FLAGS = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit', 'Railway', 'Roundabout',
+              'Station', 'Stop', 'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
+CUBES = {
+    "time": ["Year", "Month", "DayOfWeek", "Hour", "State", "Severity"],
+    "weather": ["Weather_Condition", "Month", "Hour", "Severity"],
+    "weather_group": ["Weather_Group", "Month", "Hour", "Severity"],
+    "road": ROAD_FLAGS + ["Severity"],
+}
+FIXED_LABELS = {"Month": list(range(1, 13)), "DayOfWeek": list(range(7)), "Hour": list(range(24)),
+                **{flag: [0, 1] for flag in ROAD_FLAGS}}
+COUNT_DTYPE = np.int32   # 2**31 accidents per cell is plenty; halves the footprint of int64
+BATCH_ROWS = 1_000_000
+
+
+def cube_path(dataset_path):
+    return os.path.splitext(dataset_path)[0] + ".cube.npz"
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _axis_values(series):
+    """Values as axis labels: strings for text and categories, integers for numbers and flags"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        return series.astype(str).to_numpy(dtype=object)
+    return series.to_numpy().astype(np.int64)
+
+
+class CountCube:
+    def __init__(self, axes):
+        self.axes = list(axes)
+        self.labels = {axis: list(FIXED_LABELS.get(axis, [])) for axis in self.axes}
+        self.data = np.zeros([len(self.labels[axis]) for axis in self.axes], dtype=COUNT_DTYPE)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def update(self, df):
+        frame = df[self.axes]
+        frame = frame[frame.notna().all(axis=1).to_numpy()]
+        codes = []
+        for axis in self.axes:
+            values = _axis_values(frame[axis])
+            unseen = pd.Index(pd.unique(values)).difference(pd.Index(self.labels[axis], dtype=object))
+            if len(unseen):
+                self._extend(axis, sorted(set(self.labels[axis]) | set(unseen)))
+            codes.append(pd.Index(self.labels[axis]).get_indexer(values))
+        flat = np.ravel_multi_index(codes, self.data.shape)
+        self.data += np.bincount(flat, minlength=self.data.size).reshape(self.data.shape).astype(COUNT_DTYPE)
+        return self
+
+    def _extend(self, axis, labels):
+        """Grow ``axis`` to ``labels`` (a sorted superset), keeping the counts of the old labels"""
+        position = self.axes.index(axis)
+        shape = list(self.data.shape)
+        shape[position] = len(labels)
+        data = np.zeros(shape, dtype=COUNT_DTYPE)
+        index = [slice(None)] * self.data.ndim
+        index[position] = pd.Index(labels).get_indexer(self.labels[axis])
+        data[tuple(index)] = self.data
+        self.data, self.labels[axis] = data, list(labels)
+
+    def _select(self, where):
+        """(data, labels) restricted to the labels chosen by ``where``"""
+        data, labels = self.data, dict(self.labels)
+        for axis, value in (where or {}).items():
+            axis_labels = np.array(labels[axis], dtype=object)
+            keep = (np.asarray(value(axis_labels), dtype=bool) if callable(value)
+                    else np.isin(axis_labels, np.atleast_1d(np.asarray(value, dtype=object))))
+            data = np.compress(keep, data, axis=self.axes.index(axis))
+            labels[axis] = list(axis_labels[keep])
+        return data, labels
+
+    def counts(self, by, where=None):
+        """Row counts per label of the ``by`` axes, among the cells chosen by ``where``.
+
+        ``where`` maps axes to a label, a list of labels or a predicate on the label array.
+        Returns a Series indexed by the ``by`` labels (a MultiIndex for several axes).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        data, labels = self._select(where)
+        data = data.sum(axis=tuple(i for i, axis in enumerate(self.axes) if axis not in by), dtype=np.int64)
+        kept = [axis for axis in self.axes if axis in by]
+        data = np.transpose(data, [kept.index(axis) for axis in by])
+        if len(by) == 1:
+            index = pd.Index(labels[by[0]], name=by[0])
+        else:
+            index = pd.MultiIndex.from_product([labels[axis] for axis in by], names=by)
+        return pd.Series(data.ravel(), index=index, name="count")
+
+    def total(self, where=None):
+        return int(self._select(where)[0].sum(dtype=np.int64))
+
+
+class CubeAccumulator:
+    """The ``CUBES`` whose axes a dataset has, updated chunk by chunk"""
+
+    def __init__(self):
+        self.cubes = None
+
+    @property
+    def empty(self):
+        return self.cubes is None
+
+    def __getitem__(self, name):
+        return self.cubes[name]
+
+    def __contains__(self, name):
+        return self.cubes is not None and name in self.cubes
+
+    @property
+    def nbytes(self):
+        return sum(cube.nbytes for cube in self.cubes.values()) if self.cubes else 0
+
+    def update(self, df):
+        if self.cubes is None:
+            self.cubes = {name: CountCube(axes) for name, axes in CUBES.items()
+                          if all(axis in df.columns for axis in axes)}
+        for cube in self.cubes.values():
+            cube.update(df)
+        return self
+
+    def save(self, path, source=None):
+        arrays = {}
+        for name, cube in self.cubes.items():
+            arrays[f"{name}/data"] = cube.data
+            for axis in cube.axes:
+                labels = np.array(cube.labels[axis])
+                arrays[f"{name}/axis/{axis}"] = labels.astype(str) if labels.dtype == object else labels
+        if source is not None:
+            arrays["source"] = _signature(source)
+        with open(path + ".tmp", "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        acc = cls()
+        acc.cubes = {}
+        with np.load(path, allow_pickle=False) as data:
+            for name, axes in CUBES.items():
+                if f"{name}/data" not in data:
+                    continue
+                cube = CountCube(axes)
+                cube.data = data[f"{name}/data"]
+                cube.labels = {axis: data[f"{name}/axis/{axis}"].tolist() for axis in axes}
+                acc.cubes[name] = cube
+            source = data["source"] if "source" in data else None
+        return acc, source
+
+
+def saved_cubes(path=PREPROCESSED_PATH):
+    """The saved cubes of the dataset at ``path``, or None when missing or out of date"""
+    sidecar = cube_path(path)
+    if not os.path.exists(sidecar) or not os.path.exists(path):
+        return None
+    acc, source = CubeAccumulator.load(sidecar)
+    if source is None or not np.array_equal(source, _signature(path)):
+        return None
+    return acc
+
+
+def load_cubes(path=PREPROCESSED_PATH):
+    """Cubes of the dataset at ``path``: the saved ones while current, else rebuilt in one pass and saved"""
+    acc = saved_cubes(path)
+    if acc is None:
+        acc = CubeAccumulator()
+        columns = sorted({axis for axes in CUBES.values() for axis in axes})
+        if path.endswith(".csv"):
+            available = pd.read_csv(path, nrows=0).columns
+            acc.update(pd.read_csv(path, usecols=[col for col in columns if col in available]))
+        else:
+            available = pq.read_schema(path).names
+            for batch in pq.ParquetFile(path).iter_batches(
+                    batch_size=BATCH_ROWS, columns=[col for col in columns if col in available]):
+                acc.update(batch.to_pandas())
+        acc.save(cube_path(path), source=path)
+    return acc
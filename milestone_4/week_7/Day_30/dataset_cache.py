@@ -0,0 +1,170 @@
+"""Process-wide dataset cache shared by every analysis page.
+
+Streamlit reruns a page's ``run()`` on every widget interaction. Pages
+call ``get_preprocessed`` / ``get_raw`` instead of reading files, so each
+dataset is parsed once per process, not on every click.
+
+- Entries are keyed by path and load options. They are revalidated
+  against the file's mtime, size and inode on every access, so a rewritten
+  or replaced file is reloaded.
+- The preprocessed dataset is cached column by column. A page asks only
+  for the columns it uses, and a column requested later (say, picked in a
+  selectbox) is read on first use and then served from memory.
+- Pages receive shallow copies whose numeric values and category codes
+  are read-only. Adding or replacing columns is free, while writing into
+  cached values raises instead of corrupting other sessions.
+- Small derived summaries (bin counts, density curves) are cached with
+  ``get_summary`` under the same file versioning, so redraws are instant.
+- Resident datasets (raw, preprocessed, projections, samples) share a
+  memory budget. Once it is exceeded, the least recently used entry is
+  evicted.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import PREPROCESSED_PATH, RAW_DATA_PATH, load_preprocessed, load_preprocessed_schema
+
+DEFAULT_BUDGET_BYTES = 4 * 1024 ** 3
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _frozen_array(series):
+    """The series' values with read-only numeric data or categorical codes, sharing its memory.
+
+    Object values stay writable because some pandas routines, such as deep
+    memory usage, need writable object buffers. Other extension arrays are
+    returned as they are.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        codes.flags.writeable = False
+        return pd.Categorical.from_codes(codes, dtype=series.dtype)
+    if isinstance(series.dtype, np.dtype) and series.dtype != object:
+        values = series.to_numpy()
+        values.flags.writeable = False
+        return values
+    return series.array
+
+
+def _freeze(data):
+    """Rebuild a frame or series on read-only views of its values (see ``_frozen_array``)"""
+    if isinstance(data, pd.Series):
+        return pd.Series(_frozen_array(data), index=data.index, name=data.name, copy=False)
+    return pd.DataFrame({col: _frozen_array(data[col]) for col in data.columns}, index=data.index, copy=False)
+
+
+def _summary_nbytes(result):
+    if isinstance(result, tuple):
+        return sum(_summary_nbytes(part) for part in result)
+    return getattr(result, "nbytes", 0)
+
+
+def _option_key(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _options_key(options):
+    return tuple(sorted((name, _option_key(value)) for name, value in options.items()))
+
+
+class DatasetCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # key -> (signature, frame or column, nbytes), LRU first
+        self._lock = threading.RLock()  # Summaries load columns while holding it
+
+    @property
+    def resident_bytes(self):
+        return sum(nbytes for _, _, nbytes in self._entries.values())
+
+    def get(self, path, loader, **options):
+        """Frame produced by ``loader(path, **options)``, loaded at most once per file version"""
+        key = (os.path.abspath(path), loader.__name__, _options_key(options))
+        signature = _file_signature(path)
+        with self._lock:
+            if self._lookup(key, signature) is None:
+                df = _freeze(loader(path, **options))
+                self._entries[key] = (signature, df, int(df.memory_usage(deep=True).sum()))
+                self._entries.move_to_end(key)
+            self._evict(keep={key})
+            return self._entries[key][1].copy(deep=False)
+
+    def get_columns(self, path, columns, loader, **options):
+        """Frame of ``columns`` assembled from per-column entries; only uncached columns are read"""
+        base = (os.path.abspath(path), loader.__name__, _options_key(options))
+        keys = [base + (col,) for col in columns]
+        signature = _file_signature(path)
+        with self._lock:
+            missing = [col for col, key in zip(columns, keys) if self._lookup(key, signature) is None]
+            if missing:
+                loaded = loader(path, columns=missing, **options)
+                for col in missing:
+                    series = _freeze(loaded[col])
+                    self._entries[base + (col,)] = (signature, series,
+                                                    int(series.memory_usage(deep=True, index=False)))
+                    self._entries.move_to_end(base + (col,))
+            self._evict(keep=set(keys))
+            return pd.DataFrame({col: self._entries[key][1] for col, key in zip(columns, keys)}, copy=False)
+
+    def get_summary(self, path, name, compute, *args):
+        """``compute(*args)`` cached per file version of ``path`` under ``(name, *args)``"""
+        key = (os.path.abspath(path), name) + args
+        signature = _file_signature(path)
+        with self._lock:
+            if self._lookup(key, signature) is None:
+                result = compute(*args)
+                self._entries[key] = (signature, result, _summary_nbytes(result))
+                self._entries.move_to_end(key)
+            self._evict(keep={key})
+            return self._entries[key][1]
+
+    def _lookup(self, key, signature):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != signature:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self, keep):
+        # Entries of the current request stay, even if they alone exceed the budget
+        for key in list(self._entries):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if key not in keep:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+DATASET_CACHE = DatasetCache()
+
+
+def get_preprocessed(path=PREPROCESSED_PATH, columns=None, nrows=None):
+    """Cached ``load_preprocessed``, projected to ``columns`` (all when None).
+
+    Requested columns that the dataset does not have are skipped, so pages
+    can keep checking ``if col in df.columns``.
+    """
+    available = load_preprocessed_schema(path).columns
+    columns = list(available) if columns is None else [col for col in columns if col in available]
+    return DATASET_CACHE.get_columns(path, columns, load_preprocessed, nrows=nrows)
+
+
+def get_summary(name, compute, *args, path=PREPROCESSED_PATH):
+    """Cached ``compute(*args)`` derived from the dataset at ``path``; recomputed when it changes"""
+    return DATASET_CACHE.get_summary(path, name, compute, *args)
+
+
+def get_raw(path=RAW_DATA_PATH, nrows=None):
+    """Cached raw accident CSV"""
+    return DATASET_CACHE.get(path, pd.read_csv, nrows=nrows)
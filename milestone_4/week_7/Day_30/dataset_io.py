@@ -0,0 +1,219 @@
+"""Typed columnar storage for the preprocessed accident dataset.
+
+The preprocessing pipeline writes a Parquet file with an explicit Arrow
+schema and every analysis page loads it through ``load_preprocessed``, so
+the CSV is only parsed when it is explicitly exported.
+"""
+import gzip
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    import zstandard
+except ImportError:  # zstd downloads are offered only when the package is installed
+    zstandard = None
+
+RAW_DATA_PATH = "data/US_Accidents_March23.csv"
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.parquet"
+
+# Download compression: codec -> file suffix
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSION_CODECS = ["gzip", "zstd"] if zstandard is not None else ["gzip"]
+COPY_BLOCK_BYTES = 4 * 1024 * 1024
+
+# Dictionary-encoded string columns
+CATEGORICAL_COLS = ["City", "County", "State", "Wind_Direction", "Weather_Condition", "Weather_Group"]
+
+# 0/1 flags created by the pipeline (steps 11 and 12)
+FLAG_COLS = ["Roundabout", "Station", "Stop", "Traffic_Calming", "Traffic_Signal",
+             "Turning_Loop", "IsWeekend", "IsDay"]
+
+# Road features kept as booleans by the pipeline
+ROAD_BOOL_COLS = ["Bump", "Crossing", "Give_Way", "Junction", "No_Exit", "Railway"]
+
+WEATHER_FLOAT_COLS = ["Temperature(F)", "Wind_Chill(F)", "Humidity(%)", "Pressure(in)",
+                      "Visibility(mi)", "Wind_Speed(mph)", "Precipitation(in)"]
+
+# Explicit dtype plan for the preprocessed frame: small integers for severity,
+# calendar fields and flags, float32 weather readings and categorical strings.
+# Coordinates, distance and duration stay float64.
+DTYPE_PLAN = {"Severity": "int8", "Year": "int16", "Hour": "int8", "DayOfWeek": "int8", "Month": "int8"}
+DTYPE_PLAN.update({col: "category" for col in CATEGORICAL_COLS})
+DTYPE_PLAN.update({col: "int8" for col in FLAG_COLS})
+DTYPE_PLAN.update({col: "bool" for col in ROAD_BOOL_COLS})
+DTYPE_PLAN.update({col: "float32" for col in WEATHER_FLOAT_COLS})
+
+SCHEMA_TYPES = {
+    "Latitude": pa.float64(),
+    "Longitude": pa.float64(),
+    "Distance(mi)": pa.float64(),
+    "Duration_Minutes": pa.float64(),
+}
+SCHEMA_TYPES.update({col: pa.dictionary(pa.int32(), pa.string()) if dtype == "category"
+                     else pa.from_numpy_dtype(np.dtype(dtype)) for col, dtype in DTYPE_PLAN.items()})
+
+
+def to_storage_dtypes(df):
+    """Apply ``DTYPE_PLAN`` to a preprocessed frame, casting one column at a time"""
+    df = df.copy(deep=False)
+    for col, dtype in DTYPE_PLAN.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def preprocessed_schema(df):
+    """Explicit Arrow schema for the columns of ``df``; unknown columns keep their inferred type"""
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    return pa.schema([pa.field(field.name, SCHEMA_TYPES.get(field.name, field.type))
+                      for field in inferred])
+
+
+def _to_table(df, schema):
+    return pa.Table.from_pandas(df, preserve_index=False).cast(schema)
+
+
+def csv_export_path(path):
+    """Path of the optional CSV export next to a Parquet output"""
+    return os.path.splitext(path)[0] + ".csv"
+
+
+def compressed_copy(path, codec=None):
+    """Path of ``path`` compressed with ``codec`` (or ``path`` itself when codec is None).
+
+    The file on disk is streamed through the compressor in fixed-size
+    blocks into a sidecar file, which is reused while it is newer than the
+    source, so downloads never re-serialize the frame or hold it in memory.
+    """
+    if codec is None:
+        return path
+    target = path + COMPRESSION_SUFFIXES[codec]
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+        return target
+    with open(path, "rb") as src, open(target + ".tmp", "wb") as raw:
+        if codec == "gzip":
+            with gzip.GzipFile(os.path.basename(path), "wb", fileobj=raw) as dst:
+                shutil.copyfileobj(src, dst, COPY_BLOCK_BYTES)
+        else:
+            zstandard.ZstdCompressor().copy_stream(src, raw, read_size=COPY_BLOCK_BYTES)
+    os.replace(target + ".tmp", target)
+    return target
+
+
+def save_preprocessed(df, path=PREPROCESSED_PATH, export_csv=False):
+    """Write the preprocessed frame as Parquet, optionally exporting CSV too"""
+    df = to_storage_dtypes(df)
+    pq.write_table(_to_table(df, preprocessed_schema(df)), path + ".tmp")
+    os.replace(path + ".tmp", path)
+    if export_csv:
+        df.to_csv(csv_export_path(path) + ".tmp", index=False)
+        os.replace(csv_export_path(path) + ".tmp", csv_export_path(path))
+    return df
+
+
+class PreprocessedWriter:
+    """Append preprocessed chunks to one Parquet file (and optionally a CSV export).
+
+    The schema is fixed by the first chunk so every row group is written
+    with identical types. Rows go to a temp file that replaces the output
+    only once the writer closes without an error, so a failed run leaves
+    the previous output untouched.
+
+    With ``append=True`` the existing file's row groups are copied into the
+    temp file first and new chunks are cast to its schema. Parquet has no
+    in-place append, so this copy costs one read and write of the existing
+    file (but no preprocessing). The CSV export is appended in place and cut
+    back to its original size if the append fails.
+    """
+
+    def __init__(self, path=PREPROCESSED_PATH, export_csv=False, append=False):
+        self.path = path
+        self.csv_path = csv_export_path(path) if export_csv else None
+        self.append = append and os.path.exists(path)
+        self._csv_started = self.append and self.csv_path is not None and os.path.exists(self.csv_path)
+        self._csv_size = os.path.getsize(self.csv_path) if self._csv_started else None
+        self._writer = None
+        if self.append:
+            existing = pq.ParquetFile(path)
+            self._writer = pq.ParquetWriter(path + ".tmp", existing.schema_arrow)
+            for i in range(existing.num_row_groups):
+                self._writer.write_table(existing.read_row_group(i))
+
+    @property
+    def _csv_target(self):
+        return self.csv_path if self._csv_size is not None else self.csv_path + ".tmp"
+
+    def write(self, df):
+        df = to_storage_dtypes(df)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path + ".tmp", preprocessed_schema(df))
+        if self.csv_path:
+            df.to_csv(self._csv_target, mode="a" if self._csv_started else "w",
+                      header=not self._csv_started, index=False)
+            self._csv_started = True
+        schema = self._writer.schema
+        self._writer.write_table(_to_table(df[schema.names], schema))
+        return df
+
+    def close(self, commit=True):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        if commit:
+            os.replace(self.path + ".tmp", self.path)
+            if self._csv_started and self._csv_size is None:
+                os.replace(self.csv_path + ".tmp", self.csv_path)
+            return
+        os.remove(self.path + ".tmp")
+        if self._csv_size is not None:
+            with open(self.csv_path, "r+b") as f:
+                f.truncate(self._csv_size)
+        elif self._csv_started:
+            os.remove(self.csv_path + ".tmp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(commit=exc_type is None)
+
+
+def load_preprocessed(path=PREPROCESSED_PATH, columns=None, nrows=None):
+    """Shared reader for the preprocessed dataset used by every analysis page.
+
+    Parquet files come back with their stored dtypes; a CSV export is parsed
+    and cast to the same dtypes so pages see one consistent frame. Columns
+    are returned as separate blocks so each one can be cached and freed
+    on its own.
+    """
+    if path.endswith(".csv"):
+        return to_storage_dtypes(pd.read_csv(path, usecols=columns, nrows=nrows))
+
+    if nrows is None:
+        return pq.read_table(path, columns=columns).to_pandas(split_blocks=True)
+
+    # Partial read: stop after the first ``nrows`` rows instead of reading every row group
+    parquet_file = pq.ParquetFile(path)
+    batches = []
+    remaining = nrows
+    for batch in parquet_file.iter_batches(batch_size=min(nrows, 65_536), columns=columns):
+        batches.append(batch.slice(0, remaining))
+        remaining -= batches[-1].num_rows
+        if remaining <= 0:
+            break
+    if not batches:
+        return pq.read_table(path, columns=columns).to_pandas(split_blocks=True)
+    return pa.Table.from_batches(batches).to_pandas(split_blocks=True)
+
+
+def load_preprocessed_schema(path=PREPROCESSED_PATH):
+    """Zero-row frame with the dataset's columns and dtypes, read without loading any rows"""
+    if path.endswith(".csv"):
+        return to_storage_dtypes(pd.read_csv(path, nrows=1_000)).iloc[:0]
+    return pq.read_schema(path).empty_table().to_pandas()
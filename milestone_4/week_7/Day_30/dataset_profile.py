@@ -0,0 +1,193 @@
+"""Dataset profile built in one streaming pass and saved as a small JSON artifact.
+
+The profile holds, per column:
+- the dtype, null count and null percentage
+- top-k values, for columns with at most ``TRACKED_VALUES`` distinct values
+- for numeric columns, describe() statistics
+
+It also holds missingness aggregated into row blocks, which draws the
+Data Exploration heatmap without loading the raw file. The preprocessing
+pipeline adds the null counts steps 3 and 8 need (see
+``preprocessing_pipeline.profile_raw_data``). The artifact records the
+size and mtime of its source files and is ignored once they change.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+FINE_BLOCK_ROWS = 1_000        # Missingness is counted per 1,000 rows ...
+MAX_HEATMAP_BLOCKS = 200       # ... and merged into at most 200 heatmap rows
+TOP_K = 10
+TRACKED_VALUES = 10_000        # Columns with more distinct values are not counted for top-k
+QUANTILE_SAMPLE_SIZE = 100_000
+SEED = 42
+
+
+def profile_path(data_path):
+    """Profile artifact next to the (first) raw input file"""
+    paths = [data_path] if isinstance(data_path, str) else list(data_path)
+    stem = os.path.splitext(paths[0])[0]
+    if len(paths) > 1:
+        # A profile of several inputs must not replace the profile of the first one alone
+        stem += "." + hashlib.sha1("|".join(map(os.path.abspath, paths)).encode()).hexdigest()[:8]
+    return stem + ".profile.json"
+
+
+def source_signature(data_path):
+    paths = [data_path] if isinstance(data_path, str) else list(data_path)
+    return [[os.path.abspath(path), os.path.getsize(path), os.stat(path).st_mtime_ns] for path in paths]
+
+
+def save_profile(profile, data_path):
+    profile = dict(profile, source=source_signature(data_path))
+    with open(profile_path(data_path), "w") as f:
+        json.dump(profile, f)
+    return profile
+
+
+def load_profile(data_path):
+    """The saved profile of ``data_path``, or None when it is missing or out of date"""
+    path = profile_path(data_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        profile = json.load(f)
+    if profile.get("source") != source_signature(data_path):
+        return None
+    return profile
+
+
+def _merge_dtype(current, new):
+    if current is None or current == new:
+        return new
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(new):
+        return "float64"
+    return "object"
+
+
+class DatasetProfiler:
+    """Accumulates a profile from raw chunks in a single pass"""
+
+    def __init__(self):
+        self.rows = 0
+        self.dtypes = {}
+        self.nulls = None
+        self.block_nulls = []  # Null counts per fine block (Series per block)
+        self.block_rows = []
+        self.moments = {}      # col -> [count, mean, M2, min, max]
+        self.counts = {}       # col -> value counts of columns within TRACKED_VALUES
+        self.high_cardinality = set()
+        self.sample = None     # Bottom-k random keys give a uniform row sample
+        self.head = None
+        self._rng = np.random.default_rng(SEED)
+
+    def update(self, chunk):
+        if self.head is None:
+            self.head = chunk.head()
+        self.rows += len(chunk)
+        for col, dtype in chunk.dtypes.items():
+            self.dtypes[col] = _merge_dtype(self.dtypes.get(col), str(dtype))
+        self.nulls = chunk.isnull().sum() + (0 if self.nulls is None else self.nulls)
+
+        is_null = chunk.isnull()
+        for start in range(0, len(chunk), FINE_BLOCK_ROWS):
+            block = is_null.iloc[start:start + FINE_BLOCK_ROWS]
+            self.block_nulls.append(block.sum())
+            self.block_rows.append(len(block))
+
+        numeric = chunk.select_dtypes(include="number")
+        for col in numeric.columns:
+            self._update_moments(col, numeric[col].dropna().to_numpy(dtype=float))
+
+        for col in chunk.columns:
+            if col in self.high_cardinality:
+                continue
+            counts = chunk[col].value_counts().add(self.counts.get(col, pd.Series(dtype=float)), fill_value=0)
+            if len(counts) > TRACKED_VALUES:
+                # IDs, timestamps and descriptions: stop counting instead of re-counting every chunk
+                self.high_cardinality.add(col)
+                self.counts.pop(col, None)
+            else:
+                self.counts[col] = counts
+
+        keyed = numeric.assign(_key=self._rng.random(len(numeric)))
+        self.sample = keyed if self.sample is None else pd.concat([self.sample, keyed])
+        self.sample = self.sample.nsmallest(QUANTILE_SAMPLE_SIZE, "_key")
+
+    def _update_moments(self, col, values):
+        if len(values) == 0:
+            return
+        count, mean, m2, low, high = self.moments.get(col, [0, 0.0, 0.0, np.inf, -np.inf])
+        n = len(values)
+        chunk_mean = values.mean()
+        delta = chunk_mean - mean
+        total = count + n
+        # Chan et al. parallel update of the mean and the sum of squared deviations
+        self.moments[col] = [total, mean + delta * n / total,
+                             m2 + ((values - chunk_mean) ** 2).sum() + delta ** 2 * count * n / total,
+                             min(low, values.min()), max(high, values.max())]
+
+    def _describe(self, col):
+        if col not in self.moments or not pd.api.types.is_numeric_dtype(self.dtypes[col]):
+            return None
+        count, mean, m2, low, high = self.moments[col]
+        quartiles = self.sample[col].quantile([0.25, 0.5, 0.75]).tolist()
+        return {"count": int(count), "mean": float(mean),
+                "std": float(np.sqrt(m2 / (count - 1))) if count > 1 else float("nan"),
+                "min": float(low), "25%": quartiles[0], "50%": quartiles[1],
+                "75%": quartiles[2], "max": float(high)}
+
+    def result(self):
+        # Merge fine blocks into at most MAX_HEATMAP_BLOCKS groups of consecutive rows
+        groups = np.array_split(np.arange(len(self.block_rows)), min(MAX_HEATMAP_BLOCKS, len(self.block_rows)))
+        block_nulls = pd.DataFrame(self.block_nulls).reset_index(drop=True)
+        block_rows = np.array(self.block_rows)
+        missing_blocks = [
+            (block_nulls.iloc[group].sum() / block_rows[group].sum()).round(4).tolist()
+            for group in groups if len(group)
+        ]
+
+        columns = {}
+        for col in self.dtypes:
+            top = None if col in self.high_cardinality else self.counts[col].nlargest(TOP_K)
+            columns[col] = {
+                "dtype": self.dtypes[col],
+                "nulls": int(self.nulls[col]),
+                "null_pct": round(float(self.nulls[col]) / self.rows * 100, 2) if self.rows else 0.0,
+                "top": None if top is None else [[value.item() if hasattr(value, "item") else value, int(count)]
+                                                 for value, count in top.items()],
+                "describe": self._describe(col),
+            }
+        return {
+            "rows": self.rows,
+            "columns": columns,
+            "missing_blocks": {"columns": list(self.dtypes), "null_fraction": missing_blocks,
+                               "rows_per_block": [int(block_rows[group].sum()) for group in groups if len(group)]},
+            "head": json.loads(self.head.to_json(orient="split", index=False)),
+        }
+
+
+def summary_frame(profile):
+    """Dtype, null count and null percentage per column"""
+    return pd.DataFrame({col: {"dtype": info["dtype"], "nulls": info["nulls"], "null_pct": info["null_pct"]}
+                         for col, info in profile["columns"].items()}).T
+
+
+def describe_frame(profile):
+    """describe()-style table of the numeric columns"""
+    return pd.DataFrame({col: info["describe"] for col, info in profile["columns"].items()
+                         if info["describe"] is not None})
+
+
+def missing_blocks_frame(profile):
+    """Fraction of missing values per row block (rows) and column (columns)"""
+    blocks = profile["missing_blocks"]
+    return pd.DataFrame(blocks["null_fraction"], columns=blocks["columns"])
+
+
+def head_frame(profile):
+    head = profile["head"]
+    return pd.DataFrame(head["data"], columns=head["columns"])
@@ -0,0 +1,126 @@
+"""Attribute and spatial index over the preprocessed dataset's locations.
+
+The index is built once per dataset version (cache it with ``get_summary``)
+and answers Geospatial selections without scanning or copying the frame:
+
+- Row offsets sorted by (State, City, Severity). Every distinct
+  (State, City, Severity) is one contiguous run, listed in ``groups``. A
+  selection filters that small table and returns the offsets of the
+  matching runs, in time proportional to the result.
+- Row offsets sorted by spatial grid cell (see ``spatial_grid``). A
+  bounding box covers one contiguous cell range per grid row. The rows
+  in those ranges are then checked against the exact box.
+
+Offsets are positions in the frame returned by
+``get_preprocessed(columns=...)``, to be used with ``df.iloc`` or
+``DataFrame.take``. Rows without coordinates are not indexed.
+"""
+import numpy as np
+import pandas as pd
+
+from dataset_cache import get_preprocessed
+from dataset_io import PREPROCESSED_PATH
+from spatial_grid import N_CELLS, N_COLS, cell_ids
+
+KEY_COLUMNS = ["State", "City", "Severity"]
+INDEX_COLUMNS = ["Latitude", "Longitude"] + KEY_COLUMNS
+
+
+def _ranges(starts, stops):
+    """Concatenation of ``arange(start, stop)`` over all ranges, without a Python loop"""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    shift = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return shift + np.arange(total)
+
+
+class GeoIndex:
+    def __init__(self, df):
+        self.lat = df["Latitude"].to_numpy(dtype=float)
+        self.lng = df["Longitude"].to_numpy(dtype=float)
+        positions = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lng)))
+        offset_dtype = np.int32 if len(df) < 2 ** 31 else np.int64
+        # Unfiltered selections: every row, or the located rows when some lack coordinates
+        self.n_rows = len(df)
+        self.located = None if len(positions) == len(df) else positions.astype(offset_dtype)
+
+        # One integer key per row, ordered like (State, City, Severity)
+        key = np.zeros(len(positions), dtype=np.int64)
+        uniques = {}
+        for col in KEY_COLUMNS:
+            codes, uniques[col] = pd.factorize(df[col].to_numpy()[positions], sort=True)
+            key = key * (len(uniques[col]) + 1) + codes + 1  # missing values (-1) sort first
+        order = np.argsort(key, kind="stable")
+        self.order = positions[order].astype(offset_dtype)
+
+        key = key[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.empty(0, dtype=np.int64)
+        stops = np.r_[starts[1:], len(key)]
+        group_keys = key[starts]
+        groups = {}
+        for col in reversed(KEY_COLUMNS):
+            size = len(uniques[col]) + 1
+            codes = group_keys % size - 1
+            group_keys = group_keys // size
+            groups[col] = pd.Series(uniques[col]).reindex(codes).to_numpy()
+        self.groups = pd.DataFrame({col: groups[col] for col in KEY_COLUMNS}).assign(start=starts, stop=stops)
+
+        cells = cell_ids(self.lat[positions], self.lng[positions])
+        cell_order = np.argsort(cells, kind="stable")
+        self.cell_order = positions[cell_order].astype(offset_dtype)
+        self.sorted_cells = cells[cell_order].astype(np.int32 if N_CELLS < 2 ** 31 else np.int64)
+
+    @property
+    def nbytes(self):
+        located = 0 if self.located is None else self.located.nbytes
+        return self.order.nbytes + self.cell_order.nbytes + self.sorted_cells.nbytes + located
+
+    def values(self, column, **filters):
+        """Sorted distinct values of ``column`` among the rows matching ``filters``"""
+        groups = self._groups(**filters)
+        return sorted(groups[column].dropna().unique())
+
+    def _groups(self, state=None, city=None, severity=None):
+        mask = np.ones(len(self.groups), dtype=bool)
+        for col, value in zip(KEY_COLUMNS, (state, city, severity)):
+            if value is not None:
+                mask &= (self.groups[col] == value).to_numpy()
+        return self.groups[mask]
+
+    def rows(self, state=None, city=None, severity=None, bbox=None):
+        """Offsets of the rows matching every given filter.
+
+        ``bbox`` is ``(lat_min, lat_max, lng_min, lng_max)``. Without attribute filters
+        it is answered from the cell order; otherwise the matching rows are checked against it.
+        """
+        if state is None and city is None and severity is None:
+            if bbox is None:
+                return np.arange(self.n_rows) if self.located is None else self.located.astype(np.int64)
+            return self._in_bbox(bbox)
+        groups = self._groups(state, city, severity)
+        rows = self.order[_ranges(groups["start"].to_numpy(), groups["stop"].to_numpy())]
+        if bbox is not None:
+            rows = rows[self._inside(rows, bbox)]
+        return rows.astype(np.int64)
+
+    def _in_bbox(self, bbox):
+        lat_min, lat_max, lng_min, lng_max = bbox
+        corners = cell_ids([lat_min, lat_max], [lng_min, lng_max])
+        (row_min, row_max), (col_min, col_max) = corners // N_COLS, corners % N_COLS
+        grid_rows = np.arange(row_min, row_max + 1, dtype=np.int64) * N_COLS
+        starts = np.searchsorted(self.sorted_cells, grid_rows + col_min, side="left")
+        stops = np.searchsorted(self.sorted_cells, grid_rows + col_max, side="right")
+        rows = self.cell_order[_ranges(starts, stops)]
+        return rows[self._inside(rows, bbox)].astype(np.int64)
+
+    def _inside(self, rows, bbox):
+        lat_min, lat_max, lng_min, lng_max = bbox
+        lat, lng = self.lat[rows], self.lng[rows]
+        return (lat >= lat_min) & (lat <= lat_max) & (lng >= lng_min) & (lng <= lng_max)
+
+
+def load_geo_index(path=PREPROCESSED_PATH):
+    """``GeoIndex`` of the dataset at ``path``"""
+    return GeoIndex(get_preprocessed(path, columns=INDEX_COLUMNS))
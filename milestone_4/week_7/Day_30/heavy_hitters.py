@@ -0,0 +1,161 @@
+"""Top-k value counts in one streaming pass with bounded memory.
+
+``SpaceSaving`` keeps at most ``capacity`` values per column with an
+upper bound on each count and the largest possible overcount:
+- While a column has no more distinct values than the capacity, every
+  count is exact. This covers State, Severity, Hour and Weather_Condition.
+- High-cardinality columns such as City keep the heaviest values. A value
+  whose count exceeds the smallest tracked count is guaranteed to be kept.
+
+Each chunk is counted exactly with ``value_counts`` and then merged into
+the sketch (the mergeable Space-Saving summary), so the result does not
+depend on the chunk size.
+
+``load_top_values`` saves the counts of a file next to it (``*.topk.json``).
+The artifact is keyed to the file's size and mtime, so pages read the
+rankings instead of loading the dataset.
+"""
+import json
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dataset_io import PREPROCESSED_PATH
+from dataset_profile import source_signature
+
+CAPACITY = 10_000       # Values tracked per column
+STORED_VALUES = 100     # Heaviest values per column kept in the artifact
+CHUNK_ROWS = 500_000
+
+
+class SpaceSaving:
+    """Space-Saving summary of one column.
+
+    Chunked updates match ``value_counts`` while the column has at most
+    ``capacity`` distinct values, and a chunk never adds to the values it
+    does not contain:
+
+    >>> sketch = SpaceSaving(capacity=3)
+    >>> for chunk in (["a", "b", "a"], ["c", "b", "c"], ["a"]):
+    ...     _ = sketch.update(pd.Series(chunk))
+    >>> sketch.counts.sort_index().to_dict()
+    {'a': 3, 'b': 2, 'c': 2}
+    >>> sketch = SpaceSaving(capacity=2)
+    >>> for chunk in (["a"] * 5, ["b", "c", "c"]):
+    ...     _ = sketch.update(pd.Series(chunk))
+    >>> sketch.counts.to_dict(), sketch.errors.to_dict()
+    ({'a': 5, 'c': 2}, {'a': 0, 'c': 0})
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")   # Upper bound of each tracked value's count
+        self.errors = pd.Series(dtype="int64")   # How much of that count may be overcounted
+        self.complete = True                     # No value has been evicted: untracked values never occurred
+
+    @property
+    def exact(self):
+        return bool(not len(self.errors) or self.errors.max() == 0)
+
+    def _floor(self):
+        """Largest count an untracked value can have: the smallest tracked count once values were evicted"""
+        return 0 if self.complete else int(self.counts.min())
+
+    def update(self, values):
+        """Add the non-missing values of a Series"""
+        counts = pd.Series(values).value_counts()
+        counts = counts[counts > 0]  # Unused categories of categorical columns
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(object)
+        chunk = SpaceSaving(max(self.capacity, len(counts)))
+        chunk.counts = counts.astype("int64")
+        chunk.errors = pd.Series(0, index=counts.index, dtype="int64")
+        return self.merge(chunk)
+
+    def merge(self, other):
+        union = self.counts.index.union(other.counts.index)
+        floor, other_floor = self._floor(), other._floor()
+        counts = (self.counts.reindex(union, fill_value=floor)
+                  + other.counts.reindex(union, fill_value=other_floor))
+        errors = (self.errors.reindex(union, fill_value=floor)
+                  + other.errors.reindex(union, fill_value=other_floor))
+        kept = counts.sort_values(ascending=False, kind="stable").index[:self.capacity]
+        self.complete = self.complete and other.complete and len(union) <= self.capacity
+        self.counts, self.errors = counts[kept], errors[kept]
+        return self
+
+    def top(self, k):
+        """The ``k`` largest counts, ties broken by value"""
+        values = self.counts.index
+        if values.inferred_type.startswith("mixed"):
+            values = values.astype(str)
+        ranked = pd.DataFrame({"count": self.counts.to_numpy(), "value": values.to_numpy()})
+        order = ranked.sort_values(["count", "value"], ascending=[False, True], kind="stable").index[:k]
+        return self.counts.iloc[order]
+
+
+def top_values_path(data_path):
+    return os.path.splitext(data_path)[0] + ".topk.json"
+
+
+def _chunks(path, columns):
+    if path.endswith(".parquet"):
+        available = pq.read_schema(path).names
+        for batch in pq.ParquetFile(path).iter_batches(
+                batch_size=CHUNK_ROWS, columns=[col for col in columns if col in available]):
+            yield batch.to_pandas()
+    else:
+        available = pd.read_csv(path, nrows=0).columns
+        yield from pd.read_csv(path, usecols=[col for col in columns if col in available], chunksize=CHUNK_ROWS)
+
+
+def _plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def count_top_values(path, columns, capacity=CAPACITY):
+    """Rows and heaviest values (value, count, error) of each of ``columns`` present in ``path``"""
+    rows = 0
+    sketches = {}
+    for chunk in _chunks(path, columns):
+        rows += len(chunk)
+        for col in chunk.columns:
+            sketches.setdefault(col, SpaceSaving(capacity)).update(chunk[col])
+    return {"rows": rows, "capacity": capacity, "columns": {
+        col: {"exact": sketch.exact,
+              "values": [[_plain(value), int(count), int(sketch.errors[value])]
+                         for value, count in sketch.top(STORED_VALUES).items()]}
+        for col, sketch in sketches.items()}}
+
+
+def load_top_values(path=PREPROCESSED_PATH, columns=("State", "City", "Weather_Condition")):
+    """Top values of ``path``: the saved ones while current and covering ``columns``, else recounted and saved"""
+    artifact = top_values_path(path)
+    saved = None
+    if os.path.exists(artifact):
+        with open(artifact) as f:
+            saved = json.load(f)
+        if saved.get("source") != source_signature(path):
+            saved = None
+    if saved is not None and set(columns) <= set(saved["requested"]):
+        return saved
+
+    requested = sorted(set(columns) | set(saved["requested"] if saved else []))
+    top_values = dict(count_top_values(path, requested), requested=requested, source=source_signature(path))
+    with open(artifact + ".tmp", "w") as f:
+        json.dump(top_values, f)
+    os.replace(artifact + ".tmp", artifact)
+    return top_values
+
+
+def top_k(top_values, column, k=5):
+    """The ``k`` most frequent values of ``column`` and their counts, like ``value_counts().nlargest(k)``"""
+    values = top_values["columns"][column]["values"][:k]
+    return pd.Series([count for _, count, _ in values], name="count",
+                     index=pd.Index([value for value, _, _ in values], name=column))
+
+
+def value_count(top_values, column, value):
+    """Count of one value of ``column`` (0 when it is not among the stored values)"""
+    return next((count for tracked, count, _ in top_values["columns"][column]["values"] if tracked == value), 0)
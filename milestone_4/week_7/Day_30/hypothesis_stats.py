@@ -0,0 +1,61 @@
+"""Hypothesis tests on the full dataset from sufficient statistics.
+
+Severity takes only a few integer values, so a (group, Severity) count
+table holds everything a test on severity needs: group sizes, means,
+variances and contingency counts. ``severity_crosstabs`` builds those
+tables for several groupings in one streaming pass over all rows. The
+tests below then run on the tables in constant time, and they give the
+same results as ``ttest_ind`` / ``chi2_contingency`` on the raw rows.
+Pearson correlations come from the saved correlation sums (see
+``correlation_stats``).
+"""
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy.stats import ttest_ind_from_stats
+
+from dataset_io import PREPROCESSED_PATH, load_preprocessed
+
+BATCH_ROWS = 1_000_000
+
+
+def severity_crosstabs(groupers, path=PREPROCESSED_PATH):
+    """Counts per (group, Severity) for every grouping, from one pass over the dataset.
+
+    ``groupers`` maps a table name to ``(column, labeller)``. ``labeller``
+    turns the column's values into group labels (None keeps the values).
+    Rows whose label is missing are left out, like ``pd.crosstab``.
+    """
+    columns = sorted({column for column, _ in groupers.values()} | {"Severity"})
+    counts = {name: None for name in groupers}
+    for batch in _batches(path, columns):
+        for name, (column, labeller) in groupers.items():
+            labels = batch[column] if labeller is None else labeller(batch[column])
+            chunk_counts = batch.groupby([labels.rename("group"), batch["Severity"]], observed=True).size()
+            counts[name] = chunk_counts if counts[name] is None else counts[name].add(chunk_counts, fill_value=0)
+    return {name: table.unstack(fill_value=0).astype(np.int64).rename_axis(groupers[name][0])
+            for name, table in counts.items()}
+
+
+def _batches(path, columns):
+    if path.endswith(".csv"):
+        yield load_preprocessed(path, columns=columns)
+        return
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=columns):
+        yield batch.to_pandas()
+
+
+def severity_moments(table):
+    """Count, mean and sample standard deviation of Severity per row of a count table"""
+    levels = table.columns.to_numpy(dtype=float)
+    n = table.sum(axis=1)
+    mean = (table * levels).sum(axis=1) / n
+    variance = ((table * levels ** 2).sum(axis=1) - n * mean ** 2) / (n - 1)
+    return pd.DataFrame({"count": n, "mean": mean, "std": np.sqrt(variance.clip(lower=0))})
+
+
+def ttest_from_counts(table, group_a, group_b):
+    """Pooled two-sample t-test of Severity between two rows of a count table; returns (t, p)"""
+    moments = severity_moments(table)
+    a, b = moments.loc[group_a], moments.loc[group_b]
+    return ttest_ind_from_stats(a["mean"], a["std"], a["count"], b["mean"], b["std"], b["count"])
@@ -0,0 +1,830 @@
+"""Headless 16-step preprocessing pipeline for the US Accidents dataset.
+
+The steps are declared once in ``STEPS`` and can be run from the Streamlit
+Preprocessing page, from a scheduler or from the command line::
+
+    python preprocessing_pipeline.py --input data/US_Accidents_March23.csv \
+        --output data/US_Accidents_preprocessed.parquet [--chunksize 500000]
+
+Every full run saves its fitted state (dropped columns, low-missing columns,
+fill values, the Wind_Chill regression and the hashes of every ID seen)
+next to the output. A monthly extract can then be appended without a
+rebuild::
+
+    python preprocessing_pipeline.py --append data/US_Accidents_2023_04.csv
+
+The correlation sums of the numeric columns (``*.corr.npz``), the
+spatial grid with its hotspots (``*.grid.npz``) and the count cubes
+(``*.cube.npz``) are saved next to the output as well and updated in
+place by appends.
+
+Add ``--refit`` to refresh the statistics instead; that rebuilds the output
+from ``--input`` plus the new extract.
+
+``--profile`` only builds the dataset profile (one streaming pass) that
+the Data Exploration page shows; pipeline runs reuse it for steps 3 and 8
+while the input is unchanged.
+
+In-memory runs can checkpoint each step's output with ``--cache-dir``; a
+rerun resumes after the last step whose input hash, code and configuration
+are unchanged.
+
+Runs report progress to an optional ``PipelineObserver``. This module never
+imports Streamlit, and anything costly to report (such as full-frame missing
+value counts) is left to the observer.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from checkpoint_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, CheckpointCache
+from correlation_stats import CorrelationAccumulator, correlation_path, saved_correlations
+from count_cube import CubeAccumulator, cube_path, saved_cubes
+from dataset_io import (PREPROCESSED_PATH, RAW_DATA_PATH, PreprocessedWriter, save_preprocessed,
+                        to_storage_dtypes)
+from dataset_profile import DatasetProfiler, load_profile, save_profile
+from quantile_sketch import QuantileSketch
+from regression_imputer import RegressionImputer
+from spatial_grid import GridAccumulator, grid_path, saved_grid
+from timestamp_parsing import calendar_fields, parse_timestamps
+from weather_taxonomy import WeatherTable, saved_weather_table, weather_groups, weather_table_path
+
+logger = logging.getLogger(__name__)
+
+# Modules in this directory; step fingerprints follow the helpers they define
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pipeline configuration shared by the in-memory and chunked modes
+HIGH_MISSING_THRESHOLD = 30   # Step 3: drop columns with more than 30% missing
+LOW_MISSING_THRESHOLD = 3     # Step 8: drop rows missing a column with <=3% missing
+DEFAULT_CHUNKSIZE = 500_000
+
+NON_ANALYTICAL_COLS = ["ID", "Source", "Description", "Street", "Country",
+                       "Zipcode", "Timezone", "Airport_Code", "Amenity"]
+GEO_RENAME = {'Start_Lat': 'Latitude', 'Start_Lng': 'Longitude'}
+SEVERITY_LEVELS = [1, 2, 3, 4]
+WIND_CHILL_FEATURES = ['Wind_Speed(mph)', 'Temperature(F)', 'Humidity(%)']
+# Step 9: weather columns filled with a constant (median wind speed, zero precipitation)
+WEATHER_FILL_COLS = ['Wind_Speed(mph)', 'Precipitation(in)']
+# Step 9: weather columns imputed by linear regression on other weather columns
+REGRESSION_IMPUTATIONS = {'Wind_Chill(F)': WIND_CHILL_FEATURES}
+# Step 14: long-tailed columns clipped to their 1.5 x IQR (Tukey) fences
+CLIP_COLS = ['Duration_Minutes']
+BOOL_COLS = ["Roundabout", "Station", "Stop", "Traffic_Calming",
+             "Traffic_Signal", "Turning_Loop"]
+REDUNDANT_COLS = ["Start_Time", "End_Time", "Weather_Timestamp",
+                  "Civil_Twilight", "Nautical_Twilight",
+                  "Astronomical_Twilight", "Sunrise_Sunset"]
+
+
+# =====================================================================
+# STEP HELPERS
+# =====================================================================
+
+def parse_temporal(df, workers=1):
+    """Step 5: parse timestamps, derive the step-11 calendar fields and drop unparseable rows"""
+    df["Start_Time"] = parse_timestamps(df["Start_Time"], workers)
+    df["End_Time"] = parse_timestamps(df["End_Time"], workers)
+    for col, values in calendar_fields(df["Start_Time"], df["End_Time"]).items():
+        df[col] = values
+    return df.dropna(subset=["Start_Time", "End_Time"])
+
+
+def validate_geographic(df):
+    """Step 6: coerce coordinates to numbers, drop invalid rows and rename"""
+    df['Start_Lat'] = pd.to_numeric(df['Start_Lat'], errors='coerce')
+    df['Start_Lng'] = pd.to_numeric(df['Start_Lng'], errors='coerce')
+    df = df.dropna(subset=["Start_Lat", "Start_Lng"])
+    df.rename(columns=GEO_RENAME, inplace=True)
+    return df
+
+
+def filter_severity(df):
+    """Step 7: keep only the documented severity levels"""
+    return df[df["Severity"].isin(SEVERITY_LEVELS)]
+
+
+def add_temporal_features(df):
+    """Step 11: add the weekend flag (duration and calendar fields come from step 5)"""
+    if "Duration_Minutes" not in df.columns:
+        for col, values in calendar_fields(df["Start_Time"], df["End_Time"]).items():
+            df[col] = values
+    df["IsWeekend"] = df["DayOfWeek"].isin([5, 6]).astype("int8")
+    return df
+
+
+def encode_categoricals(df):
+    """Step 12: encode boolean road features and day/night as integers, and group weather conditions"""
+    encoded_count = 0
+    for col in BOOL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("int8")
+            encoded_count += 1
+
+    if "Sunrise_Sunset" in df.columns:
+        df["IsDay"] = (df["Sunrise_Sunset"] == "Day").astype("int8")
+        encoded_count += 1
+
+    if "Weather_Condition" in df.columns:
+        df["Weather_Group"] = weather_groups(df["Weather_Condition"])
+        encoded_count += 1
+    return df, encoded_count
+
+
+def drop_seen_ids(df, seen_ids):
+    """Step 2 for one chunk: drop IDs repeated in the chunk or seen in earlier chunks.
+
+    IDs are tracked as sorted 64-bit hashes instead of Python strings.
+    """
+    df = df.drop_duplicates(subset="ID")
+    hashes = hash_ids(df["ID"])
+    is_new = ~np.isin(hashes, seen_ids, assume_unique=True)
+    return df[is_new].copy(), np.union1d(seen_ids, hashes[is_new])
+
+
+def hash_ids(ids):
+    """64-bit hashes of accident IDs, as tracked by ``drop_seen_ids``"""
+    return pd.util.hash_pandas_object(ids, index=False).to_numpy()
+
+
+def validate_rows(df):
+    """Steps 5-7: the row filters that run before the step-8 missingness check"""
+    df = parse_temporal(df)
+    df = validate_geographic(df)
+    return filter_severity(df)
+
+
+def read_raw(data_path, chunksize=None, **kwargs):
+    """Read one raw CSV or a list of them; returns an iterator of chunks when ``chunksize`` is set"""
+    paths = [data_path] if isinstance(data_path, str) else list(data_path)
+    if chunksize is not None:
+        return (chunk for path in paths for chunk in pd.read_csv(path, chunksize=chunksize, **kwargs))
+    if len(paths) == 1:
+        return pd.read_csv(paths[0], **kwargs)
+    return pd.concat([pd.read_csv(path, **kwargs) for path in paths], ignore_index=True)
+
+
+# =====================================================================
+# STEP REGISTRY
+# =====================================================================
+# Every step has the signature ``func(df, ctx) -> (df, message)``. ``ctx``
+# carries the run configuration and the fitted statistics in ``ctx["stats"]``.
+# A step that needs whole-dataset statistics (3, 8, 9 and 10) fits them from
+# the frame it receives unless they are already present, so the same steps
+# run unchanged on a full frame or on chunks with precomputed statistics.
+
+@dataclass(frozen=True)
+class PipelineStep:
+    number: int
+    operation: str
+    purpose: str
+    func: Callable
+
+
+def load_data(df, ctx):
+    df = read_raw(ctx["data_path"])
+    ctx["initial_shape"] = df.shape
+    return df, "Data loaded successfully"
+
+
+def remove_duplicates(df, ctx):
+    if "seen_ids" in ctx:
+        df, ctx["seen_ids"] = drop_seen_ids(df, ctx["seen_ids"])
+    else:
+        df = df.drop_duplicates(subset="ID")
+        ctx["seen_ids"] = np.sort(hash_ids(df["ID"]))
+    return df, "Duplicates removed"
+
+
+def drop_high_missingness(df, ctx):
+    stats = ctx["stats"]
+    if "remove_cols" not in stats:
+        missing_percent = round((df.isnull().sum() / df.shape[0]) * 100, 2)
+        stats["remove_cols"] = missing_percent[missing_percent > HIGH_MISSING_THRESHOLD].index.tolist()
+    df.drop(columns=[col for col in stats["remove_cols"] if col in df.columns], inplace=True)
+    return df, f"Dropped {len(stats['remove_cols'])} high-missingness columns"
+
+
+def drop_non_analytical(df, ctx):
+    drop_cols_existing = [col for col in NON_ANALYTICAL_COLS if col in df.columns]
+    df = df.drop(columns=drop_cols_existing)
+    return df, f"Dropped {len(drop_cols_existing)} non-analytical columns"
+
+
+def parse_temporal_step(df, ctx):
+    rows_before = len(df)
+    df = parse_temporal(df, ctx.get("parse_workers", 1))
+    return df, f"Temporal data validated ({rows_before - len(df)} invalid rows removed)"
+
+
+def validate_geographic_step(df, ctx):
+    rows_before = len(df)
+    df = validate_geographic(df)
+    return df, f"Geographic data validated ({rows_before - len(df)} invalid rows removed)"
+
+
+def filter_severity_step(df, ctx):
+    rows_before = len(df)
+    df = filter_severity(df)
+    return df, f"Severity classes filtered ({rows_before - len(df)} outliers removed)"
+
+
+def drop_low_missingness_rows(df, ctx):
+    stats = ctx["stats"]
+    if "low_missing_cols" not in stats:
+        missing_percent = (df.isnull().sum() / df.shape[0]) * 100
+        stats["low_missing_cols"] = missing_percent[
+            (missing_percent > 0) & (missing_percent <= LOW_MISSING_THRESHOLD)].index.tolist()
+    rows_before = len(df)
+    if stats["low_missing_cols"]:
+        df = df.dropna(subset=stats["low_missing_cols"])
+    return df, f"Low-missingness rows dropped ({rows_before - len(df)} rows removed)"
+
+
+def impute_weather(df, ctx):
+    stats = ctx["stats"]
+    if "weather_fill" not in stats:
+        stats["weather_fill"] = {}
+        if 'Wind_Speed(mph)' in df.columns and df['Wind_Speed(mph)'].isnull().any():
+            stats["weather_fill"]['Wind_Speed(mph)'] = QuantileSketch().update(df['Wind_Speed(mph)']).median()
+        if 'Precipitation(in)' in df.columns and df['Precipitation(in)'].isnull().any():
+            stats["weather_fill"]['Precipitation(in)'] = 0.0
+
+    imputation_count = 0
+    for col, value in stats["weather_fill"].items():
+        imputation_count += int(df[col].isnull().sum())
+        df[col] = df[col].fillna(value)
+
+    if "regression_models" not in stats:
+        stats["regression_models"] = {}
+        for target, features in REGRESSION_IMPUTATIONS.items():
+            if (target in df.columns and df[target].isnull().any()
+                    and all(col in df.columns for col in features)):
+                # Rows missing a feature get the observed median, as in the chunked mode
+                imputer = RegressionImputer(target, features, fallback=float(df[target].median()))
+                imputer.partial_fit(df).solve()
+                if imputer.coef_ is not None:
+                    stats["regression_models"][target] = imputer.to_dict()
+
+    for target, model in stats["regression_models"].items():
+        imputation_count += RegressionImputer.from_dict(target, model).transform(df)
+    return df, f"Weather imputation complete ({imputation_count:,} values imputed)"
+
+
+def impute_numeric(df, ctx):
+    stats = ctx["stats"]
+    if "medians" not in stats:
+        num_cols = df.select_dtypes(include="number").columns.tolist()
+        stats["medians"] = {col: QuantileSketch().update(df[col]).median()
+                            for col in num_cols if df[col].isnull().any()}
+    imputed_cols = []
+    for col, median in stats["medians"].items():
+        if col in df.columns and df[col].isnull().any():
+            df[col] = df[col].fillna(median)
+            imputed_cols.append(col)
+    return df, f"General imputation complete ({len(imputed_cols)} columns)"
+
+
+def add_temporal_features_step(df, ctx):
+    return add_temporal_features(df), "Temporal features created (6 new features)"
+
+
+def encode_categoricals_step(df, ctx):
+    df, encoded_count = encode_categoricals(df)
+    return df, f"Categorical encoding complete ({encoded_count} features)"
+
+
+def drop_redundant(df, ctx):
+    redundant_cols_existing = [col for col in REDUNDANT_COLS if col in df.columns]
+    df = df.drop(columns=redundant_cols_existing)
+    return df, f"Redundant features removed ({len(redundant_cols_existing)} columns)"
+
+
+def clip_outliers(df, ctx):
+    stats = ctx["stats"]
+    if "clip_bounds" not in stats:
+        stats["clip_bounds"] = {col: list(QuantileSketch().update(df[col]).iqr_bounds())
+                                for col in CLIP_COLS if col in df.columns}
+    clipped = 0
+    for col, (lower, upper) in stats["clip_bounds"].items():
+        if col in df.columns:
+            clipped += int(((df[col] < lower) | (df[col] > upper)).sum())
+            df[col] = df[col].clip(lower, upper)
+    return df, f"Outliers clipped ({clipped:,} values outside the IQR fences)"
+
+
+def final_cleanup(df, ctx):
+    rows_before = len(df)
+    df = to_storage_dtypes(df.dropna())
+    return df, f"Final cleanup complete ({rows_before - len(df)} rows removed, dtype plan applied)"
+
+
+def save_data(df, ctx):
+    df = save_preprocessed(df, ctx["output_path"], ctx["export_csv"])
+    save_summaries({name: acc.update(df) for name, acc in new_summaries().items()}, ctx["output_path"])
+    return df, f"Data saved to {ctx['output_path']}"
+
+
+STEPS = [
+    PipelineStep(1, "Load Data", "Import the raw accident dataset", load_data),
+    PipelineStep(2, "Remove Duplicates", "Eliminate duplicate records by ID", remove_duplicates),
+    PipelineStep(3, "Drop High Missingness", "Remove columns with >30% missing values", drop_high_missingness),
+    PipelineStep(4, "Drop Non-Analytical", "Remove IDs and text fields", drop_non_analytical),
+    PipelineStep(5, "Parse Temporal Data", "Validate and convert timestamps", parse_temporal_step),
+    PipelineStep(6, "Validate Geographic", "Clean and validate coordinates", validate_geographic_step),
+    PipelineStep(7, "Filter Severity", "Keep only severity levels 1-4", filter_severity_step),
+    PipelineStep(8, "Drop Low-Missing Rows", "Remove rows with <3% missing", drop_low_missingness_rows),
+    PipelineStep(9, "Weather Imputation", "Domain-specific imputation strategies", impute_weather),
+    PipelineStep(10, "Numeric Imputation", "Fill remaining missing values", impute_numeric),
+    PipelineStep(11, "Temporal Features", "Create time-based features", add_temporal_features_step),
+    PipelineStep(12, "Categorical Encoding", "Encode boolean features and weather groups", encode_categoricals_step),
+    PipelineStep(13, "Drop Redundant", "Remove columns no longer needed", drop_redundant),
+    PipelineStep(14, "Clip Outliers", "Clip Duration_Minutes to the 1.5×IQR fences", clip_outliers),
+    PipelineStep(15, "Final Cleanup", "Remove remaining NaN values and downcast dtypes", final_cleanup),
+    PipelineStep(16, "Save Data", "Export typed Parquet dataset (optional CSV)", save_data),
+]
+
+# Steps 2-15 transform a frame without touching the filesystem
+TRANSFORM_STEPS = STEPS[1:-1]
+
+
+# =====================================================================
+# OBSERVERS
+# =====================================================================
+
+class PipelineObserver:
+    """Receives pipeline events; the base class ignores them all"""
+
+    def step_started(self, step):
+        pass
+
+    def step_finished(self, step, message, df):
+        pass
+
+    def pass_finished(self, pass_num, message, stats):
+        pass
+
+    def chunk_finished(self, chunk_num, rows_read, rows_written, df):
+        pass
+
+
+class LoggingObserver(PipelineObserver):
+    """Logs one line per event, using only the cheap frame shape"""
+
+    def step_finished(self, step, message, df):
+        logger.info("Step %d/%d: %s -> Shape: %s", step.number, len(STEPS), message, df.shape)
+
+    def pass_finished(self, pass_num, message, stats):
+        logger.info("Pass %d/3: %s", pass_num, message)
+
+    def chunk_finished(self, chunk_num, rows_read, rows_written, df):
+        logger.info("Chunk %d: %s rows read, %s rows written", chunk_num,
+                    f"{rows_read:,}", f"{rows_written:,}")
+
+
+# =====================================================================
+# RUNNERS
+# =====================================================================
+
+def run_pipeline(data_path=RAW_DATA_PATH, output_path=PREPROCESSED_PATH, export_csv=False,
+                 observer=None, cache=None, checkpoint_steps=None, parse_workers=1):
+    """Run all 16 steps on the full dataset in memory; returns (df, ctx).
+
+    With a ``CheckpointCache`` the run resumes after the last checkpointed
+    step that is still valid, and checkpoints ``checkpoint_steps`` (default:
+    steps 1-15) as it goes. A current dataset profile (see
+    ``profile_raw_data``) supplies the step 3 and 8 column decisions.
+    ``parse_workers > 1`` shards step-5 timestamp
+    parsing across a process pool.
+    """
+    observer = observer or PipelineObserver()
+    ctx = {"data_path": data_path, "output_path": output_path, "export_csv": export_csv,
+           "parse_workers": parse_workers, "stats": {}}
+    profile = load_profile(data_path)
+    if profile is not None and "pipeline" in profile:
+        # Steps 3 and 8 take their column decisions from the profile instead of rescanning
+        stats = missingness_stats(profile)
+        ctx["stats"].update(remove_cols=stats["remove_cols"], low_missing_cols=stats["low_missing_cols"])
+    df = None
+    start = 0
+    if cache is not None:
+        keys = checkpoint_keys(data_path, cache)
+        checkpoint_steps = set(checkpoint_steps or [step.number for step in TRANSFORM_STEPS] + [1])
+        for i in range(len(STEPS) - 2, -1, -1):
+            payload = cache.load(keys[i])
+            if payload is not None:
+                df = payload["df"]
+                ctx.update(payload["state"])
+                start = i + 1
+                observer.step_finished(STEPS[i], f"Restored steps 1-{i + 1} from checkpoint", df)
+                break
+
+    for i, step in enumerate(STEPS[start:], start=start):
+        observer.step_started(step)
+        df, message = step.func(df, ctx)
+        if cache is not None and step.number in checkpoint_steps and step is not STEPS[-1]:
+            state = {key: value for key, value in ctx.items()
+                     if key not in ("data_path", "output_path", "export_csv", "parse_workers")}
+            cache.save(keys[i], {"df": df, "state": state})
+        observer.step_finished(step, message, df)
+    save_pipeline_state(ctx)
+    return df, ctx
+
+
+def _project_code(value):
+    """Whether ``value`` is a function or class defined in a module of this directory"""
+    if not (inspect.isfunction(value) or inspect.isclass(value)):
+        return False
+    module_file = getattr(sys.modules.get(value.__module__), "__file__", None)
+    return module_file is not None and os.path.dirname(os.path.abspath(module_file)) == PROJECT_DIR
+
+
+def _functions(obj):
+    """The function itself, or every method and property of a class"""
+    if inspect.isfunction(obj):
+        return [obj]
+    members = []
+    for member in vars(obj).values():
+        member = member.fget if isinstance(member, property) else getattr(member, "__func__", member)
+        if inspect.isfunction(member):
+            members.append(member)
+    return members
+
+
+def step_fingerprint(step):
+    """Source of a step and of the project functions and classes it uses, plus the constants they read.
+
+    Helpers are followed into the other modules of this directory (e.g.
+    ``save_preprocessed`` in ``dataset_io``), each name resolved in the
+    module that uses it. Changing a threshold, a column list
+    or the code of a step (or of anything it calls) changes the fingerprint
+    and so every later checkpoint key.
+    """
+    parts, seen, pending = [], set(), [step.func]
+    while pending:
+        obj = pending.pop()
+        if (obj.__module__, obj.__qualname__) in seen:
+            continue
+        seen.add((obj.__module__, obj.__qualname__))
+        parts.append(inspect.getsource(obj))
+        for func in _functions(obj):
+            codes = [func.__code__]
+            while codes:
+                code = codes.pop()
+                codes.extend(const for const in code.co_consts if inspect.iscode(const))
+                for name in code.co_names:
+                    value = func.__globals__.get(name)
+                    if _project_code(value):
+                        pending.append(value)
+                    elif name.isupper() and isinstance(value, (int, float, str, list, tuple, dict)):
+                        parts.append(constant_fingerprint(name, value))
+    return "\n".join(sorted(set(parts)))
+
+
+def _qualified_name(value):
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{value.__module__}.{value.__qualname__}"
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def constant_fingerprint(name, value):
+    """``name=<JSON of value>``; functions and classes inside it count by qualified name.
+
+    Values that still cannot be serialized only contribute their type, so
+    an unusual constant never stops a run from computing its checkpoint keys.
+    """
+    try:
+        return f"{name}={json.dumps(value, sort_keys=True, default=_qualified_name)}"
+    except (TypeError, ValueError):
+        return f"{name}=<{type(value).__name__}>"
+
+
+def checkpoint_keys(data_path, cache):
+    """One cache key per step, chained from the input content hash through each step fingerprint"""
+    paths = [data_path] if isinstance(data_path, str) else list(data_path)
+    key = "|".join(cache.file_hash(path) for path in paths)
+    keys = []
+    for step in STEPS:
+        key = hashlib.sha256(f"{key}|{step.number}|{step_fingerprint(step)}".encode()).hexdigest()
+        keys.append(key)
+    return keys
+
+
+# Column-level decisions (steps 3, 8, 9 and 10) need whole-dataset
+# statistics, so the chunked mode makes two light statistics passes before
+# the transform pass:
+#   pass 1 - null counts after step 2 (step 3) and after step 7 (step 8),
+#            saved with the raw data profile and skipped while it is current
+#   pass 2 - medians, clipping fences (quantile sketches) and the regression
+#            imputers on post-step-8 rows, reading only the columns they need
+#   pass 3 - steps 2-15 per chunk, appended as a Parquet row group (step 16)
+# Peak memory is bounded by the chunk size plus 8 bytes per unique ID.
+
+def profile_raw_data(data_path, chunksize=DEFAULT_CHUNKSIZE):
+    """First pass: profile the raw data and count nulls after step 2 (step 3) and step 7 (step 8).
+
+    The result is saved as the dataset profile that the Data Exploration
+    page renders and that later runs reuse instead of rescanning.
+    """
+    profiler = DatasetProfiler()
+    seen_ids = np.empty(0, dtype=np.uint64)
+    unique_rows = valid_rows = 0
+    unique_nulls = valid_nulls = 0
+    numeric_cols = None
+
+    for chunk in read_raw(data_path, chunksize):
+        profiler.update(chunk)
+        chunk, seen_ids = drop_seen_ids(chunk, seen_ids)
+        unique_rows += len(chunk)
+        unique_nulls = chunk.isnull().sum() + unique_nulls
+
+        chunk = validate_rows(chunk)
+        valid_rows += len(chunk)
+        valid_nulls = chunk.isnull().sum() + valid_nulls
+        chunk_numeric = set(chunk.select_dtypes(include="number").columns)
+        numeric_cols = chunk_numeric if numeric_cols is None else numeric_cols & chunk_numeric
+
+    profile = profiler.result()
+    profile["pipeline"] = {
+        "unique_rows": unique_rows,
+        "unique_nulls": {col: int(n) for col, n in unique_nulls.items()},
+        "valid_rows": valid_rows,
+        "valid_nulls": {col: int(n) for col, n in valid_nulls.items()},
+        "numeric_cols": sorted(numeric_cols),
+    }
+    return save_profile(profile, data_path)
+
+
+def missingness_stats(profile):
+    """Step 3 and step 8 column decisions from a dataset profile"""
+    counts = profile["pipeline"]
+
+    # Step 3: columns with >30% missing after deduplication
+    missing_percent = round((pd.Series(counts["unique_nulls"]) / counts["unique_rows"]) * 100, 2)
+    remove_cols = missing_percent[missing_percent > HIGH_MISSING_THRESHOLD].index.tolist()
+
+    # Step 8: missingness of the remaining columns after the row filters
+    dropped = [GEO_RENAME.get(col, col) for col in remove_cols] + NON_ANALYTICAL_COLS
+    valid_nulls = pd.Series(counts["valid_nulls"]).drop(index=dropped, errors="ignore")
+    missing_percent = (valid_nulls / counts["valid_rows"]) * 100
+    low_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= LOW_MISSING_THRESHOLD)].index.tolist()
+    impute_cols = [col for col in missing_percent[missing_percent > LOW_MISSING_THRESHOLD].index
+                   if col in counts["numeric_cols"]]
+
+    return {
+        "raw_rows": profile["rows"],
+        "raw_cols": len(profile["columns"]),
+        "remove_cols": remove_cols,
+        "low_missing_cols": low_missing_cols,
+        "impute_cols": impute_cols,
+    }
+
+
+def collect_missingness_stats(data_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Whole-dataset missingness for steps 3 and 8, from the saved profile when it is up to date"""
+    profile = load_profile(data_path)
+    reused = profile is not None and "pipeline" in profile
+    if not reused:
+        profile = profile_raw_data(data_path, chunksize)
+    return dict(missingness_stats(profile), profile_reused=reused)
+
+
+def collect_imputation_stats(data_path, stats, chunksize=DEFAULT_CHUNKSIZE):
+    """Second pass: fill values for steps 9-10, the step-9 regression imputers and the step-14 fences.
+
+    Features that step 9 fills with a constant (the wind speed median) are
+    deferred in the imputers and corrected once the median is known, so one
+    pass is enough.
+    """
+    raw_names = {new: old for old, new in GEO_RENAME.items()}
+    median_cols = [col for col in stats["impute_cols"] if col != 'Precipitation(in)']
+    deferred = [col for col in WEATHER_FILL_COLS if col in stats["impute_cols"]]
+    imputers = {target: RegressionImputer(target, features, deferred)
+                for target, features in REGRESSION_IMPUTATIONS.items()
+                if target in stats["impute_cols"]
+                and not any(col in stats["remove_cols"] for col in features)}
+    needed = {"ID", "Start_Time", "End_Time", "Start_Lat", "Start_Lng", "Severity"}
+    needed.update(raw_names.get(col, col) for col in stats["low_missing_cols"] + median_cols)
+    for imputer in imputers.values():
+        needed.update(imputer.features + [imputer.target])
+
+    seen_ids = np.empty(0, dtype=np.uint64)
+    sketches = {col: QuantileSketch() for col in median_cols}
+    clip_sketches = {col: QuantileSketch() for col in CLIP_COLS}
+
+    for chunk in read_raw(data_path, chunksize, usecols=lambda col: col in needed):
+        chunk, seen_ids = drop_seen_ids(chunk, seen_ids)
+        chunk = validate_rows(chunk)
+        if stats["low_missing_cols"]:
+            chunk = chunk.dropna(subset=stats["low_missing_cols"])
+
+        for col in median_cols:
+            sketches[col].update(chunk[col])
+        for col in CLIP_COLS:
+            if col in chunk.columns:
+                clip_sketches[col].update(chunk[col])
+
+        for imputer in imputers.values():
+            imputer.partial_fit(chunk)
+
+    medians = {col: sketches[col].median() for col in median_cols}
+    stats["clip_bounds"] = {col: list(sketch.iqr_bounds()) for col, sketch in clip_sketches.items()
+                            if sketch.count}
+    stats["weather_fill"] = {}
+    if 'Wind_Speed(mph)' in medians:
+        stats["weather_fill"]['Wind_Speed(mph)'] = medians.pop('Wind_Speed(mph)')
+    if 'Precipitation(in)' in stats["impute_cols"]:
+        stats["weather_fill"]['Precipitation(in)'] = 0.0
+
+    stats["regression_models"] = {}
+    for target, imputer in imputers.items():
+        imputer.solve(stats["weather_fill"])
+        if imputer.coef_ is not None:
+            # The target's median stays with the model as the fill for rows missing a feature
+            imputer.fallback = medians.pop(target)
+            stats["regression_models"][target] = imputer.to_dict()
+
+    stats["medians"] = medians
+    return stats
+
+
+def run_chunked_pipeline(data_path=RAW_DATA_PATH, output_path=PREPROCESSED_PATH,
+                         chunksize=DEFAULT_CHUNKSIZE, export_csv=False, observer=None):
+    """Run the pipeline out of core: two statistics passes, then steps 2-16 per chunk"""
+    observer = observer or PipelineObserver()
+
+    stats = collect_missingness_stats(data_path, chunksize)
+    source = "reused the saved profile of" if stats.pop("profile_reused") else "scanned"
+    observer.pass_finished(1, f"{source} {stats['raw_rows']:,} rows, "
+                              f"{len(stats['remove_cols'])} high-missingness columns, "
+                              f"{len(stats['low_missing_cols'])} low-missingness columns", stats)
+
+    stats = collect_imputation_stats(data_path, stats, chunksize)
+    observer.pass_finished(2, f"{len(stats['medians'])} medians computed, "
+                              f"{len(stats['regression_models'])} regression imputers fitted", stats)
+
+    ctx = {"data_path": data_path, "output_path": output_path, "export_csv": export_csv,
+           "stats": stats, "seen_ids": np.empty(0, dtype=np.uint64),
+           "summaries": new_summaries()}
+    with PreprocessedWriter(output_path, export_csv) as writer:
+        transform_chunks(read_raw(data_path, chunksize), ctx, writer, observer)
+    save_summaries(ctx.pop("summaries"), output_path)
+    save_pipeline_state(ctx)
+    observer.pass_finished(3, f"{ctx['rows_written']:,} rows written to {output_path}", stats)
+    return ctx
+
+
+def transform_chunks(chunks, ctx, writer, observer):
+    """Stream chunks through steps 2-15 with the statistics in ``ctx`` and write them"""
+    ctx.update(rows_read=0, rows_written=0, columns=[])
+    for chunk_num, chunk in enumerate(chunks, start=1):
+        ctx["rows_read"] += len(chunk)
+        for step in TRANSFORM_STEPS:
+            chunk, _ = step.func(chunk, ctx)
+        chunk = writer.write(chunk)
+        for summary in ctx.get("summaries", {}).values():
+            if summary is not None:
+                summary.update(chunk)
+        ctx["rows_written"] += len(chunk)
+        ctx["columns"] = chunk.columns.tolist()
+        observer.chunk_finished(chunk_num, ctx["rows_read"], ctx["rows_written"], chunk)
+
+
+# =====================================================================
+# FITTED STATE AND INCREMENTAL MODE
+# =====================================================================
+
+def pipeline_state_paths(output_path):
+    """Sidecar files holding the fitted statistics and the seen-ID hashes of an output"""
+    stem = os.path.splitext(output_path)[0]
+    return stem + ".state.json", stem + ".ids.npy"
+
+
+def new_summaries():
+    """Accumulators of the summaries saved next to every output, updated chunk by chunk"""
+    return {"correlations": CorrelationAccumulator(), "grid": GridAccumulator(), "cubes": CubeAccumulator(),
+            "weather": WeatherTable()}
+
+
+def summary_path(name, output_path):
+    """Path of summary ``name`` (see ``new_summaries``) next to ``output_path``"""
+    return {"correlations": correlation_path, "grid": grid_path, "cubes": cube_path,
+            "weather": weather_table_path}[name](output_path)
+
+
+def save_summaries(summaries, output_path):
+    """Save the summaries of a finished Parquet output next to it"""
+    if not output_path.endswith(".parquet"):
+        return
+    for name, summary in summaries.items():
+        if summary is not None and not summary.empty:
+            summary.save(summary_path(name, output_path), source=output_path)
+
+
+def save_pipeline_state(ctx):
+    """Persist the statistics fitted by a run so later extracts can reuse them"""
+    stats_path, ids_path = pipeline_state_paths(ctx["output_path"])
+    with open(stats_path, "w") as f:
+        json.dump({"stats": ctx["stats"]}, f, indent=2)
+    np.save(ids_path, ctx["seen_ids"])
+
+
+def load_pipeline_state(output_path):
+    """Return (stats, seen_ids) saved by the last run that wrote ``output_path``"""
+    stats_path, ids_path = pipeline_state_paths(output_path)
+    if not os.path.exists(stats_path):
+        raise FileNotFoundError(f"No saved pipeline state for {output_path}; run the full pipeline first")
+    with open(stats_path) as f:
+        stats = json.load(f)["stats"]
+    stats.setdefault("clip_bounds", {})  # Outputs written before step 14 existed are not clipped
+    if "wind_chill_model" in stats:
+        # State saved before regression imputers were generalised
+        model = stats.pop("wind_chill_model")
+        stats["regression_models"] = {'Wind_Chill(F)': dict(model, features=WIND_CHILL_FEATURES)} if model else {}
+    return stats, np.load(ids_path)
+
+
+def run_incremental_pipeline(new_data_path, output_path=PREPROCESSED_PATH, export_csv=False,
+                             chunksize=DEFAULT_CHUNKSIZE, observer=None):
+    """Append a new raw extract using the frozen state of the last full run.
+
+    Rows whose ID was already seen (in the history or earlier in the extract)
+    are skipped; nothing is refitted.
+    """
+    observer = observer or PipelineObserver()
+    stats, seen_ids = load_pipeline_state(output_path)
+    observer.pass_finished(1, f"loaded frozen state ({len(seen_ids):,} known IDs)", stats)
+
+    # The new rows are folded into the saved summaries; a stale file is left to be rebuilt on use
+    ctx = {"data_path": new_data_path, "output_path": output_path, "export_csv": export_csv,
+           "stats": stats, "seen_ids": seen_ids,
+           "summaries": {"correlations": saved_correlations(output_path), "grid": saved_grid(output_path),
+                         "cubes": saved_cubes(output_path), "weather": saved_weather_table(output_path)}}
+    with PreprocessedWriter(output_path, export_csv, append=True) as writer:
+        transform_chunks(read_raw(new_data_path, chunksize), ctx, writer, observer)
+    save_summaries(ctx.pop("summaries"), output_path)
+    save_pipeline_state(ctx)
+    observer.pass_finished(3, f"{ctx['rows_written']:,} new rows appended to {output_path}", stats)
+    return ctx
+
+
+# =====================================================================
+# COMMAND-LINE ENTRY POINT
+# =====================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the US Accidents preprocessing pipeline.")
+    parser.add_argument("--input", nargs="+", default=[RAW_DATA_PATH], help="Raw accident CSV file(s)")
+    parser.add_argument("--output", default=PREPROCESSED_PATH, help="Preprocessed Parquet output")
+    parser.add_argument("--export-csv", action="store_true", help="Also write a CSV copy")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the input in chunks of this many rows (out-of-core mode)")
+    parser.add_argument("--append", metavar="NEW_CSV",
+                        help="Append a new extract using the saved state of --output")
+    parser.add_argument("--refit", action="store_true",
+                        help="With --append: refit the statistics by rebuilding from --input plus the new extract")
+    parser.add_argument("--cache-dir", nargs="?", const=DEFAULT_CACHE_DIR, default=None,
+                        help=f"Checkpoint in-memory steps to this directory (default {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 3,
+                        help="Evict least recently used checkpoints above this size")
+    parser.add_argument("--checkpoint-steps", type=int, nargs="+", default=None,
+                        help="Only checkpoint these step numbers (default: 1-15)")
+    parser.add_argument("--parse-workers", type=int, default=1,
+                        help="Processes used to parse timestamps in the in-memory mode")
+    parser.add_argument("--profile", action="store_true",
+                        help="Only build the dataset profile of --input (shown by Data Exploration)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    observer = LoggingObserver()
+    if args.profile:
+        profile = profile_raw_data(args.input, args.chunksize or DEFAULT_CHUNKSIZE)
+        logger.info("Profiled %s rows of %s columns", f"{profile['rows']:,}", len(profile["columns"]))
+        return
+    if args.append and not args.refit:
+        run_incremental_pipeline(args.append, args.output, args.export_csv,
+                                 args.chunksize or DEFAULT_CHUNKSIZE, observer)
+        return
+
+    inputs = args.input + ([args.append] if args.append else [])
+    if args.chunksize:
+        run_chunked_pipeline(inputs, args.output, args.chunksize, args.export_csv, observer)
+    else:
+        cache = None
+        if args.cache_dir:
+            cache = CheckpointCache(args.cache_dir, int(args.cache_max_gb * 1024 ** 3))
+        run_pipeline(inputs, args.output, args.export_csv, observer, cache, args.checkpoint_steps,
+                     args.parse_workers)
+
+
+if __name__ == "__main__":
+    main()
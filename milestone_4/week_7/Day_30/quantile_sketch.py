@@ -0,0 +1,139 @@
+"""Mergeable quantile sketch with bounded memory (merging t-digest).
+
+The sketch holds sorted (value, weight) centroids:
+- While a column has at most ``max_centroids`` distinct values, each
+  centroid is one exact value and its count, so quantiles are exact.
+  Pipeline medians of the weather columns stay exact this way.
+- Beyond that, neighbouring centroids are merged under the t-digest
+  arcsine scale function. This keeps the tails fine-grained, so quartiles
+  and fences of long-tailed columns such as Duration_Minutes stay accurate
+  in about ``compression`` centroids.
+
+Sketches of different chunks merge by combining their centroids.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dataset_io import load_preprocessed
+
+MAX_CENTROIDS = 10_000
+COMPRESSION = 500
+IQR_MULTIPLIER = 1.5
+BATCH_ROWS = 1_000_000
+
+
+class QuantileSketch:
+    def __init__(self, max_centroids=MAX_CENTROIDS, compression=COMPRESSION):
+        self.max_centroids = max_centroids
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.exact = True   # False once centroids of different values have been merged
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Add the non-missing values of a Series or array"""
+        values = np.asarray(pd.Series(values).dropna(), dtype=float)
+        if len(values):
+            means, weights = np.unique(values, return_counts=True)
+            self._absorb(means, weights.astype(float), exact=True)
+            self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        return self
+
+    def merge(self, other):
+        if len(other.means):
+            self._absorb(other.means, other.weights, other.exact)
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    def _absorb(self, means, weights, exact):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        self.exact = self.exact and exact
+        if self.exact:
+            # Identical values share one centroid, so exact sketches only grow with distinct values
+            means, index = np.unique(means, return_inverse=True)
+            weights = np.bincount(index, weights=weights)
+        else:
+            order = np.argsort(means, kind="stable")
+            means, weights = means[order], weights[order]
+        self.means, self.weights = means, weights
+        if len(self.means) > self.max_centroids:
+            self._compress()
+
+    def _compress(self):
+        """Greedily merge neighbours while each centroid spans at most one unit of the k1 scale"""
+        total = self.weights.sum()
+        scale = self.compression / (2 * np.pi)
+        k_limit = lambda q: (np.sin(min(np.arcsin(2 * q - 1) + 1 / scale, np.pi / 2)) + 1) / 2
+
+        means, weights = [], []
+        cur_mean, cur_weight = self.means[0], self.weights[0]
+        q0 = 0.0
+        q_limit = k_limit(q0)
+        for mean, weight in zip(self.means[1:], self.weights[1:]):
+            if q0 + (cur_weight + weight) / total <= q_limit:
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                q0 += cur_weight / total
+                q_limit = k_limit(q0)
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean)
+        weights.append(cur_weight)
+        self.means, self.weights = np.array(means), np.array(weights)
+        self.exact = False
+
+    def quantile(self, q):
+        """Quantile with linear interpolation between order statistics, like ``Series.quantile``"""
+        if not len(self.means):
+            return np.nan
+        n = self.weights.sum()
+        rank = (n - 1) * q
+        if self.exact:
+            cumulative = np.cumsum(self.weights)
+            lower = self.means[np.searchsorted(cumulative, np.floor(rank) + 1)]
+            upper = self.means[np.searchsorted(cumulative, np.ceil(rank) + 1)]
+            return float(lower + (rank - np.floor(rank)) * (upper - lower))
+        # Each centroid's mean sits at the middle of the ranks it covers
+        centers = np.cumsum(self.weights) - self.weights / 2 - 0.5
+        ranks = np.concatenate([[0], centers, [n - 1]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(rank, ranks, values))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def iqr_bounds(self, multiplier=IQR_MULTIPLIER):
+        """(lower, upper) Tukey fences: Q1 - 1.5 IQR and Q3 + 1.5 IQR"""
+        q1, q3 = self.quantile(0.25), self.quantile(0.75)
+        return q1 - multiplier * (q3 - q1), q3 + multiplier * (q3 - q1)
+
+    def box_summary(self):
+        """Quartiles plus whiskers at the fences (clamped to the data range), as plotted by box plots"""
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        lower, upper = self.iqr_bounds()
+        return {"min": self.min, "lowerfence": max(lower, self.min), "q1": q1, "median": median,
+                "q3": q3, "upperfence": min(upper, self.max), "max": self.max, "count": self.count}
+
+
+def grouped_box_summaries(path, column, by="Severity"):
+    """Box summary of ``column`` per value of ``by``, from one streaming pass over the dataset"""
+    sketches = {}
+    if path.endswith(".csv"):
+        batches = [load_preprocessed(path, columns=[column, by])]
+    else:
+        batches = (batch.to_pandas() for batch in
+                   pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=[column, by]))
+    for batch in batches:
+        for key, values in batch.groupby(by, observed=True)[column]:
+            sketches.setdefault(key, QuantileSketch()).update(values)
+    return pd.DataFrame({key: sketches[key].box_summary() for key in sorted(sketches)}).T
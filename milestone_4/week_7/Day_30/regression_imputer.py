@@ -0,0 +1,124 @@
+"""Linear-regression imputer fitted from streamed sufficient statistics.
+
+``partial_fit`` accumulates X^T X and X^T y, held as one moment matrix over
+the vector [1, features..., target], from a frame or chunk. It selects rows
+with boolean masks and reads only the needed columns in fixed-size blocks,
+so no row subset of the frame is ever materialised. Imputers fitted on
+separate chunks can be merged, and ``transform`` writes predictions into
+the frame in place.
+
+A feature that will be filled with a constant whose value is only known
+later (such as a median computed in the same pass) can be *deferred*. Its
+missing values are accumulated as zeros, together with the moments needed
+to correct for the fill value once ``solve`` receives it.
+
+Rows missing a feature cannot be predicted. ``transform`` fills them with
+``fallback`` (the pipeline uses the target's observed median) when it is set.
+
+The imputer works on any weather column, e.g. from a notebook::
+
+    imputer = RegressionImputer("Humidity(%)", ["Temperature(F)", "Pressure(in)"])
+    for chunk in pd.read_csv(path, chunksize=500_000):
+        imputer.partial_fit(chunk)
+    imputer.solve().transform(df)
+"""
+import numpy as np
+
+BLOCK_ROWS = 1_000_000
+
+
+class RegressionImputer:
+    def __init__(self, target, features, deferred=(), fallback=None):
+        self.target = target
+        self.fallback = fallback
+        self.features = list(features)
+        self.deferred = [col for col in deferred if col in self.features]
+        size = len(self.features) + 2
+        self.moments = np.zeros((size, size))           # sum of z z^T, z = [1, x..., y]
+        self.deferred_moments = np.zeros((size, size))  # sum of z m^T, m = deferred-missing indicators
+        self.deferred_counts = np.zeros((size, size))   # sum of m m^T
+        self.intercept_ = None
+        self.coef_ = None
+
+    @property
+    def n_rows(self):
+        return int(self.moments[0, 0])
+
+    def partial_fit(self, df, mask=None):
+        """Accumulate the rows of ``df`` where the target and every non-deferred feature are known"""
+        known = df[self.target].notna().to_numpy()
+        for col in self.features:
+            if col not in self.deferred:
+                known &= df[col].notna().to_numpy()
+        if mask is not None:
+            known &= np.asarray(mask)
+
+        columns = [df[col].to_numpy() for col in self.features + [self.target]]
+        deferred_idx = [1 + self.features.index(col) for col in self.deferred]
+        positions = np.flatnonzero(known)
+        for start in range(0, len(positions), BLOCK_ROWS):
+            rows = positions[start:start + BLOCK_ROWS]
+            z = np.empty((len(rows), len(columns) + 1))
+            z[:, 0] = 1.0
+            for i, values in enumerate(columns, start=1):
+                z[:, i] = values[rows]
+            if deferred_idx:
+                m = np.zeros_like(z)
+                for i in deferred_idx:
+                    m[:, i] = np.isnan(z[:, i])
+                    z[:, i] = np.nan_to_num(z[:, i])
+                self.deferred_moments += z.T @ m
+                self.deferred_counts += m.T @ m
+            self.moments += z.T @ z
+        return self
+
+    def merge(self, other):
+        """Combine the statistics of an imputer fitted on other rows"""
+        self.moments += other.moments
+        self.deferred_moments += other.deferred_moments
+        self.deferred_counts += other.deferred_counts
+        return self
+
+    def solve(self, fill_values=None):
+        """Solve the normal equations, substituting ``fill_values`` for deferred features"""
+        if self.n_rows == 0:
+            return self
+        v = np.zeros(len(self.moments))
+        for col, value in (fill_values or {}).items():
+            if col in self.deferred:
+                v[1 + self.features.index(col)] = value
+        d = np.diag(v)
+        moments = (self.moments + self.deferred_moments @ d + d @ self.deferred_moments.T
+                   + d @ self.deferred_counts @ d)
+        beta = np.linalg.lstsq(moments[:-1, :-1], moments[:-1, -1], rcond=None)[0]
+        self.intercept_ = float(beta[0])
+        self.coef_ = beta[1:]
+        return self
+
+    def transform(self, df):
+        """Fill missing targets in place: predicted where every feature is known, else ``fallback``.
+
+        Returns the number of values filled.
+        """
+        missing = df[self.target].isna().to_numpy()
+        predictable = missing.copy()
+        for col in self.features:
+            predictable &= df[col].notna().to_numpy()
+        if predictable.any():
+            X = np.column_stack([df[col].to_numpy()[predictable] for col in self.features])
+            df.loc[predictable, self.target] = self.intercept_ + X @ self.coef_
+        if self.fallback is None:
+            return int(predictable.sum())
+        df[self.target] = df[self.target].fillna(self.fallback)
+        return int(missing.sum())
+
+    def to_dict(self):
+        return {"features": self.features, "intercept": self.intercept_, "coef": self.coef_.tolist(),
+                "fallback": self.fallback}
+
+    @classmethod
+    def from_dict(cls, target, model):
+        imputer = cls(target, model["features"], fallback=model.get("fallback"))
+        imputer.intercept_ = model["intercept"]
+        imputer.coef_ = np.array(model["coef"])
+        return imputer
@@ -0,0 +1,113 @@
+"""Reproducible random samples drawn in one streaming pass.
+
+Every row gets a seeded uniform random key. Keeping the rows with the
+smallest keys, overall or per stratum, is a reservoir sample: it never
+needs the full file in memory, and it does not depend on the chunk size.
+
+Samples are saved under ``DEFAULT_SAMPLE_DIR`` and keyed by:
+- the content hash of the source
+- size, strata, quotas and seed
+- the columns read
+
+So a page or notebook asking for the same sample again loads it in
+milliseconds::
+
+    from sampling import load_sample
+    df = load_sample("data/US_Accidents_March23.csv", quotas=5_000, strata="Severity")
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from checkpoint_cache import DEFAULT_CACHE_DIR, CheckpointCache
+
+DEFAULT_SAMPLE_DIR = "data/.samples"
+DEFAULT_SAMPLE_SIZE = 50_000
+SEED = 42
+CHUNK_ROWS = 500_000
+
+# Strata that raw files do not store as a column
+DERIVED_STRATA = {
+    "Year": lambda chunk: pd.to_numeric(chunk["Start_Time"].str[:4], errors="coerce"),
+}
+
+
+def _chunks(path, columns):
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=CHUNK_ROWS, usecols=columns)
+
+
+def _read_columns(path, columns, strata):
+    """Columns to read: the requested ones plus whatever the stratum needs"""
+    if columns is None:
+        return None
+    needed = list(columns)
+    extra = ["Start_Time"] if strata in DERIVED_STRATA else [strata] if strata else []
+    return needed + [col for col in extra if col not in needed]
+
+
+def reservoir_sample(path, size=DEFAULT_SAMPLE_SIZE, strata=None, quotas=None, seed=SEED, columns=None):
+    """Seeded sample of ``path`` (CSV or Parquet) in file order.
+
+    Without ``strata`` this is a uniform sample of ``size`` rows. With
+    ``strata`` (a column, or "Year" on raw files), ``quotas`` gives the
+    rows kept per stratum: an int for every stratum, or a dict for the listed
+    strata only. It defaults to ``size``. Rows with a missing stratum are never sampled.
+    """
+    rng = np.random.default_rng(seed)
+    if strata is not None and quotas is None:
+        quotas = size
+    kept = None
+    offset = 0
+    for chunk in _chunks(path, _read_columns(path, columns, strata)):
+        chunk = chunk.assign(_row=np.arange(offset, offset + len(chunk)), _key=rng.random(len(chunk)))
+        offset += len(chunk)
+        if strata is not None:
+            stratum = DERIVED_STRATA[strata](chunk) if strata not in chunk.columns else chunk[strata]
+            chunk = chunk.assign(_stratum=stratum)
+        kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+
+        if strata is None:
+            kept = kept.nsmallest(size, "_key")
+            continue
+        kept = kept.sort_values("_key", kind="stable")
+        rank = kept.groupby("_stratum", observed=True, dropna=True).cumcount()
+        limit = (kept["_stratum"].map(quotas).fillna(0) if isinstance(quotas, dict)
+                 else pd.Series(quotas, index=kept.index))
+        kept = kept[rank.notna() & (rank < limit)]
+
+    if kept is None:
+        return pd.DataFrame(columns=columns)
+    kept = kept.sort_values("_row").drop(columns=["_row", "_key", "_stratum"], errors="ignore")
+    if columns is not None:
+        kept = kept[list(columns)]
+    return kept.reset_index(drop=True)
+
+
+def sample_key(path, size, strata, quotas, seed, columns, cache=None):
+    """Artifact key: the source's content hash plus every sampling parameter"""
+    cache = cache or CheckpointCache(DEFAULT_CACHE_DIR)
+    params = json.dumps({"source": cache.file_hash(path), "size": size, "strata": strata,
+                         "quotas": quotas, "seed": seed, "columns": columns}, sort_keys=True, default=str)
+    return hashlib.sha256(params.encode()).hexdigest()[:24]
+
+
+def load_sample(path, size=DEFAULT_SAMPLE_SIZE, strata=None, quotas=None, seed=SEED, columns=None,
+                sample_dir=DEFAULT_SAMPLE_DIR):
+    """``reservoir_sample`` saved as a Parquet artifact and reused while the source is unchanged"""
+    columns = list(columns) if columns is not None else None
+    artifact = os.path.join(sample_dir, sample_key(path, size, strata, quotas, seed, columns) + ".parquet")
+    if not os.path.exists(artifact):
+        sample = reservoir_sample(path, size, strata, quotas, seed, columns)
+        os.makedirs(sample_dir, exist_ok=True)
+        sample.to_parquet(artifact + ".tmp", index=False)
+        os.replace(artifact + ".tmp", artifact)
+    # Read back even when just written, so the first and later requests return identical frames
+    return pd.read_parquet(artifact)
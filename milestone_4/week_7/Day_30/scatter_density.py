@@ -0,0 +1,67 @@
+"""Bounded-size scatter plots for large datasets.
+
+Instead of sending every point to the browser, a scatter of two numeric
+columns is summarised as:
+- a 2D count grid per class (Severity), drawn as translucent heatmap layers
+- a stratified, density-aware sample of individual points drawn on top
+
+Both are fixed in size, so payload and render time do not grow with the
+row count. Small selections are still plotted point by point by the pages.
+"""
+import numpy as np
+
+GRID_BINS = 100
+SAMPLE_POINTS = 5_000
+FULL_SCATTER_MAX_ROWS = 20_000  # Up to this many rows a plain scatter is cheap enough
+RANGE_QUANTILES = (0.001, 0.999)  # Outliers beyond these are counted in the edge cells
+SEED = 42
+
+
+def axis_range(values):
+    low, high = np.quantile(values, RANGE_QUANTILES)
+    if high <= low:
+        low, high = values.min(), values.max()
+    if high <= low:
+        high = low + 1.0
+    return float(low), float(high)
+
+
+def grid_index(values, low, high, bins=GRID_BINS):
+    """Cell index of each value on ``bins`` equal-width cells; outliers land in the edge cells"""
+    index = ((values - low) / (high - low) * bins).astype(np.int64)
+    return np.clip(index, 0, bins - 1)
+
+
+def class_grids(x, y, classes, bins=GRID_BINS):
+    """Count grids per class: (levels, grids[level, y_cell, x_cell], x_range, y_range)"""
+    x_range, y_range = axis_range(x), axis_range(y)
+    levels, class_index = np.unique(classes, return_inverse=True)
+    cells = (class_index * bins + grid_index(y, *y_range, bins)) * bins + grid_index(x, *x_range, bins)
+    grids = np.bincount(cells, minlength=len(levels) * bins * bins).reshape(len(levels), bins, bins)
+    return levels, grids, x_range, y_range
+
+
+def density_sample(x, y, classes, n=SAMPLE_POINTS, bins=GRID_BINS, seed=SEED):
+    """Row indices of a stratified sample that favours sparse regions.
+
+    Every class gets an equal share of ``n``, so rare classes stay visible.
+    Within a class, points are drawn without replacement with weight
+    1 / sqrt(cell count), which thins dense cores while keeping outlying
+    structure.
+    """
+    rng = np.random.default_rng(seed)
+    levels, grids, x_range, y_range = class_grids(x, y, classes, bins)
+    class_index = np.searchsorted(levels, classes)
+    x_cell, y_cell = grid_index(x, *x_range, bins), grid_index(y, *y_range, bins)
+    weights = 1 / np.sqrt(grids[class_index, y_cell, x_cell])
+
+    # Efraimidis-Spirakis weighted sampling: keep the largest log(u) / w per class
+    keys = np.log(rng.random(len(x))) / weights
+    quota = max(n // len(levels), 1)
+    chosen = []
+    for level in range(len(levels)):
+        rows = np.flatnonzero(class_index == level)
+        if len(rows) > quota:
+            rows = rows[np.argpartition(keys[rows], -quota)[-quota:]]
+        chosen.append(rows)
+    return np.sort(np.concatenate(chosen))
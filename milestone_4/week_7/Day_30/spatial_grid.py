@@ -0,0 +1,182 @@
+"""Spatial grid index and grid-based hotspot detection.
+
+Accidents are binned into fixed 0.01° cells (about 1 km). For every
+(Severity, State, cell), ``GridAccumulator`` keeps the accident count and
+the sums of the coordinates. The table is mergeable across chunks and
+extracts and is saved next to the preprocessed dataset (``*.grid.npz``).
+
+Hotspots replace DBSCAN with connected-component labelling on the grid.
+Cells holding at least ``MIN_CELL_COUNT`` accidents are dense, and 8-connected
+dense cells form one hotspot. The result is reported as a count plus a
+count-weighted centroid. This is linear in the number of cells, and the hotspots
+of every (Severity, State) are stored with the grid.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from dataset_io import PREPROCESSED_PATH
+
+CELL_DEG = 0.01
+N_COLS = int(round(360 / CELL_DEG))
+N_CELLS = int(round(180 / CELL_DEG)) * N_COLS
+MIN_CELL_COUNT = 5
+BATCH_ROWS = 1_000_000
+CELL_COLUMNS = ["Severity", "State", "cell", "count", "lat_sum", "lng_sum"]
+
+
+def grid_path(dataset_path):
+    return os.path.splitext(dataset_path)[0] + ".grid.npz"
+
+
+def cell_ids(lat, lng):
+    """Grid cell of each coordinate: row-major over (latitude, longitude) rows of ``CELL_DEG``"""
+    row = np.floor((np.asarray(lat, dtype=float) + 90) / CELL_DEG).astype(np.int64)
+    col = np.floor((np.asarray(lng, dtype=float) + 180) / CELL_DEG).astype(np.int64)
+    return np.clip(row, 0, N_CELLS // N_COLS - 1) * N_COLS + np.clip(col, 0, N_COLS - 1)
+
+
+def aggregate_cells(df, keys=(), lat="Latitude", lng="Longitude"):
+    """Accident count and coordinate sums per (``keys``, cell) of a frame"""
+    frame = pd.DataFrame({"cell": cell_ids(df[lat], df[lng]),
+                          "lat_sum": df[lat].to_numpy(dtype=float),
+                          "lng_sum": df[lng].to_numpy(dtype=float)})
+    for key in keys:
+        frame[key] = df[key].to_numpy()
+    grouped = frame.groupby(list(keys) + ["cell"], observed=True, sort=False)
+    cells = grouped[["lat_sum", "lng_sum"]].sum()
+    cells.insert(0, "count", grouped.size())
+    return cells.reset_index()
+
+
+def merge_cells(*tables, keys=()):
+    """Sum cell tables of the same ``keys`` (from different chunks or extracts)"""
+    cells = pd.concat(tables, ignore_index=True)
+    return cells.groupby(list(keys) + ["cell"], observed=True, sort=False,
+                         as_index=False)[["count", "lat_sum", "lng_sum"]].sum()
+
+
+def label_hotspots(cells, keys=(), min_count=MIN_CELL_COUNT):
+    """Hotspots of a cell table: one row per connected group of dense cells within each ``keys`` group"""
+    dense = cells[cells["count"] >= min_count]
+    columns = list(keys) + ["accident_count", "latitude", "longitude"]
+    if dense.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Offset each group into its own id range so neighbours never cross groups
+    group = dense.groupby(list(keys), observed=True, sort=False).ngroup().to_numpy() if keys else 0
+    key = np.asarray(group, dtype=np.int64) * N_CELLS + dense["cell"].to_numpy()
+    order = np.argsort(key)
+    key = key[order]
+    dense = dense.iloc[order]
+
+    edges = []
+    for offset in (1, N_COLS - 1, N_COLS, N_COLS + 1):  # E, NW, N, NE: each 8-neighbour pair once
+        position = np.searchsorted(key, key + offset)
+        found = position < len(key)
+        found[found] = key[position[found]] == key[found] + offset
+        edges.append((np.flatnonzero(found), position[found]))
+    source = np.concatenate([src for src, _ in edges])
+    target = np.concatenate([dst for _, dst in edges])
+    graph = coo_matrix((np.ones(len(source)), (source, target)), shape=(len(key), len(key)))
+    _, labels = connected_components(graph, directed=False)
+
+    grouped = dense.assign(hotspot=labels).groupby("hotspot", sort=False)
+    hotspots = grouped[["count", "lat_sum", "lng_sum"]].sum()
+    result = pd.DataFrame({"accident_count": hotspots["count"].to_numpy(),
+                           "latitude": (hotspots["lat_sum"] / hotspots["count"]).to_numpy(),
+                           "longitude": (hotspots["lng_sum"] / hotspots["count"]).to_numpy()})
+    for key_col in keys:
+        result.insert(len(result.columns) - 3, key_col, grouped[key_col].first().to_numpy())
+    return result.sort_values("accident_count", ascending=False, ignore_index=True)[columns]
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+class GridAccumulator:
+    """(Severity, State, cell) counts and coordinate sums, mergeable across chunks"""
+
+    def __init__(self):
+        self.cells = None
+        self.hotspots = None
+
+    @property
+    def empty(self):
+        return self.cells is None or self.cells.empty
+
+    def update(self, df):
+        cells = aggregate_cells(df, keys=("Severity", "State"))
+        self.cells = cells if self.cells is None else merge_cells(self.cells, cells, keys=("Severity", "State"))
+        self.hotspots = None
+        return self
+
+    def hotspot_table(self):
+        """Hotspots per (Severity, State)"""
+        if self.hotspots is None:
+            self.hotspots = label_hotspots(self.cells, keys=("Severity", "State"))
+        return self.hotspots
+
+    def save(self, path, source=None):
+        cells, hotspots = self.cells, self.hotspot_table()
+        arrays = {f"cells_{col}": _plain(cells[col]) for col in CELL_COLUMNS}
+        arrays.update({f"hotspots_{col}": _plain(hotspots[col]) for col in hotspots.columns})
+        if source is not None:
+            arrays["source"] = _signature(source)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        acc = cls()
+        with np.load(path, allow_pickle=False) as data:
+            acc.cells = pd.DataFrame({col: data[f"cells_{col}"] for col in CELL_COLUMNS})
+            acc.hotspots = pd.DataFrame({name[len("hotspots_"):]: data[name] for name in data.files
+                                         if name.startswith("hotspots_")})
+            source = data["source"] if "source" in data else None
+        return acc, source
+
+
+def _plain(series):
+    """Numpy array that np.savez stores without pickling (categories become strings)"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        return series.astype(str).to_numpy(dtype=str)
+    return series.to_numpy()
+
+
+def saved_grid(path=PREPROCESSED_PATH):
+    """The saved grid of the dataset at ``path``, or None when missing or out of date"""
+    sidecar = grid_path(path)
+    if not os.path.exists(sidecar) or not os.path.exists(path):
+        return None
+    acc, source = GridAccumulator.load(sidecar)
+    if source is None or not np.array_equal(source, _signature(path)):
+        return None
+    return acc
+
+
+def load_grid(path=PREPROCESSED_PATH):
+    """Grid of the dataset at ``path``: the saved one while it is current, else rebuilt in one pass and saved"""
+    acc = saved_grid(path)
+    if acc is None:
+        acc = GridAccumulator()
+        columns = ["Severity", "State", "Latitude", "Longitude"]
+        if path.endswith(".csv"):
+            acc.update(pd.read_csv(path, usecols=columns))
+        else:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=columns):
+                acc.update(batch.to_pandas())
+        acc.save(grid_path(path), source=path)
+    return acc
+
+
+def load_hotspots(path=PREPROCESSED_PATH):
+    """Hotspots per (Severity, State) of the dataset at ``path``"""
+    return load_grid(path).hotspot_table()
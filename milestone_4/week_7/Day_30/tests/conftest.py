@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROAD_FEATURES = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit', 'Railway', 'Roundabout',
+                 'Station', 'Stop', 'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
+WEATHER = ["Clear", "Fair", "Cloudy", "Light Rain", "Rain", "Heavy Rain", "Light Snow", "Fog",
+           "Haze", "Heavy T-Storm", "Rain / Windy", "Mostly Cloudy", "Overcast", "Thunderstorm"]
+
+
+def synthetic_accidents(n=3_000, seed=0, humidity_missing=0.02, id_offset=0):
+    """Raw accident rows shaped like the Kaggle CSV, with duplicates, bad rows and missing values"""
+    rng = np.random.default_rng(seed)
+
+    def missing(values, share):
+        values = pd.Series(values, dtype=object if values.dtype == object else float)
+        values[rng.random(n) < share] = np.nan
+        return values
+
+    start = pd.Timestamp("2016-02-08") + pd.to_timedelta(rng.integers(0, 7 * 365 * 24 * 3600, n), unit="s")
+    end = start + pd.to_timedelta(rng.integers(60, 24_000, n), unit="s")
+    temperature = rng.normal(60, 20, n).round(1)
+    humidity = rng.integers(10, 100, n).astype(float)
+    wind_speed = rng.gamma(2, 4, n).round(1)
+    ids = [f"A-{id_offset + i}" for i in range(n)]
+    ids[5], ids[-1] = ids[3], ids[10]  # Duplicate IDs
+    df = pd.DataFrame({
+        "ID": ids, "Source": "Source1", "Severity": rng.choice([1, 2, 2, 2, 3, 4, 5], n),
+        "Start_Time": start.strftime("%Y-%m-%d %H:%M:%S"), "End_Time": end.strftime("%Y-%m-%d %H:%M:%S"),
+        "Start_Lat": missing(rng.uniform(25, 48, n), 0.001), "Start_Lng": rng.uniform(-124, -70, n),
+        "End_Lat": missing(rng.uniform(25, 48, n), 0.45), "End_Lng": missing(rng.uniform(-124, -70, n), 0.45),
+        "Distance(mi)": rng.exponential(0.5, n).round(3), "Description": "desc", "Street": "Main St",
+        "City": rng.choice([f"City{i}" for i in range(40)], n), "County": "X",
+        "State": rng.choice(["CA", "TX", "FL", "NY", "PA", "OH", "WA", "AZ"], n),
+        "Zipcode": "90001", "Country": "US", "Timezone": "US/Pacific", "Airport_Code": "KLAX",
+        "Weather_Timestamp": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "Temperature(F)": missing(temperature, 0.02),
+        "Wind_Chill(F)": missing((temperature - 0.7 * wind_speed + 0.02 * humidity
+                                  + rng.normal(0, 1, n)).round(1), 0.25),
+        "Humidity(%)": missing(humidity, humidity_missing),
+        "Pressure(in)": missing(rng.normal(29.9, 0.3, n).round(2), 0.018),
+        "Visibility(mi)": missing(rng.choice([0.5, 1, 2, 5, 10, 10, 20, 50], n).astype(float), 0.023),
+        "Wind_Direction": missing(rng.choice(["N", "S", "E", "W", "CALM"], n).astype(object), 0.02),
+        "Wind_Speed(mph)": missing(wind_speed, 0.07),
+        "Precipitation(in)": missing(rng.exponential(0.02, n).round(2), 0.28),
+        "Weather_Condition": missing(rng.choice(WEATHER, n).astype(object), 0.02),
+        "Amenity": rng.random(n) < 0.01,
+    })
+    for col in ROAD_FEATURES:
+        df[col] = rng.random(n) < 0.1
+    for col in ["Sunrise_Sunset", "Civil_Twilight", "Nautical_Twilight", "Astronomical_Twilight"]:
+        df[col] = missing(rng.choice(["Day", "Night"], n).astype(object), 0.003)
+    df.loc[7, "Start_Time"] = "garbage"
+    return df
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = str(tmp_path / "raw.csv")
+    synthetic_accidents().to_csv(path, index=False)
+    return path
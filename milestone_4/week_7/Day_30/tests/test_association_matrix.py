@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+import association_matrix
+from association_matrix import cramers_v_from_table, cramers_v_matrix
+from conftest import synthetic_accidents
+
+FEATURES = ["State", "City", "Weather_Condition", "Severity"]
+
+
+def crosstab_matrix(df):
+    matrix = np.eye(len(FEATURES))
+    for i, a in enumerate(FEATURES):
+        for j, b in enumerate(FEATURES[i + 1:], start=i + 1):
+            value = cramers_v_from_table(pd.crosstab(df[a], df[b]).to_numpy())
+            matrix[i, j] = matrix[j, i] = 0 if np.isnan(value) else value
+    return matrix
+
+
+def test_matrix_matches_crosstab_on_every_path(monkeypatch):
+    df = synthetic_accidents()
+    expected = crosstab_matrix(df)
+    np.testing.assert_allclose(cramers_v_matrix(df, FEATURES, workers=1), expected)
+    np.testing.assert_allclose(cramers_v_matrix(df, FEATURES, workers=2), expected)
+
+    # Tables larger than 2x2 take the sparse path once they exceed the dense cell limit
+    monkeypatch.setattr(association_matrix, "DENSE_MAX_CELLS", 4)
+    np.testing.assert_allclose(cramers_v_matrix(df, FEATURES, workers=1), expected)
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import gaussian_kde
+
+from binned_density import binned_kde, finite_values
+
+
+def test_binned_kde_matches_gaussian_kde():
+    values = np.random.default_rng(0).normal(60, 15, 20_000)
+    for factor in (0.5, 1.0, 2.0):
+        x, density = binned_kde(values, factor)
+        expected = gaussian_kde(values, bw_method=factor * len(values) ** (-1 / 5))(x)
+        np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+
+
+def test_degenerate_columns_have_no_kde():
+    assert binned_kde(np.array([1.0])) is None
+    assert binned_kde(np.full(10, 3.0)) is None
+    assert finite_values(pd.Series([1.0, np.nan, np.inf, 2.0])).tolist() == [1.0, 2.0]
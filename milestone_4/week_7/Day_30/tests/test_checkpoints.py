@@ -0,0 +1,48 @@
+import pandas as pd
+
+import dataset_io
+import preprocessing_pipeline as pipeline
+from checkpoint_cache import CheckpointCache
+
+
+class StepRecorder(pipeline.PipelineObserver):
+    def __init__(self):
+        self.started = []
+
+    def step_started(self, step):
+        self.started.append(step.number)
+
+
+def run(raw_csv, tmp_path, cache, name):
+    observer = StepRecorder()
+    df, _ = pipeline.run_pipeline(raw_csv, str(tmp_path / f"{name}.parquet"), observer=observer, cache=cache)
+    return df, observer.started
+
+
+def test_resumed_run_matches_a_fresh_run(raw_csv, tmp_path, monkeypatch):
+    cache = CheckpointCache(str(tmp_path / "cache"))
+    fresh, started = run(raw_csv, tmp_path, cache, "fresh")
+    assert started == [step.number for step in pipeline.STEPS]
+
+    resumed, started = run(raw_csv, tmp_path, cache, "resumed")
+    assert started == [pipeline.STEPS[-1].number]
+    pd.testing.assert_frame_equal(resumed, fresh)
+
+    # A changed constant invalidates the step that reads it and every later step
+    monkeypatch.setattr(pipeline, "REDUNDANT_COLS", pipeline.REDUNDANT_COLS + ["Zipcode"])
+    _, started = run(raw_csv, tmp_path, cache, "changed")
+    assert started[0] == next(step.number for step in pipeline.STEPS if step.func is pipeline.drop_redundant)
+
+
+def test_fingerprint_follows_helpers_in_other_modules(monkeypatch):
+    save_step = pipeline.STEPS[-1]
+    before = pipeline.step_fingerprint(save_step)
+    assert "def save_preprocessed" in before
+    monkeypatch.setattr(dataset_io, "DTYPE_PLAN", dict(dataset_io.DTYPE_PLAN, Street="category"))
+    assert pipeline.step_fingerprint(save_step) != before
+
+
+def test_constant_fingerprint_handles_values_json_cannot_encode():
+    assert pipeline.constant_fingerprint("PATHS", {"csv": dataset_io.csv_export_path}) == \
+        'PATHS={"csv": "dataset_io.csv_export_path"}'
+    assert pipeline.constant_fingerprint("PAIRS", {(1, 2): 3}) == "PAIRS=<dict>"
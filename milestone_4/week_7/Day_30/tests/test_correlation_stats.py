@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import preprocessing_pipeline as pipeline
+from conftest import synthetic_accidents
+from correlation_stats import CorrelationAccumulator, correlation_path, saved_correlations
+from dataset_io import load_preprocessed
+
+COLUMNS = ["Temperature(F)", "Humidity(%)", "Wind_Chill(F)", "Wind_Speed(mph)", "Severity"]
+
+
+def test_merged_chunks_match_a_single_pass_and_pairwise_corr():
+    df = synthetic_accidents(humidity_missing=0.1)[COLUMNS]
+    single = CorrelationAccumulator().update(df)
+    merged = CorrelationAccumulator()
+    for start in range(0, len(df), 700):
+        # Each chunk has its own shift, so merging re-centres the sums
+        merged.merge(CorrelationAccumulator().update(df.iloc[start:start + 700]))
+
+    expected = df.corr()
+    pd.testing.assert_frame_equal(single.corr(), expected, rtol=1e-9)
+    pd.testing.assert_frame_equal(merged.corr(), expected, rtol=1e-9)
+    np.testing.assert_allclose(merged.n, single.n)
+
+
+def test_pipeline_saves_sums_matching_its_output(raw_csv, tmp_path):
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(raw_csv, output, chunksize=700)
+    saved = saved_correlations(output)
+    assert saved is not None and correlation_path(output).endswith(".corr.npz")
+    df = load_preprocessed(output, columns=saved.columns)
+    pd.testing.assert_frame_equal(saved.corr(), df.astype(float).corr(), rtol=1e-6, atol=1e-9)
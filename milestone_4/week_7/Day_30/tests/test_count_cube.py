@@ -0,0 +1,28 @@
+import preprocessing_pipeline as pipeline
+from count_cube import CountCube, cube_path, saved_cubes
+from dataset_io import load_preprocessed
+
+
+def test_chunked_cube_matches_a_single_pass_and_groupby(raw_csv, tmp_path):
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(raw_csv, output, chunksize=700)
+    df = load_preprocessed(output)
+    axes = ["Month", "State", "Severity"]
+
+    single = CountCube(axes).update(df)
+    # Chunks introduce states and severities in a different order than the whole frame
+    chunked = CountCube(axes)
+    for start in reversed(range(0, len(df), 500)):
+        chunked.update(df.iloc[start:start + 500])
+    assert chunked.labels == single.labels
+    assert (chunked.data == single.data).all()
+
+    expected = df.groupby(["State", "Severity"], observed=True).size()
+    counts = single.counts(["State", "Severity"])
+    assert counts[counts > 0].to_dict() == expected.to_dict()
+    assert single.total(where={"Severity": [3, 4], "State": "CA"}) == \
+        int((df["Severity"].isin([3, 4]) & (df["State"] == "CA")).sum())
+
+    saved = saved_cubes(output)
+    assert cube_path(output).endswith(".cube.npz")
+    assert saved["time"].counts("Hour").sum() == len(df)
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dataset_cache import DatasetCache
+from dataset_io import load_preprocessed, save_preprocessed
+
+
+@pytest.fixture
+def saved(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    save_preprocessed(pd.DataFrame({"Severity": [2, 3, 4], "State": ["CA", "TX", "CA"],
+                                    "Latitude": [34.1, 29.7, 37.8], "City": ["a", "b", "c"]}), path)
+    return path
+
+
+def test_cached_frames_are_read_only_but_extendable(saved):
+    cache = DatasetCache()
+    df = cache.get(saved, load_preprocessed)
+    for col, value in [("Severity", 1), ("Latitude", 0.0), ("State", "TX")]:
+        with pytest.raises(ValueError, match="read-only"):
+            df.loc[0, col] = value
+
+    df["Latitude"] = df["Latitude"] + 1
+    df["Zone"] = "x"
+    again = cache.get(saved, load_preprocessed)
+    assert again["Latitude"].tolist() == [34.1, 29.7, 37.8] and "Zone" not in again
+    assert again["State"].tolist() == ["CA", "TX", "CA"]
+
+
+def test_rewritten_file_is_reloaded(saved):
+    cache = DatasetCache()
+    assert len(cache.get(saved, load_preprocessed)) == 3
+    save_preprocessed(pd.DataFrame({"Severity": [1], "State": ["NY"]}), saved)
+    os.utime(saved, ns=(1, 1))
+    assert cache.get(saved, load_preprocessed)["State"].tolist() == ["NY"]
+
+
+def test_columns_are_read_once_and_assembled_on_request(saved):
+    cache, reads = DatasetCache(), []
+
+    def loader(path, columns=None):
+        reads.append(list(columns))
+        return load_preprocessed(path, columns=columns)
+
+    assert cache.get_columns(saved, ["Severity"], loader).columns.tolist() == ["Severity"]
+    df = cache.get_columns(saved, ["State", "Severity"], loader)
+    assert reads == [["Severity"], ["State"]]
+    pd.testing.assert_frame_equal(df, load_preprocessed(saved, columns=["State", "Severity"]))
+    with pytest.raises(ValueError, match="read-only"):
+        df.loc[0, "State"] = "TX"
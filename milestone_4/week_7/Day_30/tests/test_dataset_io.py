@@ -0,0 +1,33 @@
+import gzip
+
+import pandas as pd
+
+from dataset_io import compressed_copy, csv_export_path, load_preprocessed, save_preprocessed
+
+
+def test_parquet_and_csv_exports_load_with_the_same_dtypes(tmp_path):
+    df = pd.DataFrame({"Severity": [2, 3, 4], "State": ["CA", "TX", "CA"], "Stop": [0, 1, 0],
+                       "Temperature(F)": [55.0, 61.5, 70.25], "Latitude": [34.1, 29.7, 37.8]})
+    path = str(tmp_path / "out.parquet")
+    saved = save_preprocessed(df, path, export_csv=True)
+
+    parquet, csv = load_preprocessed(path), load_preprocessed(csv_export_path(path))
+    assert parquet["State"].dtype == "category" and parquet["Stop"].dtype == "int8"
+    assert parquet["Severity"].dtype == "int8" and parquet["Temperature(F)"].dtype == "float32"
+    pd.testing.assert_frame_equal(parquet, saved)
+    pd.testing.assert_frame_equal(csv, parquet, check_categorical=False)
+
+
+def test_partial_read_stops_after_nrows(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    save_preprocessed(pd.DataFrame({"Severity": range(10), "State": ["CA"] * 10}), path)
+    assert load_preprocessed(path, nrows=4)["Severity"].tolist() == [0, 1, 2, 3]
+
+
+def test_compressed_copy_round_trips_and_is_reused(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    save_preprocessed(pd.DataFrame({"Severity": range(100), "State": ["CA", "TX"] * 50}), path)
+    target = compressed_copy(path, "gzip")
+    with gzip.open(target, "rb") as f, open(path, "rb") as original:
+        assert f.read() == original.read()
+    assert compressed_copy(path, "gzip") == target and compressed_copy(path) == path
@@ -0,0 +1,33 @@
+import numpy as np
+
+from conftest import synthetic_accidents
+from dataset_profile import DatasetProfiler
+
+
+def profile(df, chunksize):
+    profiler = DatasetProfiler()
+    for start in range(0, len(df), chunksize):
+        profiler.update(df.iloc[start:start + chunksize])
+    return profiler.result()
+
+
+def test_chunked_profile_matches_a_single_pass():
+    df = synthetic_accidents()
+    single, chunked = profile(df, len(df)), profile(df, 1_000)
+    assert chunked["missing_blocks"] == single["missing_blocks"]
+    for col, info in single["columns"].items():
+        other = chunked["columns"][col]
+        assert (other["dtype"], other["nulls"], other["top"]) == (info["dtype"], info["nulls"], info["top"])
+        if info["describe"] is not None:
+            np.testing.assert_allclose(list(other["describe"].values()), list(info["describe"].values()))
+
+    severity = single["columns"]["Severity"]
+    assert severity["top"] == [[int(value), int(count)] for value, count in df["Severity"].value_counts().items()]
+    np.testing.assert_allclose(severity["describe"]["std"], df["Severity"].std())
+
+
+def test_high_cardinality_columns_are_not_counted(monkeypatch):
+    monkeypatch.setattr("dataset_profile.TRACKED_VALUES", 100)
+    columns = profile(synthetic_accidents(), 500)["columns"]
+    assert columns["ID"]["top"] is None
+    assert columns["Severity"]["top"] is not None
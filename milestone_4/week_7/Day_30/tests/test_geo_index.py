@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo_index import GeoIndex
+
+
+@pytest.fixture(params=[0.0, 0.01], ids=["located", "some-unlocated"])
+def frame(request):
+    rng = np.random.default_rng(0)
+    n = 5_000
+    lat = rng.uniform(25, 48, n)
+    lat[rng.random(n) < request.param] = np.nan
+    return pd.DataFrame({"Latitude": lat, "Longitude": rng.uniform(-124, -70, n),
+                         "State": pd.Categorical(rng.choice(["CA", "TX", "NY"], n)),
+                         "City": rng.choice([f"City{i}" for i in range(30)], n),
+                         "Severity": rng.choice([1, 2, 3, 4], n).astype("int8")})
+
+
+def expected(df, state=None, city=None, severity=None, bbox=None):
+    mask = df["Latitude"].notna() & df["Longitude"].notna()
+    for col, value in (("State", state), ("City", city), ("Severity", severity)):
+        if value is not None:
+            mask &= df[col] == value
+    if bbox is not None:
+        lat_min, lat_max, lng_min, lng_max = bbox
+        mask &= df["Latitude"].between(lat_min, lat_max) & df["Longitude"].between(lng_min, lng_max)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.mark.parametrize("filters", [
+    {}, {"state": "TX"}, {"state": "CA", "city": "City3"}, {"severity": 4},
+    {"bbox": (30, 35.5, -100, -90.25)}, {"state": "NY", "severity": 2, "bbox": (25, 40, -124, -80)},
+])
+def test_rows_match_boolean_masks(frame, filters):
+    rows = GeoIndex(frame).rows(**filters)
+    assert np.array_equal(np.sort(rows), expected(frame, **filters))
+
+
+def test_values_follow_the_filters(frame):
+    index = GeoIndex(frame)
+    located = frame.dropna(subset=["Latitude"])
+    assert index.values("City", state="CA") == sorted(located.loc[located["State"] == "CA", "City"].unique())
@@ -0,0 +1,44 @@
+import doctest
+
+import numpy as np
+import pandas as pd
+
+import heavy_hitters
+from heavy_hitters import SpaceSaving
+
+
+def chunked(values, chunksize, capacity):
+    sketch = SpaceSaving(capacity)
+    for start in range(0, len(values), chunksize):
+        sketch.update(values[start:start + chunksize])
+    return sketch
+
+
+def test_docstring_examples():
+    assert doctest.testmod(heavy_hitters).failed == 0
+
+
+def test_chunked_updates_match_value_counts_within_capacity():
+    values = pd.Series(np.random.default_rng(0).zipf(1.6, 20_000) % 40)
+    sketch = chunked(values, 250, capacity=40)
+    assert sketch.exact
+    pd.testing.assert_series_equal(sketch.counts.sort_index(), values.value_counts().sort_index(),
+                                   check_names=False)
+
+
+def test_full_chunks_add_nothing_to_values_they_lack():
+    sketch = SpaceSaving(capacity=3).update(pd.Series(["a"] * 10))
+    for start in range(0, 30, 3):
+        # Each chunk fills the capacity with values that occur once
+        sketch.update(pd.Series([f"v{i}" for i in range(start, start + 3)]))
+    assert (sketch.counts["a"], sketch.errors["a"]) == (10, 0)
+
+
+def test_counts_bound_the_truth_once_values_are_evicted():
+    values = pd.Series(np.random.default_rng(1).zipf(1.4, 50_000) % 2_000)
+    merged = SpaceSaving(50)
+    for start in range(0, len(values), 1_000):
+        merged.merge(chunked(values[start:start + 1_000], 100, capacity=50))
+    truth = values.value_counts().reindex(merged.counts.index)
+    assert (merged.counts >= truth).all() and (merged.counts - merged.errors <= truth).all()
+    assert merged.counts.idxmax() == values.value_counts().idxmax()
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency, pearsonr, ttest_ind
+
+from conftest import synthetic_accidents
+from correlation_stats import CorrelationAccumulator
+from dataset_io import save_preprocessed
+from hypothesis_stats import severity_crosstabs, ttest_from_counts
+
+
+def test_tests_from_counts_match_scipy_on_the_rows(tmp_path):
+    df = synthetic_accidents()[["Severity", "Stop", "State"]]
+    path = str(tmp_path / "out.parquet")
+    save_preprocessed(df, path)
+    tables = severity_crosstabs({"stop": ("Stop", None), "state": ("State", None)}, path)
+
+    t, p = ttest_from_counts(tables["stop"], 1, 0)
+    expected = ttest_ind(df.loc[df["Stop"] == 1, "Severity"], df.loc[df["Stop"] == 0, "Severity"])
+    np.testing.assert_allclose([t, p], [expected.statistic, expected.pvalue])
+
+    crosstab = pd.crosstab(df["State"], df["Severity"])
+    np.testing.assert_allclose(chi2_contingency(tables["state"])[:2], chi2_contingency(crosstab)[:2])
+
+
+def test_pearson_from_merged_sums_matches_pearsonr():
+    df = synthetic_accidents(humidity_missing=0.1)[["Humidity(%)", "Temperature(F)", "Severity"]]
+    acc = CorrelationAccumulator()
+    for start in range(0, len(df), 700):
+        acc.merge(CorrelationAccumulator().update(df.iloc[start:start + 700]))
+
+    paired = df[["Humidity(%)", "Severity"]].dropna()
+    r, p, n = acc.pearson("Humidity(%)", "Severity")
+    expected = pearsonr(paired["Humidity(%)"], paired["Severity"])
+    assert n == len(paired)
+    np.testing.assert_allclose([r, p], [expected.statistic, expected.pvalue], rtol=1e-6)
@@ -0,0 +1,65 @@
+import os
+
+import pandas as pd
+import pytest
+
+import preprocessing_pipeline as pipeline
+from conftest import synthetic_accidents
+from dataset_io import PreprocessedWriter, csv_export_path, load_preprocessed
+
+
+@pytest.fixture
+def extracts(tmp_path):
+    """A history file and a later extract whose first 100 IDs repeat the history's last ones"""
+    history, extract = str(tmp_path / "history.csv"), str(tmp_path / "extract.csv")
+    synthetic_accidents(n=2_000, seed=0).to_csv(history, index=False)
+    synthetic_accidents(n=600, seed=1, id_offset=1_900).to_csv(extract, index=False)
+    return history, extract
+
+
+def test_append_keeps_history_and_matches_between_modes(extracts, tmp_path):
+    history, extract = extracts
+    outputs = []
+    for name, run in [("memory", pipeline.run_pipeline),
+                      ("chunked", lambda raw, out: pipeline.run_chunked_pipeline(raw, out, chunksize=500))]:
+        output = str(tmp_path / f"{name}.parquet")
+        run(history, output)
+        before = load_preprocessed(output)
+        ctx = pipeline.run_incremental_pipeline(extract, output, chunksize=250)
+        after = load_preprocessed(output)
+        assert 0 < ctx["rows_written"] == len(after) - len(before)
+        pd.testing.assert_frame_equal(after.iloc[:len(before)], before)
+        outputs.append(after.iloc[len(before):].reset_index(drop=True))
+    pd.testing.assert_frame_equal(outputs[1], outputs[0], check_exact=False, rtol=1e-6)
+
+
+def test_repeated_extract_adds_nothing(extracts, tmp_path):
+    history, extract = extracts
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(history, output, chunksize=500)
+    pipeline.run_incremental_pipeline(extract, output)
+    assert pipeline.run_incremental_pipeline(extract, output)["rows_written"] == 0
+
+
+def test_failed_append_leaves_outputs_unchanged(extracts, tmp_path, monkeypatch):
+    history, extract = extracts
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(history, output, chunksize=500, export_csv=True)
+    snapshot = {path: open(path, "rb").read() for path in (output, csv_export_path(output))}
+
+    write = PreprocessedWriter.write
+    calls = []
+
+    def failing_write(self, df):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return write(self, df)
+
+    monkeypatch.setattr(PreprocessedWriter, "write", failing_write)
+    with pytest.raises(RuntimeError):
+        pipeline.run_incremental_pipeline(extract, output, export_csv=True, chunksize=200)
+
+    for path, content in snapshot.items():
+        assert open(path, "rb").read() == content
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+import preprocessing_pipeline as pipeline
+from conftest import synthetic_accidents
+from dataset_io import load_preprocessed
+
+
+def run_both(raw_path, tmp_path, chunksize=700):
+    """Outputs of the in-memory and chunked modes for the same raw file"""
+    in_memory, chunked = str(tmp_path / "memory.parquet"), str(tmp_path / "chunked.parquet")
+    pipeline.run_pipeline(raw_path, in_memory)
+    pipeline.run_chunked_pipeline(raw_path, chunked, chunksize=chunksize)
+    return load_preprocessed(in_memory), load_preprocessed(chunked)
+
+
+def test_chunked_matches_in_memory(raw_csv, tmp_path):
+    expected, result = run_both(raw_csv, tmp_path)
+    assert len(result) == len(expected) > 0
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize("humidity_missing", [0.10, 0.30])
+def test_chunked_matches_in_memory_with_missing_regression_features(tmp_path, humidity_missing):
+    # Humidity is then imputed (or dropped) instead of row-filtered in step 8, so some Wind_Chill
+    # rows cannot be regressed and must fall back to the median in both modes
+    raw_path = str(tmp_path / "raw.csv")
+    synthetic_accidents(humidity_missing=humidity_missing).to_csv(raw_path, index=False)
+    expected, result = run_both(raw_path, tmp_path)
+    assert len(result) == len(expected) > 0
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-6)
+
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import QuantileSketch
+
+
+def merged(values, chunksize, **kwargs):
+    sketch = QuantileSketch(**kwargs)
+    for start in range(0, len(values), chunksize):
+        sketch.merge(QuantileSketch(**kwargs).update(values[start:start + chunksize]))
+    return sketch
+
+
+def test_exact_while_distinct_values_fit():
+    values = pd.Series(np.random.default_rng(0).integers(0, 500, 10_001).astype(float))
+    values[::7] = np.nan
+    sketch = merged(values, 999)
+    assert sketch.exact and sketch.count == values.notna().sum()
+    for q in (0.0, 0.1, 0.25, 0.5, 0.75, 0.99, 1.0):
+        assert sketch.quantile(q) == values.quantile(q)
+    assert sketch.median() == merged(values, len(values)).median() == values.median()
+
+
+def test_compressed_merge_matches_a_single_pass():
+    # Long-tailed like Duration_Minutes, with far more distinct values than centroids
+    values = np.random.default_rng(1).lognormal(3, 1.2, 200_000)
+    single = QuantileSketch(max_centroids=2_000).update(values)
+    chunked = merged(values, 10_000, max_centroids=2_000)
+    assert not chunked.exact and len(chunked.means) <= 2_000
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        expected = np.quantile(values, q)
+        # Rank error well under 0.5% of the rows on both paths
+        for sketch in (single, chunked):
+            assert abs((values <= sketch.quantile(q)).mean() - (values <= expected).mean()) < 0.005
+    assert (chunked.min, chunked.max) == (values.min(), values.max())
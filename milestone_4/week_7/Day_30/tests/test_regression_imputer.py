@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from conftest import synthetic_accidents
+from regression_imputer import RegressionImputer
+
+TARGET, FEATURES = "Wind_Chill(F)", ["Wind_Speed(mph)", "Temperature(F)", "Humidity(%)"]
+
+
+def test_merged_chunks_match_a_single_pass():
+    df = synthetic_accidents(humidity_missing=0.1)
+    single = RegressionImputer(TARGET, FEATURES).partial_fit(df).solve()
+
+    merged = RegressionImputer(TARGET, FEATURES)
+    for start in range(0, len(df), 700):
+        merged.merge(RegressionImputer(TARGET, FEATURES).partial_fit(df.iloc[start:start + 700]))
+    merged.solve()
+
+    known = df[FEATURES + [TARGET]].dropna()
+    X = np.column_stack([np.ones(len(known)), known[FEATURES].to_numpy()])
+    beta = np.linalg.lstsq(X, known[TARGET].to_numpy(), rcond=None)[0]
+    for imputer in (single, merged):
+        assert imputer.n_rows == len(known)
+        np.testing.assert_allclose([imputer.intercept_, *imputer.coef_], beta, rtol=1e-6)
+
+
+def test_deferred_feature_matches_filling_first():
+    df = synthetic_accidents(humidity_missing=0.1)
+    fill = {"Humidity(%)": 55.0}
+    deferred = RegressionImputer(TARGET, FEATURES, deferred=fill).partial_fit(df).solve(fill)
+    filled = RegressionImputer(TARGET, FEATURES).partial_fit(df.fillna(fill)).solve()
+    np.testing.assert_allclose(deferred.coef_, filled.coef_, rtol=1e-6)
+    np.testing.assert_allclose(deferred.intercept_, filled.intercept_, rtol=1e-6)
+
+
+def test_transform_falls_back_where_a_feature_is_missing():
+    df = pd.DataFrame({TARGET: [np.nan, np.nan, 1.0], "x": [2.0, np.nan, 3.0]})
+    imputer = RegressionImputer.from_dict(TARGET, {"features": ["x"], "intercept": 1.0,
+                                                   "coef": [2.0], "fallback": -7.0})
+    assert imputer.transform(df) == 2
+    assert df[TARGET].tolist() == [5.0, -7.0, 1.0]
@@ -0,0 +1,32 @@
+import pandas as pd
+
+import sampling
+from sampling import load_sample, reservoir_sample
+
+
+def test_sample_is_seeded_and_independent_of_chunk_size(raw_csv, monkeypatch):
+    whole = reservoir_sample(raw_csv, size=200, columns=["ID", "Severity"])
+    monkeypatch.setattr(sampling, "CHUNK_ROWS", 170)
+    chunked = reservoir_sample(raw_csv, size=200, columns=["ID", "Severity"])
+    assert len(whole) == 200
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert not reservoir_sample(raw_csv, size=200, seed=7, columns=["ID"])["ID"].equals(whole["ID"])
+
+
+def test_strata_get_their_quotas(raw_csv):
+    raw = pd.read_csv(raw_csv)
+    sample = reservoir_sample(raw_csv, strata="Severity", quotas={1: 5, 4: 20})
+    assert sample["Severity"].value_counts().to_dict() == {4: 20, 1: min(5, (raw["Severity"] == 1).sum())}
+
+    by_year = reservoir_sample(raw_csv, size=10, strata="Year", columns=["ID"])
+    years = pd.to_numeric(raw["Start_Time"].str[:4], errors="coerce").value_counts()
+    assert len(by_year) == sum(min(10, count) for count in years)
+    assert set(by_year["ID"]) <= set(raw["ID"])
+
+
+def test_load_sample_reuses_the_saved_artifact(raw_csv, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The source hash is memoised in the default cache directory
+    sample_dir = str(tmp_path / "samples")
+    first = load_sample(raw_csv, size=50, strata="State", sample_dir=sample_dir)
+    monkeypatch.setattr(sampling, "reservoir_sample", None)
+    pd.testing.assert_frame_equal(load_sample(raw_csv, size=50, strata="State", sample_dir=sample_dir), first)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from scatter_density import class_grids, density_sample
+
+
+def test_class_grids_count_every_row_once():
+    rng = np.random.default_rng(0)
+    x, y, classes = rng.normal(size=10_000), rng.exponential(size=10_000), rng.choice([1, 2, 4], 10_000)
+    levels, grids, _, _ = class_grids(x, y, classes, bins=20)
+    assert levels.tolist() == [1, 2, 4]
+    assert grids.sum(axis=(1, 2)).tolist() == [int((classes == level).sum()) for level in levels]
+
+
+def test_density_sample_gives_each_class_its_quota():
+    rng = np.random.default_rng(0)
+    classes = np.where(rng.random(50_000) < 0.01, 4, 2)
+    rows = density_sample(rng.normal(size=50_000), rng.normal(size=50_000), classes, n=1_000)
+    assert len(np.unique(rows)) == len(rows)
+    assert (classes[rows] == 4).sum() == min(500, (classes == 4).sum())
+    assert (classes[rows] == 2).sum() == 500
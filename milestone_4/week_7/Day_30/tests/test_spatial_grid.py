@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from spatial_grid import CELL_DEG, GridAccumulator, aggregate_cells, label_hotspots
+
+
+def accidents(seed=0):
+    """Two dense clusters 1 km cells apart, plus scattered background accidents"""
+    rng = np.random.default_rng(seed)
+    parts = [pd.DataFrame({"Latitude": rng.uniform(30.0, 30.03, 600), "Longitude": rng.uniform(-97.0, -96.97, 600)}),
+             pd.DataFrame({"Latitude": rng.uniform(40.0, 40.02, 300), "Longitude": rng.uniform(-75.0, -74.98, 300)}),
+             pd.DataFrame({"Latitude": rng.uniform(25, 48, 200), "Longitude": rng.uniform(-124, -70, 200)})]
+    df = pd.concat(parts, ignore_index=True)
+    return df.assign(Severity=rng.choice([2, 3], len(df)), State="TX")
+
+
+def test_merged_chunks_match_a_single_pass():
+    df = accidents()
+    single = GridAccumulator().update(df)
+    chunked = GridAccumulator()
+    for start in range(0, len(df), 137):
+        chunked.update(df.iloc[start:start + 137])
+
+    keys = ["Severity", "State", "cell"]
+    expected = single.cells.sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(chunked.cells.sort_values(keys, ignore_index=True), expected)
+    assert expected["count"].sum() == len(df)
+    pd.testing.assert_frame_equal(chunked.hotspot_table(), single.hotspot_table())
+
+
+def test_connected_dense_cells_form_one_hotspot():
+    df = accidents()
+    hotspots = label_hotspots(aggregate_cells(df), min_count=5)
+    assert len(hotspots) == 2
+    top = hotspots.iloc[0]
+    cluster = df.iloc[:600]
+    assert top["accident_count"] <= 600
+    assert abs(top["latitude"] - cluster["Latitude"].mean()) < CELL_DEG
+    assert abs(top["longitude"] - cluster["Longitude"].mean()) < CELL_DEG
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import tile_pyramid
+from spatial_grid import CELL_DEG, aggregate_cells
+from tile_pyramid import LEVELS, TilePyramid, level_for_zoom, raw_pyramid
+
+
+def accidents(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Latitude": rng.normal(37, 3, n), "Longitude": rng.normal(-95, 10, n),
+                         "Severity": rng.choice([1, 2, 3, 4], n), "State": rng.choice(["CA", "TX"], n)})
+
+
+def test_every_level_keeps_the_counts_and_centroid():
+    df = accidents()
+    pyramid = TilePyramid(aggregate_cells(df, keys=("Severity", "State")), keys=("Severity", "State"))
+    assert len(pyramid.levels) == LEVELS
+    for level in pyramid.levels:
+        assert level["count"].sum() == len(df)
+        np.testing.assert_allclose(level["lat_sum"].sum(), df["Latitude"].sum())
+
+    tiles = pyramid.tiles(zoom=4, filters={"State": "CA"})
+    ca = df[df["State"] == "CA"]
+    assert tiles["accidents"].sum() == len(ca)
+    severity_cols = [f"Severity {s}" for s in (1, 2, 3, 4)]
+    assert (tiles[severity_cols].sum(axis=1) == tiles["accidents"]).all()
+    assert tiles.attrs["cell_deg"] == CELL_DEG * 2 ** level_for_zoom(4)
+
+
+def test_marker_budget_moves_to_a_coarser_level():
+    pyramid = TilePyramid(aggregate_cells(accidents(), keys=("Severity",)))
+    fine = pyramid.tiles(zoom=14)
+    bounded = pyramid.tiles(zoom=14, max_markers=500)
+    assert len(bounded) <= 500 < len(fine)
+    assert bounded.attrs["cell_deg"] > fine.attrs["cell_deg"]
+    assert bounded["accidents"].sum() == fine["accidents"].sum()
+
+
+def test_raw_pyramid_matches_in_memory_cells(raw_csv, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The source hash is memoised in the default cache directory
+    monkeypatch.setattr(tile_pyramid, "CHUNK_ROWS", 700)
+    raw = pd.read_csv(raw_csv).dropna(subset=["Start_Lat", "Start_Lng"])
+    pyramid = raw_pyramid(raw_csv, keys=("Severity",), tile_dir=str(tmp_path / "tiles"))
+    expected = aggregate_cells(raw, keys=("Severity",), lat="Start_Lat", lng="Start_Lng")
+    assert pyramid.levels[0]["count"].sum() == expected["count"].sum() == len(raw)
+    again = raw_pyramid(raw_csv, keys=("Severity",), tile_dir=str(tmp_path / "tiles"))
+    pd.testing.assert_frame_equal(again.levels[0], pyramid.levels[0])
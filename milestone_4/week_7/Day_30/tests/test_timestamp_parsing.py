@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from timestamp_parsing import calendar_fields, parse_timestamps
+
+
+def test_mixed_layouts_parse_like_pandas_mixed_format():
+    values = pd.Series(["2016-02-08 05:46:00", "2019-06-12 10:10:56.000000000", "06/12/2019 10:10:56",
+                        "06/12/2019 10:10", "garbage", None] * 400)
+    expected = pd.to_datetime(values, format="mixed", errors="coerce")
+    pd.testing.assert_series_equal(parse_timestamps(values), expected)
+    pd.testing.assert_series_equal(parse_timestamps(values, workers=2), expected)
+
+
+def test_calendar_fields_match_the_dt_accessor():
+    start = pd.Series(pd.date_range("1999-12-31 22:30", periods=500, freq="7h13min"))
+    end = start + pd.to_timedelta(np.arange(500), unit="min")
+    fields = calendar_fields(start, end)
+    assert (fields["Year"] == start.dt.year).all() and (fields["Month"] == start.dt.month).all()
+    assert (fields["Hour"] == start.dt.hour).all() and (fields["DayOfWeek"] == start.dt.dayofweek).all()
+    assert np.array_equal(fields["Duration_Minutes"], np.arange(500))
@@ -0,0 +1,52 @@
+import pandas as pd
+
+import preprocessing_pipeline as pipeline
+from conftest import synthetic_accidents
+from weather_taxonomy import (WEATHER_GROUPS, WeatherTable, load_weather_table, saved_weather_table, weather_group,
+                              weather_groups)
+
+
+def test_conditions_fall_into_the_first_matching_group():
+    expected = {"Fair": "Clear", "Light Rain": "Rain", "Drizzle": "Rain", "Thunderstorm": "Storm",
+                "Heavy T-Storm": "Storm", "Light Freezing Rain": "Snow/Ice", "Light Snow / Fog": "Snow/Ice",
+                "Rain / Windy": "Rain", "Haze": "Fog/Haze", "Overcast": "Cloudy", "Windy": "Other"}
+    assert {condition: weather_group(condition) for condition in expected} == expected
+
+
+def test_weather_groups_are_categorical_and_keep_missing_values():
+    conditions = pd.Series(["Fair", None, "Light Rain", "Fair"], index=[10, 11, 12, 13])
+    groups = weather_groups(conditions)
+    assert list(groups.cat.categories) == WEATHER_GROUPS
+    assert groups.index.equals(conditions.index)
+    assert groups.isna().tolist() == [False, True, False, False]
+    assert groups.dropna().tolist() == ["Clear", "Rain", "Clear"]
+
+
+def test_merged_chunks_match_a_single_pass():
+    df = synthetic_accidents()
+    chunked = WeatherTable()
+    for start in range(0, len(df), 700):
+        chunked.update(df.iloc[start:start + 700])
+    pd.testing.assert_frame_equal(chunked.table(), WeatherTable().update(df).table())
+
+
+def test_saved_lookup_agrees_with_the_preprocessed_rows(raw_csv, tmp_path):
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(raw_csv, output, chunksize=700)
+    saved = saved_weather_table(output)
+    assert saved is not None
+
+    rows = pd.read_parquet(output, columns=["Weather_Condition", "Weather_Group"]).dropna().astype(str)
+    lookup = saved.table().set_index("Weather_Condition")["Weather_Group"]
+    assert set(lookup.index) == set(rows["Weather_Condition"])
+    assert (rows["Weather_Condition"].map(lookup) == rows["Weather_Group"]).all()
+    pd.testing.assert_frame_equal(load_weather_table(output), saved.table())
+
+
+def test_lookup_is_rebuilt_when_the_output_changes(raw_csv, tmp_path):
+    output = str(tmp_path / "out.parquet")
+    pipeline.run_chunked_pipeline(raw_csv, output, chunksize=700)
+    pd.read_parquet(output).query("Weather_Condition != 'Fair'").to_parquet(output, index=False)
+    assert saved_weather_table(output) is None
+    assert "Fair" not in set(load_weather_table(output)["Weather_Condition"])
+    assert saved_weather_table(output) is not None
@@ -0,0 +1,127 @@
+"""Multi-resolution pyramid of aggregated accident cells for map views.
+
+Level 0 is the ~1 km grid of ``spatial_grid``, and each level above merges
+2 x 2 cells of the level below. Every cell of every level holds the
+accident count and coordinate sums per key (e.g. Severity and State). A map
+at a given zoom draws one marker per cell of the level whose cells are
+about ``CELL_PX`` pixels wide:
+- Markers sit at each cell's count-weighted centroid, sized by its count.
+  Sparse rural cells stay visible and dense cities do not over-plot.
+- The severity mix of each cell is reported per marker.
+- When a level would still exceed ``MAX_MARKERS`` cells, the next coarser
+  one is used, so the payload stays bounded at any zoom.
+
+Raw points are only worth sending at street level (``STREET_ZOOM``), for
+the rows inside the viewport.
+
+The pyramid of the preprocessed dataset is derived from its saved grid.
+Raw files get a base cell table built in one streaming pass, saved under
+``DEFAULT_TILE_DIR`` and keyed by the file's content hash.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from checkpoint_cache import DEFAULT_CACHE_DIR, CheckpointCache
+from dataset_io import PREPROCESSED_PATH
+from spatial_grid import CELL_DEG, N_COLS, aggregate_cells, load_grid, merge_cells
+
+LEVELS = 9              # level k cells are CELL_DEG * 2**k degrees (0.01° to 2.56°)
+TILE_PX = 256           # web map tiles: 360 / 2**zoom degrees of longitude per 256 pixels
+CELL_PX = 8
+MAX_MARKERS = 20_000
+STREET_ZOOM = 12
+VIEWPORT_PX = (1200, 600)
+DEFAULT_TILE_DIR = "data/.tiles"
+CHUNK_ROWS = 500_000
+VALUE_COLUMNS = ["count", "lat_sum", "lng_sum"]
+
+
+def level_for_zoom(zoom):
+    """Pyramid level whose cells are about ``CELL_PX`` pixels wide at ``zoom``"""
+    cell_deg = 360 / 2 ** zoom / TILE_PX * CELL_PX
+    return int(np.clip(np.floor(np.log2(cell_deg / CELL_DEG)), 0, LEVELS - 1))
+
+
+def viewport_bbox(lat, lon, zoom, size_px=VIEWPORT_PX):
+    """(lat_min, lat_max, lng_min, lng_max) shown by a ``size_px`` map centred on (lat, lon)"""
+    deg_per_px = 360 / 2 ** zoom / TILE_PX
+    half_lng = deg_per_px * size_px[0] / 2
+    half_lat = deg_per_px * size_px[1] / 2 * np.cos(np.radians(lat))  # Mercator shrinks latitude spans
+    return lat - half_lat, lat + half_lat, lon - half_lng, lon + half_lng
+
+
+def _coarsen(cells, keys):
+    """Merge 2 x 2 blocks of cells into the cells of the next level"""
+    row, col = np.divmod(cells["cell"].to_numpy(), N_COLS)
+    return merge_cells(cells.assign(cell=(row // 2) * N_COLS + col // 2), keys=keys)
+
+
+class TilePyramid:
+    def __init__(self, cells, keys=("Severity",)):
+        """``cells``: level-0 table of ``keys``, cell, count, lat_sum and lng_sum (see ``aggregate_cells``)"""
+        self.keys = list(keys)
+        self.levels = [merge_cells(cells, keys=self.keys)]
+        for _ in range(1, LEVELS):
+            self.levels.append(_coarsen(self.levels[-1], self.keys))
+
+    @property
+    def nbytes(self):
+        return sum(int(level.memory_usage(deep=True).sum()) for level in self.levels)
+
+    def tiles(self, zoom=None, by=(), filters=None, max_markers=MAX_MARKERS):
+        """One row per cell of the level matching ``zoom`` (the finest level when None).
+
+        ``filters`` maps key columns to the value to keep. Cells are split by the
+        ``by`` keys, and each gets its accident count, centroid and, when
+        Severity is a key, one ``Severity <level>`` count per severity.
+        ``result.attrs["cell_deg"]`` is the cell size used.
+        """
+        level = 0 if zoom is None else level_for_zoom(zoom)
+        while True:
+            table = self.levels[level]
+            for col, value in (filters or {}).items():
+                table = table[table[col] == value]
+            tiles = merge_cells(table, keys=by)
+            if len(tiles) <= max_markers or level == LEVELS - 1:
+                break
+            level += 1
+
+        result = tiles.assign(latitude=tiles["lat_sum"] / tiles["count"],
+                              longitude=tiles["lng_sum"] / tiles["count"],
+                              accidents=tiles["count"])
+        if "Severity" in self.keys and "Severity" not in by:
+            mix = table.groupby(list(by) + ["cell", "Severity"], observed=True)["count"].sum().unstack(fill_value=0)
+            mix.columns = [f"Severity {severity}" for severity in mix.columns]
+            result = result.join(mix, on=list(by) + ["cell"])
+        result = result.drop(columns=["cell"] + VALUE_COLUMNS).reset_index(drop=True)
+        result.attrs["cell_deg"] = CELL_DEG * 2 ** level
+        return result
+
+
+def load_pyramid(path=PREPROCESSED_PATH):
+    """Pyramid of the preprocessed dataset at ``path``, keyed by Severity and State, from its grid"""
+    return TilePyramid(load_grid(path).cells, keys=("Severity", "State"))
+
+
+def raw_pyramid(path, keys=("Severity", "State", "City"), lat="Start_Lat", lng="Start_Lng",
+                tile_dir=DEFAULT_TILE_DIR):
+    """Pyramid of a raw CSV; its level-0 cells are saved and reused while the file is unchanged"""
+    params = json.dumps({"source": CheckpointCache(DEFAULT_CACHE_DIR).file_hash(path), "keys": list(keys),
+                         "lat": lat, "lng": lng, "cell_deg": CELL_DEG}, sort_keys=True)
+    artifact = os.path.join(tile_dir, hashlib.sha256(params.encode()).hexdigest()[:24] + ".parquet")
+    if os.path.exists(artifact):
+        return TilePyramid(pd.read_parquet(artifact), keys)
+
+    cells = None
+    for chunk in pd.read_csv(path, usecols=list(keys) + [lat, lng], chunksize=CHUNK_ROWS):
+        chunk = chunk.dropna(subset=[lat, lng])
+        chunk_cells = aggregate_cells(chunk, keys=keys, lat=lat, lng=lng)
+        cells = chunk_cells if cells is None else merge_cells(cells, chunk_cells, keys=keys)
+    os.makedirs(tile_dir, exist_ok=True)
+    cells.to_parquet(artifact + ".tmp", index=False)
+    os.replace(artifact + ".tmp", artifact)
+    return TilePyramid(cells, keys)
@@ -0,0 +1,77 @@
+"""Fast parsing of the raw Start_Time/End_Time strings.
+
+The raw export mixes two layouts: "2016-02-08 05:46:00" and the same value
+with a fraction ("2019-06-12 10:10:56.000000000"). When pandas has to infer
+the format, the mix sends it down its slow per-element path, and the
+inferred format can differ between chunks. Here the dominant layout is
+detected from a sample and parsed with a fixed format. Both raw layouts are
+covered by pandas' vectorized ISO 8601 parser. Only the rows that format
+rejects are retried with the other known layouts (re-saved spreadsheet
+exports), and finally with a mixed-format parse.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+KNOWN_FORMATS = ["ISO8601", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M"]
+DETECT_SAMPLE_SIZE = 1_000
+
+
+def detect_format(values):
+    """Known format that parses the most of a sample of ``values``"""
+    sample = values.dropna().head(DETECT_SAMPLE_SIZE)
+    hits = [pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum() for fmt in KNOWN_FORMATS]
+    return KNOWN_FORMATS[int(np.argmax(hits))]
+
+
+def _parse_shard(values, fmt):
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    # Positions still unparsed; each fallback only sees what the previous ones rejected
+    retry = np.flatnonzero(parsed.isna().to_numpy() & values.notna().to_numpy())
+    for fallback in [other for other in KNOWN_FORMATS if other != fmt] + ["mixed"]:
+        if len(retry) == 0:
+            break
+        attempt = pd.to_datetime(values.iloc[retry], format=fallback, errors="coerce")
+        ok = attempt.notna().to_numpy()
+        parsed.iloc[retry[ok]] = attempt.to_numpy()[ok]
+        retry = retry[~ok]
+    return parsed
+
+
+def parse_timestamps(values, workers=1):
+    """Parse a Series of timestamp strings; unparseable entries become NaT.
+
+    With ``workers > 1`` the Series is split into contiguous shards parsed in
+    a process pool. The format is detected once, so every shard agrees.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    fmt = detect_format(values)
+    if workers <= 1 or len(values) < workers * DETECT_SAMPLE_SIZE:
+        return _parse_shard(values, fmt)
+
+    bounds = np.linspace(0, len(values), workers + 1, dtype=int)
+    shards = [values.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(workers) as pool:
+        return pd.concat(pool.map(_parse_shard, shards, [fmt] * len(shards)))
+
+
+def calendar_fields(start, end):
+    """Duration_Minutes, Year, Hour, DayOfWeek and Month from parsed timestamp Series.
+
+    Computed directly on the datetime64 arrays, already in the compact
+    dtypes of the storage plan. Values for NaT rows are meaningless; the
+    caller drops those rows.
+    """
+    start_values = start.to_numpy(dtype="datetime64[ns]")
+    end_values = end.to_numpy(dtype="datetime64[ns]")
+    days = start_values.astype("datetime64[D]").astype(np.int64)
+    months = start_values.astype("datetime64[M]").astype(np.int64)
+    return {
+        "Duration_Minutes": (end_values - start_values) / np.timedelta64(1, "m"),
+        "Year": (months // 12 + 1970).astype(np.int16),
+        "Hour": (start_values.astype("datetime64[h]").astype(np.int64) % 24).astype(np.int8),
+        "DayOfWeek": ((days + 3) % 7).astype(np.int8),  # 1970-01-01 was a Thursday (Monday=0)
+        "Month": (months % 12 + 1).astype(np.int8),
+    }
@@ -0,0 +1,131 @@
+"""Weather-condition taxonomy: raw Weather_Condition strings to a few groups.
+
+The raw data has well over 100 distinct conditions ("Light Rain",
+"Heavy T-Storm", "Rain / Windy", ...). Step 12 classifies each distinct
+string once and stores the result as the categorical ``Weather_Group``
+column. Parquet keeps it as integer codes plus a dictionary, so a
+rain/fog/clear filter compares codes instead of scanning strings.
+
+The first rule whose keyword occurs in the lower-cased condition wins.
+Precipitation rules come before visibility and sky rules, so "Rain / Windy"
+is Rain and "Light Snow / Fog" is Snow/Ice.
+
+The pipeline saves the lookup of every condition it grouped next to its
+output (``*.weather.json``), so pages can show which raw conditions make up
+each group without scanning the dataset.
+"""
+import json
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dataset_io import PREPROCESSED_PATH
+
+# (group, keywords), in priority order
+WEATHER_RULES = [
+    ("Storm", ["thunder", "t-storm", "tornado", "funnel cloud", "squall"]),
+    ("Snow/Ice", ["snow", "sleet", "ice", "freezing", "hail", "wintry", "graupel"]),
+    ("Rain", ["rain", "drizzle", "shower"]),
+    ("Fog/Haze", ["fog", "mist", "haze", "smoke", "dust", "sand", "ash"]),
+    ("Cloudy", ["cloud", "overcast"]),
+    ("Clear", ["clear", "fair"]),
+]
+OTHER_GROUP = "Other"
+WEATHER_GROUPS = [group for group, _ in WEATHER_RULES] + [OTHER_GROUP]
+
+
+def weather_group(condition):
+    """Group of one raw condition string"""
+    text = str(condition).lower()
+    for group, keywords in WEATHER_RULES:
+        if any(keyword in text for keyword in keywords):
+            return group
+    return OTHER_GROUP
+
+
+def group_table(conditions):
+    """Lookup table of distinct conditions and their group"""
+    distinct = pd.Series(pd.unique(pd.Series(conditions).dropna().astype(str)), name="Weather_Condition")
+    return pd.DataFrame({"Weather_Condition": distinct,
+                         "Weather_Group": distinct.map(weather_group)}).sort_values("Weather_Condition",
+                                                                                   ignore_index=True)
+
+
+def weather_groups(conditions):
+    """Categorical ``Weather_Group`` of a Series of conditions; each distinct string is classified once"""
+    codes, distinct = pd.factorize(conditions)
+    lookup = pd.Categorical([weather_group(condition) for condition in distinct], categories=WEATHER_GROUPS)
+    # Missing conditions (code -1) stay missing
+    group_codes = pd.Series(lookup.codes).reindex(codes).fillna(-1).astype("int8").to_numpy()
+    return pd.Series(pd.Categorical.from_codes(group_codes, categories=WEATHER_GROUPS),
+                     index=conditions.index, name="Weather_Group")
+
+
+def weather_table_path(dataset_path):
+    return os.path.splitext(dataset_path)[0] + ".weather.json"
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class WeatherTable:
+    """Group of every distinct condition of a dataset, updated chunk by chunk; new conditions are classified once"""
+
+    def __init__(self):
+        self.groups = {}
+
+    @property
+    def empty(self):
+        return not self.groups
+
+    def update(self, df):
+        if "Weather_Condition" in df.columns:
+            new = set(df["Weather_Condition"].dropna().astype(str).unique()) - self.groups.keys()
+            if new:
+                self.groups.update(group_table(list(new)).itertuples(index=False))
+        return self
+
+    def table(self):
+        """(Weather_Condition, Weather_Group) lookup sorted by condition"""
+        return pd.DataFrame(sorted(self.groups.items()), columns=["Weather_Condition", "Weather_Group"])
+
+    def save(self, path, source=None):
+        with open(path + ".tmp", "w") as f:
+            json.dump({"source": _signature(source) if source is not None else None,
+                       "groups": dict(sorted(self.groups.items()))}, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            saved = json.load(f)
+        table = cls()
+        table.groups = saved["groups"]
+        return table, saved["source"]
+
+
+def saved_weather_table(path=PREPROCESSED_PATH):
+    """The saved weather lookup of the dataset at ``path``, or None when missing or out of date"""
+    sidecar = weather_table_path(path)
+    if not os.path.exists(sidecar) or not os.path.exists(path):
+        return None
+    table, source = WeatherTable.load(sidecar)
+    if source != _signature(path):
+        return None
+    return table
+
+
+def load_weather_table(path=PREPROCESSED_PATH):
+    """Condition-to-group lookup of the dataset at ``path``: the saved one while current, else rebuilt and saved"""
+    table = saved_weather_table(path)
+    if table is None:
+        table = WeatherTable()
+        if path.endswith(".csv"):
+            table.update(pd.read_csv(path, usecols=["Weather_Condition"]))
+        else:
+            table.update(pq.read_table(path, columns=["Weather_Condition"]).to_pandas())
+        table.save(weather_table_path(path), source=path)
+    return table.table()
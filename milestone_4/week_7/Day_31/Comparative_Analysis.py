@@ -1,34 +1,87 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.figure_factory as ff
-from scipy.stats import chi2_contingency
+import plotly.graph_objects as go
+
+# Shared data helpers (dataset cache, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from association_matrix import cramers_v_matrix
+from correlation_stats import load_correlations
+from dataset_cache import get_preprocessed, get_summary
+from dataset_io import PREPROCESSED_PATH, load_preprocessed_schema
+from quantile_sketch import grouped_box_summaries
+from scatter_density import FULL_SCATTER_MAX_ROWS, class_grids, density_sample
+
+SEVERITY_COLORS = {1: (46, 160, 67), 2: (230, 190, 0), 3: (245, 130, 20), 4: (215, 40, 40)}
+
+
+def cramers_matrix_for(features):
+    return cramers_v_matrix(get_preprocessed(columns=list(features)), list(features))
+
+
+def scatter_arrays(feature_x, feature_y):
+    df = get_preprocessed(columns=[feature_x, feature_y, "Severity"]).dropna()
+    return (df[feature_x].to_numpy(dtype=float), df[feature_y].to_numpy(dtype=float),
+            df["Severity"].to_numpy())
+
+
+def scatter_grid(feature_x, feature_y):
+    return class_grids(*scatter_arrays(feature_x, feature_y))
+
+
+def scatter_sample(feature_x, feature_y):
+    x, y, severity = scatter_arrays(feature_x, feature_y)
+    rows = density_sample(x, y, severity)
+    return x[rows], y[rows], severity[rows]
+
 
+def density_scatter(feature_x, feature_y, show_points):
+    """Per-Severity count grids as heatmap layers, with an optional sampled point overlay"""
+    levels, grids, (x_low, x_high), (y_low, y_high) = get_summary("scatter_grid", scatter_grid,
+                                                                  feature_x, feature_y)
+    bins = grids.shape[-1]
+    x_centers = x_low + (np.arange(bins) + 0.5) * (x_high - x_low) / bins
+    y_centers = y_low + (np.arange(bins) + 0.5) * (y_high - y_low) / bins
 
-def cramers_v(x, y):
-    """Calculate Cramér's V statistic for categorical-categorical association."""
-    confusion_matrix = pd.crosstab(x, y)
-    chi2 = chi2_contingency(confusion_matrix)[0]
-    n = confusion_matrix.sum().sum()
-    phi2 = chi2 / n
-    r, k = confusion_matrix.shape
-    phi2corr = max(0, phi2 - ((k - 1)*(r - 1)) / (n - 1))
-    rcorr = r - ((r - 1)**2) / (n - 1)
-    kcorr = k - ((k - 1)**2) / (n - 1)
-    if rcorr == 0 or kcorr == 0:
-        return np.nan
-    return np.sqrt(phi2corr / min((kcorr -1), (rcorr -1)))
+    fig = go.Figure()
+    for level, grid in zip(levels, grids):
+        r, g, b = SEVERITY_COLORS.get(int(level), (90, 90, 90))
+        fig.add_trace(go.Heatmap(
+            x=x_centers, y=y_centers,
+            z=np.where(grid > 0, np.log10(np.maximum(grid, 1)) + 1, np.nan).round(2),  # Empty cells stay transparent
+            customdata=grid,
+            colorscale=[[0, f"rgba({r},{g},{b},0.15)"], [1, f"rgba({r},{g},{b},0.85)"]],
+            showscale=False, name=f"Severity {level}", showlegend=True,
+            hovertemplate=f"Severity {level}<br>{feature_x}=%{{x:.2f}}<br>{feature_y}=%{{y:.2f}}"
+                          "<br>accidents=%{customdata}<extra></extra>"))
+
+    if show_points:
+        x, y, severity = get_summary("scatter_sample", scatter_sample, feature_x, feature_y)
+        for level in levels:
+            mask = severity == level
+            r, g, b = SEVERITY_COLORS.get(int(level), (90, 90, 90))
+            fig.add_trace(go.Scattergl(x=x[mask], y=y[mask], mode="markers", name=f"Severity {level} (sample)",
+                                       marker=dict(size=3, color=f"rgb({r},{g},{b})")))
+
+    fig.update_layout(title=f"Density of {feature_x} vs {feature_y} by Severity",
+                      xaxis_title=feature_x, yaxis_title=feature_y, template="plotly_white")
+    return fig
 
 
 def run():
     st.header("Comparative Analysis")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
+    # Feature lists come from the schema; each chart loads only the columns it plots
+    schema = load_preprocessed_schema()
 
     # Separate numerical and categorical features + adjust for Severity
-    num_features = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
-    cat_features = df.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
+    num_features = schema.select_dtypes(include='number').columns.tolist()
+    cat_features = schema.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
 
     # Chart type selection
     chart_type = st.selectbox("Select chart type", options=["Scatterplot", "Box Plot", "Heatmap"])
@@ -42,6 +95,16 @@ def run():
             st.info("Please select both numeric X-axis and Y-axis features.")
             return
 
+        df = get_preprocessed(columns=[feature_x, feature_y, "Severity"])
+        if len(df) > FULL_SCATTER_MAX_ROWS:
+            # Too many points to send individually: draw count grids plus a bounded sample
+            show_points = st.checkbox("Overlay sampled points", value=True)
+            fig = density_scatter(feature_x, feature_y, show_points)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{len(df):,} rows aggregated into a grid per Severity (darker cells hold more "
+                       "accidents); points are a stratified sample that favours sparse regions.")
+            return
+
         fig = px.scatter(
             df,
             x=feature_x,
@@ -61,15 +124,21 @@ def run():
             st.info("Please select a numerical feature to display box plot.")
             return
 
-        fig = px.box(
-            df,
-            y=feature_y,
-            color="Severity",
-            title=f"Box Plot of {feature_y} grouped by Severity",
-            labels={feature_y: feature_y, "Severity": "Severity"},
-            template="plotly_white"
-        )
+        # Five-number summaries per Severity from quantile sketches; no raw points are sent
+        summaries = get_summary("box_summaries", grouped_box_summaries, PREPROCESSED_PATH, feature_y)
+        fig = go.Figure()
+        for severity, row in summaries.iterrows():
+            r, g, b = SEVERITY_COLORS.get(int(severity), (90, 90, 90))
+            fig.add_trace(go.Box(
+                name=str(severity), x=[str(severity)],
+                q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+                lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]],
+                marker_color=f"rgb({r},{g},{b})", legendgroup=str(severity)))
+        fig.update_layout(title=f"Box Plot of {feature_y} grouped by Severity",
+                          xaxis_title="Severity", yaxis_title=feature_y, template="plotly_white")
         st.plotly_chart(fig, use_container_width=True)
+        st.caption("Whiskers end at the 1.5×IQR fences (or the data range); quartiles come from "
+                   "quantile sketches over all rows.")
 
     else:  # Heatmap
         heatmap_data_type = st.radio("Heatmap Data Type", options=["Numerical", "Categorical"])
@@ -77,13 +146,14 @@ def run():
         if heatmap_data_type == "Numerical":
             # Automatically use all numerical features + Severity
             features = [f for f in num_features if f != 'Severity']
-            if 'Severity' in df.columns:
+            if 'Severity' in schema.columns:
                 features.append('Severity')
             if len(features) < 2:
                 st.info("Not enough numerical features to plot correlation heatmap.")
                 return
             
-            corr_matrix = df[features].corr()
+            # Pairwise correlations from the saved streaming sums; no rows are loaded
+            corr_matrix = get_summary("correlations", load_correlations).corr(features)
 
             fig = ff.create_annotated_heatmap(
                 z=corr_matrix.values.round(2),
@@ -99,23 +169,15 @@ def run():
         else:  # Categorical heatmap based on Cramér's V including Severity even if numerical
             features = cat_features.copy()
             # Include Severity forcibly regardless of dtype
-            if 'Severity' in df.columns and 'Severity' not in features:
+            if 'Severity' in schema.columns and 'Severity' not in features:
                 features.append('Severity')
             
             if len(features) < 2:
                 st.info("Not enough categorical features to plot Cramér's V heatmap.")
                 return
 
-            n = len(features)
-            cramers_matrix = np.zeros((n, n))
-
-            for i in range(n):
-                for j in range(n):
-                    if i == j:
-                        cramers_matrix[i, j] = 1.0
-                    else:
-                        val = cramers_v(df[features[i]], df[features[j]])
-                        cramers_matrix[i, j] = val if val is not np.nan else 0
+            # Upper triangle only, from integer codes; cached per feature list
+            cramers_matrix = get_summary("cramers_v", cramers_matrix_for, tuple(features))
 
             fig = ff.create_annotated_heatmap(
                 z=cramers_matrix.round(2),
@@ -1,43 +1,79 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from scipy.stats import gaussian_kde
+
+# Shared data helpers (dataset cache, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from binned_density import DEFAULT_BINS, binned_kde, finite_values, histogram
+from count_cube import load_cubes
+from dataset_cache import get_preprocessed, get_summary
+from dataset_io import load_preprocessed_schema
+
+
+def column_histogram(col, bins):
+    cubes = get_summary("cubes", load_cubes)
+    if "time" in cubes and col in cubes["time"].axes and col != "State":
+        # Calendar columns and Severity: bin the cube's marginal counts instead of the rows
+        counts = cubes["time"].counts(col)
+        counts = counts[counts > 0]
+        hist, edges = np.histogram(counts.index.to_numpy(dtype=float), bins=bins, weights=counts.to_numpy())
+        return hist.astype(np.int64), edges
+    return histogram(finite_values(get_preprocessed(columns=[col])[col]), bins)
+
+
+def column_kde(col, bandwidth_factor):
+    values = finite_values(get_preprocessed(columns=[col])[col])
+    return len(values), binned_kde(values, bandwidth_factor)
+
 
 def run():
     st.header("Univariate Analysis")
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
+    columns = load_preprocessed_schema().columns
 
     # Select column without default selection
-    col = st.selectbox("Select Column", options=["--Choose a column--"] + list(df.columns))
+    col = st.selectbox("Select Column", options=["--Choose a column--"] + list(columns))
     if col == "--Choose a column--":
         st.info("Please select a column to analyze.")
         return
 
-    is_numeric = pd.api.types.is_numeric_dtype(df[col])
+    is_numeric = pd.api.types.is_numeric_dtype(load_preprocessed_schema()[col])
 
     if is_numeric:
         # Numerical column: plot histogram with optional KDE
         show_kde = st.checkbox("Include KDE plot in histogram", value=False)
+        bins = st.slider("Number of bins", min_value=10, max_value=100, value=DEFAULT_BINS)
 
-        fig = px.histogram(df, x=col, nbins=30, title=f"Histogram of {col}")
+        # Bin counts are computed here and cached per (column, bins); only the bars are sent
+        counts, edges = get_summary("histogram", column_histogram, col, bins)
+        bin_width = edges[1] - edges[0]
+        fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, title=f"Histogram of {col}",
+                     labels={"x": col, "y": "count"})
+        fig.update_traces(width=bin_width)
+        fig.update_layout(bargap=0)
 
         if show_kde:
-            # Calculate KDE values manually
-            data_series = df[col].dropna()
-            kde = gaussian_kde(data_series)
-            x_min, x_max = data_series.min(), data_series.max()
-            x_vals = np.linspace(x_min, x_max, 200)
-            y_vals = kde(x_vals)
-            bin_width = (x_max - x_min) / 30
-            y_vals_scaled = y_vals * len(data_series) * bin_width
-            # Add KDE line trace on histogram
-            fig.add_scatter(x=x_vals, y=y_vals_scaled, mode='lines', name='KDE', line=dict(color='red'))
+            bandwidth = st.slider("KDE bandwidth (× Scott's rule)", min_value=0.25, max_value=3.0,
+                                  value=1.0, step=0.25)
+            # Binned FFT estimate, linear in the number of rows; cached per (column, bandwidth)
+            n_values, kde = get_summary("kde", column_kde, col, bandwidth)
+            if kde is None:
+                st.info("KDE is not available for a constant column.")
+            else:
+                x_vals, y_vals = kde
+                y_vals_scaled = y_vals * n_values * bin_width
+                # Add KDE line trace on histogram
+                fig.add_scatter(x=x_vals, y=y_vals_scaled, mode='lines', name='KDE', line=dict(color='red'))
 
         st.plotly_chart(fig, use_container_width=True)
 
     else:
         # Categorical column: plot top 10 counts bar chart
+        # Only the selected column is loaded (once, then served from the cache)
+        df = get_preprocessed(columns=[col])
         counts = df[col].value_counts().nlargest(10)
         fig = px.bar(counts, x=counts.index.astype(str), y=counts.values,
                      title=f"Top 10 counts of {col}", labels={col: col, "y": "Count"})
@@ -0,0 +1,250 @@
+import os
+import sys
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+# Shared data helpers (dataset cache, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from dataset_cache import get_preprocessed, get_summary
+from geo_index import load_geo_index
+from spatial_grid import aggregate_cells, label_hotspots, load_hotspots
+from tile_pyramid import MAX_MARKERS, STREET_ZOOM, TilePyramid, load_pyramid, viewport_bbox
+
+# Columns read by this page; the rest of the dataset is never loaded
+COLUMNS = ["Latitude", "Longitude", "Severity", "State", "City", "Country"]
+
+# State abbreviation to full name mapping for UI clarity
+us_state_abbrev = {
+    "AL": "Alabama",
+    "AK": "Alaska",
+    "AZ": "Arizona",
+    "AR": "Arkansas",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "DE": "Delaware",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "IA": "Iowa",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "ME": "Maine",
+    "MD": "Maryland",
+    "MA": "Massachusetts",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MS": "Mississippi",
+    "MO": "Missouri",
+    "MT": "Montana",
+    "NE": "Nebraska",
+    "NV": "Nevada",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NY": "New York",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VT": "Vermont",
+    "VA": "Virginia",
+    "WA": "Washington",
+    "WV": "West Virginia",
+    "WI": "Wisconsin",
+    "WY": "Wyoming",
+    "DC": "District of Columbia"
+}
+
+def run():
+    st.header("Geospatial Accident Analysis with Hotspot Counts")
+
+    df = get_preprocessed(columns=COLUMNS)
+    # Row offsets by (State, City, Severity), built once per dataset version; rows without coordinates are left out
+    index = get_summary("geo_index", load_geo_index)
+    # Renaming the cached frame's shallow copy in place avoids copying the data
+    df.rename(columns={"Latitude": "latitude", "Longitude": "longitude"}, inplace=True)
+
+    geog_level = st.radio(
+        "Select geography level",
+        ["Country", "State", "City"],
+        index=0
+    )
+
+    vis_type = st.radio(
+        "Select visualization type",
+        ["Point Map", "Hotspot Density"],
+        index=0
+    )
+
+    severity_options = index.values("Severity")
+    selected_severity = st.selectbox(
+        "Select Severity Level",
+        options=[''] + [str(s) for s in severity_options],
+        index=0
+    )
+
+    if selected_severity == '':
+        st.info("Please select a severity level to display data.")
+        return
+
+    selected_severity_value = int(selected_severity)
+    region_label = None
+    zoom = 3
+    center = dict(lat=39, lon=-98)  # default USA center
+
+    if geog_level == "Country":
+        region_label = "Country" if "Country" in df.columns else None
+        selection = dict(severity=selected_severity_value)
+        filtered_df = df.iloc[index.rows(**selection)]
+
+    elif geog_level == "State":
+        region_label = "State"
+        unique_state_abbrevs = index.values("State")
+        state_fullnames = [us_state_abbrev.get(abbr, abbr) for abbr in unique_state_abbrevs]
+        state_name_to_abbrev = {full: abbr for full, abbr in zip(state_fullnames, unique_state_abbrevs)}
+
+        selected_state_name = st.selectbox("Select State", options=[''] + state_fullnames)
+
+        if selected_state_name == '':
+            st.info("Please select a state to display data.")
+            return
+        selected_state_abbr = state_name_to_abbrev[selected_state_name]
+
+        selection = dict(state=selected_state_abbr, severity=selected_severity_value)
+        filtered_df = df.iloc[index.rows(**selection)]
+
+        center_lat = filtered_df['latitude'].mean()
+        center_lon = filtered_df['longitude'].mean()
+        center = dict(lat=center_lat, lon=center_lon)
+        zoom = 6
+
+    elif geog_level == "City":
+        region_label = "City"
+        city_options = index.values("City")
+        selected_city = st.selectbox("Select City", options=[''] + city_options)
+
+        if selected_city == '':
+            st.info("Please select a city to display data.")
+            return
+
+        selection = dict(city=selected_city, severity=selected_severity_value)
+        filtered_df = df.iloc[index.rows(**selection)]
+
+        center_lat = filtered_df['latitude'].mean()
+        center_lon = filtered_df['longitude'].mean()
+        center = dict(lat=center_lat, lon=center_lon)
+        zoom = 9
+
+    severity_color_map = {
+        1: "green",
+        2: "yellow",
+        3: "orange",
+        4: "red"
+    }
+
+    if filtered_df.empty:
+        st.info("No accidents found for selected criteria.")
+        return
+
+    if vis_type == "Point Map":
+        zoom = st.slider("Map zoom", min_value=3, max_value=16, value=zoom)
+        street_rows = None
+        if zoom >= STREET_ZOOM:
+            street_rows = index.rows(**selection, bbox=viewport_bbox(center["lat"], center["lon"], zoom))
+
+        if street_rows is not None and len(street_rows) <= MAX_MARKERS:
+            # Street level: the individual accidents inside the viewport
+            points = df.iloc[street_rows]
+            hover_data = {region_label: True} if region_label else {}
+            fig = px.scatter_mapbox(
+                points,
+                lat='latitude',
+                lon='longitude',
+                color=points["Severity"].astype(str),
+                color_discrete_map={str(k): v for k, v in severity_color_map.items()},
+                zoom=zoom,
+                center=center,
+                mapbox_style="carto-positron",
+                hover_data=hover_data
+            )
+        else:
+            # Wider views: one marker per cell of the matching pyramid level, so the payload stays bounded
+            if geog_level == "City":
+                pyramid = TilePyramid(aggregate_cells(filtered_df, keys=("Severity",), lat='latitude', lng='longitude'))
+                filters = {}
+            else:
+                pyramid = get_summary("tile_pyramid", load_pyramid)
+                filters = {"Severity": selected_severity_value}
+                if geog_level == "State":
+                    filters["State"] = selected_state_abbr
+            tiles = pyramid.tiles(zoom, filters=filters).assign(Severity=selected_severity_value)
+            fig = px.scatter_mapbox(
+                tiles,
+                lat='latitude',
+                lon='longitude',
+                size='accidents',
+                color=tiles["Severity"].astype(str),
+                color_discrete_map={str(k): v for k, v in severity_color_map.items()},
+                size_max=15,
+                zoom=zoom,
+                center=center,
+                mapbox_style="carto-positron",
+                hover_data={"accidents": True, "latitude": ':.4f', "longitude": ':.4f'}
+            )
+            st.caption(f"Each point aggregates the accidents of a {tiles.attrs['cell_deg']:g}° cell at their centroid; "
+                       f"zoom to {STREET_ZOOM} or closer for individual accidents.")
+        fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
+        st.plotly_chart(fig, use_container_width=True)
+
+    else:
+        # Hotspots are connected dense cells of the ~1 km grid (see spatial_grid)
+        if geog_level == "City":
+            cluster_agg = label_hotspots(aggregate_cells(filtered_df, lat='latitude', lng='longitude'))
+        else:
+            cluster_agg = get_summary("hotspots", load_hotspots)
+            cluster_agg = cluster_agg[cluster_agg["Severity"] == selected_severity_value]
+            if geog_level == "State":
+                cluster_agg = cluster_agg[cluster_agg["State"] == selected_state_abbr]
+        if cluster_agg.empty:
+            st.info("No hotspots detected for the selected criteria.")
+            return
+
+        cluster_agg = cluster_agg.assign(Severity=selected_severity_value)
+
+        fig = px.scatter_mapbox(
+            cluster_agg,
+            lat='latitude',
+            lon='longitude',
+            size='accident_count',
+            color=cluster_agg["Severity"].astype(str),
+            color_discrete_map={str(k): v for k, v in severity_color_map.items()},
+            size_max=30,
+            zoom=zoom,
+            center=center,
+            mapbox_style="carto-positron",
+            hover_name='Severity',
+            hover_data={
+                "accident_count": True,
+                "latitude": ':.4f',
+                "longitude": ':.4f'
+            },
+            title="Accident Hotspots with Clustered Counts"
+        )
+        fig.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Point size corresponds to accident count at each hotspot cluster.")
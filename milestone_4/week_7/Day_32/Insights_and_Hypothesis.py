@@ -1,35 +1,109 @@
+import os
+import sys
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-from scipy.stats import ttest_ind, chi2_contingency, pearsonr
+from scipy.stats import chi2_contingency
+
+# Shared data helpers (dataset cache, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from correlation_stats import load_correlations
+from count_cube import load_cubes
+from dataset_cache import get_summary
+from dataset_io import load_preprocessed_schema
+from hypothesis_stats import severity_crosstabs, severity_moments, ttest_from_counts
+from weather_taxonomy import load_weather_table
+
+ROAD_FEATURES = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
+                 'Railway', 'Roundabout', 'Station', 'Stop',
+                 'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
+TEMPERATURE_BINS = [-50, 0, 32, 50, 70, 90, 110, 150]
+VISIBILITY_BINS = [0, 1, 2, 5, 10, 20, np.inf]  # The last range runs up to the maximum visibility
+VISIBILITY_LABELS = ["<1mi", "1-2mi", "2-5mi", "5-10mi", "10-20mi", ">20mi"]
+
+# Every test below reads a (group, Severity) count table built from all rows. Binned continuous
+# columns are counted in one pass; the other tables are slices of the saved count cubes
+GROUPERS = {
+    "temperature": ("Temperature(F)", lambda s: pd.cut(s, bins=TEMPERATURE_BINS, right=False)),
+    "visibility": ("Visibility(mi)", lambda s: pd.cut(s, bins=VISIBILITY_BINS, labels=VISIBILITY_LABELS,
+                                                      include_lowest=True)),
+}
+CUBE_TABLES = {
+    "severity": ("time", "Severity"),
+    "weather": ("weather", "Weather_Condition"),
+    "weather_group": ("weather_group", "Weather_Group"),
+    "hour": ("time", "Hour"),
+    **{feat: ("road", feat) for feat in ROAD_FEATURES},
+}
+
+
+def cube_table(cube, column):
+    """(column, Severity) count table of a cube, without the labels no row has"""
+    if column == "Severity":
+        # Severity against itself: the totals on the diagonal
+        totals = cube.counts("Severity")
+        totals = totals[totals > 0]
+        return pd.DataFrame(np.diag(totals), index=totals.index, columns=totals.index.rename("Severity"))
+    table = cube.counts([column, "Severity"]).unstack(fill_value=0)
+    return table[table.sum(axis=1) > 0].rename_axis(columns="Severity")
+
+
+def insight_tables():
+    available = load_preprocessed_schema().columns
+    tables = severity_crosstabs({name: grouper for name, grouper in GROUPERS.items() if grouper[0] in available})
+    cubes = load_cubes()
+    for name, (cube, column) in CUBE_TABLES.items():
+        if cube in cubes:
+            tables[name] = cube_table(cubes[cube], column)
+    if "weather_group" not in tables and "weather" in tables:
+        # Outputs written before step 12 grouped weather: group the conditions by the saved lookup
+        weather = tables["weather"]
+        lookup = get_summary("weather_table", load_weather_table).set_index("Weather_Condition")["Weather_Group"]
+        tables["weather_group"] = weather.groupby(weather.index.map(lookup)).sum().rename_axis("Weather_Group")
+    return tables
+
+
+def flag_table(group_counts, total_counts):
+    """Severity counts of rows in the flagged groups (True) vs all other rows (False), like ``pd.crosstab``"""
+    table = pd.DataFrame([total_counts - group_counts, group_counts], index=[False, True])
+    return table[table.sum(axis=1) > 0]
+
 
 def run():
     st.header("Insight Extraction & Hypothesis Testing with Statistical Validation")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv", nrows=40000)
+    tables = get_summary("insight_tables", insight_tables)
+    correlations = get_summary("correlations", load_correlations)
+    severity_totals = tables["severity"].sum(axis=0)
+    st.caption(f"All tests use the full dataset ({int(severity_totals.sum()):,} accidents).")
 
     ## Insight 1
     st.subheader("Insight 1: Effect of Weather Conditions on Accident Severity")
-    weather_groups = df.groupby("Weather_Condition")["Severity"].mean().sort_values(ascending=False).head(10)
+    weather = tables["weather"]
+    weather_groups = severity_moments(weather)["mean"].rename("Severity").sort_values(ascending=False).head(10)
     st.bar_chart(weather_groups)
     st.markdown("**Hypothesis:** Different weather conditions lead to different average accident severities.")
-    if "Clear" in df["Weather_Condition"].unique() and "Rain" in df["Weather_Condition"].unique():
-        clear = df[df["Weather_Condition"] == "Clear"]["Severity"]
-        rain = df[df["Weather_Condition"] == "Rain"]["Severity"]
-        _, p = ttest_ind(clear, rain, nan_policy='omit')
+    # Clear and Rain are weather groups (see weather_taxonomy): "Fair" counts as clear, "Light Rain" as rain
+    weather_by_group = tables["weather_group"]
+    if "Clear" in weather_by_group.index and "Rain" in weather_by_group.index:
+        _, p = ttest_from_counts(weather_by_group, "Clear", "Rain")
         if p < 0.05:
             st.success(f"Theory Proven TRUE: Significant difference found (p={p:.4f}). Weather impacts severity.")
         else:
             st.warning(f"Theory Proven FALSE: No significant difference (p={p:.4f}). Weather does not impact severity.")
     else:
         st.info("Insufficient data for test between 'Clear' and 'Rain'.")
+    with st.expander("🌦️ Weather conditions in each group"):
+        st.dataframe(get_summary("weather_table", load_weather_table), hide_index=True)
 
     ## Insight 2
     st.subheader("Insight 2: Accident Frequency by Hour of Day")
-    hourly_counts = df['Hour'].value_counts().sort_index()
+    hourly_counts = tables["hour"].sum(axis=1).sort_index().rename("count")
     st.line_chart(hourly_counts)
     st.markdown("**Hypothesis:** Accident frequency differs between morning rush hours (7-9am) and late night (12-3am).")
-    rush_hours = df[df['Hour'].between(7,9)].shape[0]
-    night_hours = df[df['Hour'].between(0,3)].shape[0]
+    rush_hours = hourly_counts[hourly_counts.index.to_series().between(7,9)].sum()
+    night_hours = hourly_counts[hourly_counts.index.to_series().between(0,3)].sum()
     st.write(f"Accidents 7-9am: {rush_hours}, 12-3am: {night_hours}")
     if rush_hours > night_hours:
         st.success("Theory Proven TRUE: More accidents during morning rush hours.")
@@ -38,26 +112,21 @@ def run():
 
     ## Insight 3
     st.subheader("Insight 3: Correlation Between Temperature and Accident Severity")
-    temp_bins = pd.cut(df["Temperature(F)"], bins=[-50, 0, 32, 50, 70, 90, 110, 150], right=False)
-    temp_severity = df.groupby(temp_bins)["Severity"].mean().sort_index()
-    temp_severity = temp_severity.reset_index()
-    temp_severity[temp_severity.columns[0]] = temp_severity[temp_severity.columns[0]].astype(str)
-    temp_severity = temp_severity.set_index(temp_severity.columns[0])
-    st.bar_chart(temp_severity)
-    corr, corr_p = pearsonr(df["Temperature(F)"].dropna(), df["Severity"].dropna())
+    temp_severity = severity_moments(tables["temperature"])["mean"].rename("Severity")
+    temp_severity.index = temp_severity.index.astype(str)
+    temp_labels = pd.IntervalIndex.from_breaks(TEMPERATURE_BINS, closed="left").astype(str)
+    st.bar_chart(temp_severity.reindex(temp_labels).rename_axis("Temperature(F)"))
+    corr, corr_p, _ = correlations.pearson("Temperature(F)", "Severity")
     st.success(f"Pearson correlation: {corr:.3f} (p={corr_p:.4e}) - {'Weak' if abs(corr)<0.3 else 'Moderate/Strong'} relationship.")
     st.markdown("**Theory:** Higher temperature extremes influence accident severity. Correlation shows the strength of this relationship.")
 
     ## Insight 4
     st.subheader("Insight 4: Accident Counts by Visibility Range")
-    visibility_bins = [0, 1, 2, 5, 10, 20, df["Visibility(mi)"].max()]
-    visibility_labels = ["<1mi", "1-2mi", "2-5mi", "5-10mi", "10-20mi", ">20mi"]
-    df['Visibility_Range'] = pd.cut(df["Visibility(mi)"], bins=visibility_bins, labels=visibility_labels, include_lowest=True)
-    visibility_counts = df['Visibility_Range'].value_counts().reindex(visibility_labels)
+    visibility = tables["visibility"].reindex(VISIBILITY_LABELS)
+    visibility_counts = visibility.sum(axis=1, min_count=1).rename("count").rename_axis("Visibility_Range")
     st.bar_chart(visibility_counts)
     st.markdown("**Hypothesis:** Low visibility (<2mi) leads to higher accident frequency.")
-    df['Low_Visibility'] = df['Visibility_Range'].isin(["<1mi", "1-2mi"])
-    contingency_table = pd.crosstab(df['Low_Visibility'], df['Severity'])
+    contingency_table = flag_table(visibility.loc[["<1mi", "1-2mi"]].fillna(0).sum(), severity_totals)
     _, p_vis, _, _ = chi2_contingency(contingency_table)
     if p_vis < 0.05:
         st.success(f"Theory Proven TRUE: Significant association between low visibility and accident severity (p={p_vis:.4f}).")
@@ -66,11 +135,10 @@ def run():
 
     ## Insight 5
     st.subheader("Insight 5: Accident Counts: Rain vs No Rain")
-    df['Is_Rain'] = df['Weather_Condition'].str.lower().str.contains('rain', na=False)
-    rain_counts = df['Is_Rain'].value_counts()
+    contingency_rain = flag_table(weather_by_group.loc[weather_by_group.index == "Rain"].sum(), severity_totals)
+    rain_counts = contingency_rain.sum(axis=1).sort_values(ascending=False).rename("count").rename_axis("Is_Rain")
     st.bar_chart(rain_counts)
     st.markdown("**Hypothesis:** Rain increases accident frequency.")
-    contingency_rain = pd.crosstab(df['Is_Rain'], df['Severity'])
     _, p_rain, _, _ = chi2_contingency(contingency_rain)
     if p_rain < 0.05:
         st.success(f"Theory Proven TRUE: Rain significantly affects accident severity/frequency (p={p_rain:.4f}).")
@@ -79,8 +147,7 @@ def run():
 
     ## Insight 6
     st.subheader("Insight 6: Correlation between Humidity and Accident Severity")
-    df_clean = df.dropna(subset=["Humidity(%)", "Severity"])
-    corr_hum, p_hum = pearsonr(df_clean["Humidity(%)"], df_clean["Severity"])
+    corr_hum, p_hum, _ = correlations.pearson("Humidity(%)", "Severity")
     st.write(f"Pearson correlation (Humidity vs Severity): {corr_hum:.3f} (p={p_hum:.4e})")
     if p_hum < 0.05:
         st.success("Theory Proven TRUE: Significant correlation between humidity and severity.")
@@ -89,8 +156,7 @@ def run():
 
     # Insight 7: Does Pressure Affect Accident Severity?
     st.subheader("Insight 7: Does Pressure Affect Accident Severity?")
-    df_clean_pressure = df.dropna(subset=["Pressure(in)", "Severity"])
-    corr_pressure, p_pressure = pearsonr(df_clean_pressure["Pressure(in)"], df_clean_pressure["Severity"])
+    corr_pressure, p_pressure, _ = correlations.pearson("Pressure(in)", "Severity")
     st.write(f"Pearson correlation (Pressure vs Severity): {corr_pressure:.3f} (p={p_pressure:.4e})")
     st.markdown("**Hypothesis:** Atmospheric pressure correlates with accident severity.")
     if p_pressure < 0.05:
@@ -101,26 +167,24 @@ def run():
     # Insight 8: Effect of Road Features on Accident Severity
     st.subheader("Insight 8: Effect of Road Features on Accident Severity")
 
-    road_features = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
-                    'Railway', 'Roundabout', 'Station', 'Stop',
-                    'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
-
-    existing_features = [feat for feat in road_features if feat in df.columns]
+    existing_features = [feat for feat in ROAD_FEATURES if feat in tables]
 
     if existing_features:
         results = []
         for feat in existing_features:
-            # Filter rows where feature is True / 1 vs False / 0
-            with_feat = df[df[feat] == 1]["Severity"].dropna()
-            without_feat = df[df[feat] == 0]["Severity"].dropna()
-            
+            # Severity counts of rows where the feature is True / 1 vs False / 0
+            counts = tables[feat]
+            table = pd.DataFrame([counts[counts.index == 1].sum(), counts[counts.index == 0].sum()],
+                                 index=[True, False])
+            n_with, n_without = table.sum(axis=1)
+
             # Perform t-test if both groups have data
-            if len(with_feat) > 10 and len(without_feat) > 10:
-                stat, p = ttest_ind(with_feat, without_feat, nan_policy='omit')
+            if n_with > 10 and n_without > 10:
+                stat, p = ttest_from_counts(table, True, False)
                 theory = "TRUE" if p < 0.05 else "FALSE"
-                results.append((feat, len(with_feat), len(without_feat), p, theory))
+                results.append((feat, n_with, n_without, p, theory))
             else:
-                results.append((feat, len(with_feat), len(without_feat), None, "Insufficient data"))
+                results.append((feat, n_with, n_without, None, "Insufficient data"))
 
         # Display Results
         for feat, n_with, n_without, p, theory in results:
@@ -1,31 +1,50 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+# Shared data helpers (dataset cache, typed storage) live with the Day 30 modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day_30"))
+from count_cube import load_cubes
+from dataset_cache import get_summary
+from dataset_io import PREPROCESSED_PATH
+from heavy_hitters import load_top_values, top_k, value_count
+
+ROAD_FEATURES = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
+                 'Railway', 'Roundabout', 'Station', 'Stop', 'Traffic_Calming',
+                 'Traffic_Signal', 'Turning_Loop']
+# Columns ranked by this page; counted in one pass and saved next to the dataset
+COLUMNS = ('State', 'City', 'Weather_Condition', *ROAD_FEATURES)
+
 def run():
     st.header("Key Findings & Summary Dashboard")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
+    top_values = get_summary("top_values", load_top_values, PREPROCESSED_PATH, COLUMNS)
+    counted = top_values["columns"]
+    # Time x State x Severity counts saved by the pipeline
+    cubes = get_summary("cubes", load_cubes)
 
     # --- Basic Metrics ---
     st.subheader("Summary Metrics")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Accidents Analyzed", f"{len(df):,}")
-    if 'Hour' in df.columns:
-        peak_hour = df['Hour'].mode()[0]
+    col1.metric("Total Accidents Analyzed", f"{top_values['rows']:,}")
+    if 'time' in cubes:
+        peak_hour = cubes['time'].counts('Hour').idxmax()
         col2.metric("Peak Accident Hour", peak_hour)
     else:
         col2.warning("Hour column missing")
-    if 'Severity' in df.columns:
-        high_severity_count = df[df["Severity"] >= 3].shape[0]
+    if 'time' in cubes:
+        high_severity_count = cubes['time'].total(where={'Severity': lambda levels: levels >= 3})
         col3.metric("High Severity Accidents (Severity≥3)", f"{high_severity_count:,}")
     else:
         col3.warning("Severity column missing")
 
     # --- Top 5 States ---
     st.subheader("Top 5 Accident-Prone States")
-    if 'State' in df.columns:
-        top_states = df['State'].value_counts().nlargest(5)
+    if 'State' in counted:
+        top_states = top_k(top_values, 'State')
         fig_states = px.bar(top_states, x=top_states.index, y=top_states.values,
                             labels={"x":"State", "y":"Number of Accidents"},
                             title="Top 5 States by Accident Counts",
@@ -37,8 +56,8 @@ def run():
 
     # --- Top 5 Cities ---
     st.subheader("Top 5 Accident-Prone Cities")
-    if 'City' in df.columns:
-        top_cities = df['City'].value_counts().nlargest(5)
+    if 'City' in counted:
+        top_cities = top_k(top_values, 'City')
         fig_cities = px.bar(top_cities, x=top_cities.index, y=top_cities.values,
                             labels={"x":"City", "y":"Number of Accidents"},
                             title="Top 5 Cities by Accident Counts",
@@ -50,8 +69,8 @@ def run():
 
     # --- Top 5 Weather Conditions ---
     st.subheader("Top 5 Weather Conditions During Accidents")
-    if 'Weather_Condition' in df.columns:
-        weather_counts = df['Weather_Condition'].value_counts().nlargest(5)
+    if 'Weather_Condition' in counted:
+        weather_counts = top_k(top_values, 'Weather_Condition')
         fig_weather = px.pie(names=weather_counts.index, values=weather_counts.values,
                              title="Top 5 Weather Conditions During Accidents",
                              color_discrete_sequence=px.colors.sequential.RdBu)
@@ -61,16 +80,11 @@ def run():
 
     # --- Road Surface / Feature Conditions ---
     st.subheader("Top 5 Road Surface / Feature Conditions in Accidents")
-    road_features = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
-                     'Railway', 'Roundabout', 'Station', 'Stop', 'Traffic_Calming',
-                     'Traffic_Signal', 'Turning_Loop']
-    existing_features = [feat for feat in road_features if feat in df.columns]
+    existing_features = [feat for feat in ROAD_FEATURES if feat in counted]
 
     if existing_features:
-        feature_counts = {}
-        for feat in existing_features:
-            count = df[df[feat] == 1].shape[0] if df[feat].dtype != 'bool' else df[df[feat]].shape[0]
-            feature_counts[feat] = count
+        # True and 1 compare equal, so this counts boolean and 0/1 columns alike
+        feature_counts = {feat: value_count(top_values, feat, True) for feat in existing_features}
         feature_series = pd.Series(feature_counts).sort_values(ascending=False).nlargest(5)
 
         fig_features = px.bar(feature_series, x=feature_series.index, y=feature_series.values,